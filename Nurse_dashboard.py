@@ -1,14 +1,18 @@
 import sys
 import os
-import socket
-import platform
-import subprocess
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton, QWidget,
     QHBoxLayout, QVBoxLayout, QFrame, QMessageBox
 )
 from PyQt5.QtGui import QPixmap, QPalette, QBrush
-from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QRect, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QRect, QSize, pyqtSignal
+
+import asset_cache
+import connectivity
+import nm_monitor
+import wifi_scanner
+from image_loader import ImageLoader
+from main_controller import navigate_to
 
 # ================== QSS Style Section ==================
 QSS_STYLE = """
@@ -52,35 +56,6 @@ SliderWidget QLabel {
 }
 """
 
-# ========== Utility: Check Internet Connection ==========
-def is_connected():
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=2)
-        return True
-    except OSError:
-        return False
-
-def get_connected_network_name():
-    try:
-        system = platform.system()
-        if system == "Windows":
-            result = subprocess.check_output("netsh wlan show interfaces", shell=True).decode()
-            for line in result.split("\n"):
-                if "SSID" in line and "BSSID" not in line:
-                    return line.split(":")[1].strip()
-        elif system == "Linux":
-            result = subprocess.check_output(
-                "nmcli -t -f active,ssid dev wifi", shell=True
-            ).decode()
-            for line in result.splitlines():
-                if line.startswith("yes:"):
-                    return line.split(":")[1]
-        else:
-            return "Unsupported OS"
-    except Exception as e:
-        return f"Error: {e}"
-    return "Not Connected"
-
 # ========== Custom QLabel for Clickable Icon ==========
 class ClickableLabel(QLabel):
     clicked = pyqtSignal()
@@ -129,19 +104,27 @@ class SliderWidget(QFrame):
         self.anim = anim
 
     def showPopup(self):
-        if hasattr(self.parent(), "current_mode"):
-            try:
-                if self.parent().current_mode == "vital":
-                    subprocess.Popen([sys.executable, "screen_saver.py"])
-                elif self.parent().current_mode == "inventory":
-                    subprocess.Popen([sys.executable, "SCREENSAVER.py"])
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to launch: {e}")
+        # The slider is reparented into a wrapper, so look up the dashboard.
+        dashboard = self.parentWidget()
+        while dashboard is not None and not hasattr(dashboard, "current_mode"):
+            dashboard = dashboard.parentWidget()
+        if dashboard is None:
+            return
+
+        page = {"vital": "screen_saver", "inventory": "inventory"}.get(dashboard.current_mode)
+        if page is None:
+            return
+
+        try:
+            if not navigate_to(self, page):
+                QMessageBox.critical(self, "Error", "Dashboard is not running inside the main controller.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open {page}: {e}")
 
 # ================== Main Window ==================
 class FullScreenWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
         self.vital_images = [
@@ -161,18 +144,24 @@ class FullScreenWindow(QMainWindow):
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_slideshow)
 
+        # Slides are decoded off the GUI thread, straight at canvas size.
+        self.slide_loader = ImageLoader(self, load_function=asset_cache.load_image)
+        self.slide_loader.image_ready.connect(self.show_slide)
+
         self.initUI()
 
     def initUI(self):
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
         self.setStyleSheet(QSS_STYLE)
 
-        background_image = QPixmap("Images/background.jpg").scaled(
-            self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation
-        )
+        background_image = asset_cache.load_pixmap("Images/background.jpg", self.size(), Qt.IgnoreAspectRatio)
         palette = QPalette()
         palette.setBrush(QPalette.Window, QBrush(background_image))
         self.setPalette(palette)
+        self.setAutoFillBackground(True)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -183,7 +172,7 @@ class FullScreenWindow(QMainWindow):
         # Top Bar
         top_layout = QHBoxLayout()
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Images/logos/Logo.png").scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        logo_pixmap = asset_cache.load_pixmap("Images/logos/Logo.png", QSize(100, 100))
         logo_label.setPixmap(logo_pixmap)
         top_layout.addWidget(logo_label, alignment=Qt.AlignLeft)
         top_layout.addStretch()
@@ -191,13 +180,13 @@ class FullScreenWindow(QMainWindow):
         # Wi-Fi Icon
         self.wifi_icon = ClickableLabel()
         self.wifi_icon.clicked.connect(self.show_wifi_info)
-        self.update_wifi_icon()
         top_layout.addWidget(self.wifi_icon, alignment=Qt.AlignRight)
 
-        # Timer to refresh icon
-        self.network_timer = QTimer()
-        self.network_timer.timeout.connect(self.update_wifi_icon)
-        self.network_timer.start(10000)
+        # Connectivity is probed on a background thread; the icon is only
+        # redrawn when the state actually changes.
+        monitor = connectivity.shared_monitor()
+        self.update_wifi_icon(bool(monitor.online))
+        monitor.state_changed.connect(self.update_wifi_icon)
 
         # Support Button
         support_button = QPushButton("Support")
@@ -270,8 +259,8 @@ class FullScreenWindow(QMainWindow):
 
         main_layout.addLayout(bottom_layout)
 
-    def update_wifi_icon(self):
-        icon_file = "wifi_connected.png" if is_connected() else "wifi_disconnected.png"
+    def update_wifi_icon(self, connected):
+        icon_file = "wifi_connected.png" if connected else "wifi_disconnected.png"
         icon_path = os.path.join("Images", "icons", icon_file)
 
         if not os.path.exists(icon_path):
@@ -279,16 +268,23 @@ class FullScreenWindow(QMainWindow):
             self.wifi_icon.clear()
             return
 
-        pixmap = QPixmap(icon_path)
+        pixmap = asset_cache.load_pixmap(icon_path, QSize(32, 32))
         if pixmap.isNull():
             print(f"⚠ Failed to load pixmap: {icon_path}")
             self.wifi_icon.clear()
         else:
-            self.wifi_icon.setPixmap(pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.wifi_icon.setPixmap(pixmap)
 
 
     def show_wifi_info(self):
-        network_name = get_connected_network_name()
+        # Read the live NetworkManager state (or the scanner's cache) so the
+        # popup opens instantly; a fresh scan updates the label while open.
+        scanner = wifi_scanner.shared_scanner()
+        network_monitor = nm_monitor.shared_monitor()
+
+        def network_name():
+            ssid = network_monitor.active_ssid() if network_monitor else None
+            return ssid or scanner.current_ssid() or "Not Connected"
 
         popup = QWidget(self)
         popup.setWindowFlags(Qt.FramelessWindowHint | Qt.Popup)
@@ -299,11 +295,27 @@ class FullScreenWindow(QMainWindow):
             padding: 10px;
             font-size: 12px;
         """)
-        label = QLabel(network_name, popup)
+        label = QLabel(network_name(), popup)
         layout = QVBoxLayout()
         layout.addWidget(label)
         popup.setLayout(layout)
 
+        def on_scan(networks):
+            label.setText(network_name())
+            popup.adjustSize()
+
+        def disconnect_scan(slot):
+            try:
+                scanner.networks_updated.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass  # scanner already gone (application exit)
+
+        popup.setAttribute(Qt.WA_DeleteOnClose)
+        scanner.networks_updated.connect(on_scan)
+        popup.destroyed.connect(lambda: disconnect_scan(on_scan))
+        if not scanner.is_fresh():
+            scanner.refresh()
+
         # Position under icon
         global_pos = self.wifi_icon.mapToGlobal(QPoint(0, self.wifi_icon.height()))
         popup.move(global_pos)
@@ -367,16 +379,17 @@ class FullScreenWindow(QMainWindow):
     def update_slideshow(self):
         if not self.current_images:
             return
-        image_path = self.current_images[self.image_index]
-        pixmap = QPixmap(image_path).scaled(
-            self.canvas_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
-        self.canvas_label.setPixmap(pixmap)
+        size = self.canvas_label.size()
+        self.slide_loader.request(self.current_images[self.image_index], size)
         self.image_index = (self.image_index + 1) % len(self.current_images)
+        # Decode the next slide while this one is on screen.
+        self.slide_loader.prefetch(self.current_images[self.image_index], size)
+
+    def show_slide(self, image_path, image):
+        if image_path in self.current_images:
+            self.canvas_label.setPixmap(QPixmap.fromImage(image))
 
 # ================== Run App ==================
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = FullScreenWindow()
-    window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    from main_controller import run
+    sys.exit(run("nurse_dashboard"))
@@ -1,14 +1,20 @@
 import sys
 import os
-import socket
-import platform
-import subprocess
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton, QWidget,
-    QHBoxLayout, QVBoxLayout, QFrame, QMessageBox, QLineEdit, QListWidget, QListWidgetItem
+    QHBoxLayout, QVBoxLayout, QFrame, QMessageBox, QLineEdit, QListView
 )
 from PyQt5.QtGui import QPixmap, QPalette, QBrush
-from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QRect, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QRect, QSize, pyqtSignal
+
+import asset_cache
+import connectivity
+import nm_monitor
+import wifi_scanner
+from wifi_network_model import WifiNetworkModel
+from wifi_connect import WifiConnector, PasswordDialog, STAGE_LABELS, PASSWORD_REQUIRED, PASSWORD_REJECTED
+from image_loader import ImageLoader
+from main_controller import navigate_to
 
 # ================== QSS Style Section ==================
 QSS_STYLE = """
@@ -52,71 +58,6 @@ SliderWidget QLabel {
 }
 """
 
-# ========== Utility: Check Internet Connection ==========
-
-def is_connected():
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=2)
-        return True
-    except OSError:
-        return False
-
-# ========== Get Wi-Fi Networks (Linux) ==========
-
-def get_wifi_networks_linux():
-    try:
-        result = subprocess.check_output("nmcli -t -f active,ssid,signal dev wifi", shell=True).decode()
-        networks = []
-        current_ssid = None
-
-        for line in result.strip().split("\n"):
-            parts = line.strip().split(":")
-            if len(parts) < 3:
-                continue
-            active, ssid, signal = parts
-            networks.append((ssid, signal, active == "yes"))
-            if active == "yes":
-                current_ssid = ssid
-        return current_ssid, networks
-    except Exception as e:
-        return None, []
-
-# ========== Get Wi-Fi Networks (macOS) ==========
-
-def get_wifi_networks_mac():
-    try:
-        result = subprocess.check_output("airport -s", shell=True).decode()
-        networks = []
-        current_ssid = None
-
-        for line in result.strip().split("\n"):
-            if line.startswith("SSID"):
-                continue
-            parts = line.strip().split()
-            if len(parts) < 3:
-                continue
-            ssid, signal = parts[0], parts[2]
-            networks.append((ssid, signal, False))  # macOS doesn't show active status here
-        return current_ssid, networks
-    except Exception as e:
-        return None, []
-
-# ========== Get Wi-Fi Networks (Windows) ==========
-
-def get_wifi_networks_windows():
-    try:
-        result = subprocess.check_output("netsh wlan show networks mode=Bssid", shell=True).decode()
-        networks = []
-        current_ssid = None
-
-        for line in result.strip().split("\n"):
-            if "SSID" in line:
-                ssid = line.split(":")[1].strip()
-                networks.append((ssid, "N/A", False))  # Windows doesn't show signal strength easily
-        return current_ssid, networks
-    except Exception as e:
-        return None, []
-
 # ========== Custom QLabel for Clickable Icon ==========
 
 class ClickableLabel(QLabel):
@@ -166,19 +107,27 @@ class SliderWidget(QFrame):
         self.anim = anim
 
     def showPopup(self):
-        if hasattr(self.parent(), "current_mode"):
-            try:
-                if self.parent().current_mode == "vital":
-                    subprocess.Popen([sys.executable, "screen_saver.py"])
-                elif self.parent().current_mode == "inventory":
-                    subprocess.Popen([sys.executable, "SCREENSAVER.py"])
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to launch: {e}")
+        # The slider is reparented into a wrapper, so look up the dashboard.
+        dashboard = self.parentWidget()
+        while dashboard is not None and not hasattr(dashboard, "current_mode"):
+            dashboard = dashboard.parentWidget()
+        if dashboard is None:
+            return
+
+        page = {"vital": "screen_saver", "inventory": "inventory"}.get(dashboard.current_mode)
+        if page is None:
+            return
+
+        try:
+            if not navigate_to(self, page):
+                QMessageBox.critical(self, "Error", "Dashboard is not running inside the main controller.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open {page}: {e}")
 
 # ================== Main Window ==================
 class FullScreenWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
         self.vital_images = [
@@ -194,22 +143,29 @@ class FullScreenWindow(QMainWindow):
         self.current_images = []
         self.image_index = 0
         self.current_mode = None
+        self.wifi_popup = None
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_slideshow)
 
+        # Slides are decoded off the GUI thread, straight at canvas size.
+        self.slide_loader = ImageLoader(self, load_function=asset_cache.load_image)
+        self.slide_loader.image_ready.connect(self.show_slide)
+
         self.initUI()
 
     def initUI(self):
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
         self.setStyleSheet(QSS_STYLE)
 
-        background_image = QPixmap("Images/background.jpg").scaled(
-            self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation
-        )
+        background_image = asset_cache.load_pixmap("Images/background.jpg", self.size(), Qt.IgnoreAspectRatio)
         palette = QPalette()
         palette.setBrush(QPalette.Window, QBrush(background_image))
         self.setPalette(palette)
+        self.setAutoFillBackground(True)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -220,7 +176,7 @@ class FullScreenWindow(QMainWindow):
         # Top Bar
         top_layout = QHBoxLayout()
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Images/logos/Logo.png").scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        logo_pixmap = asset_cache.load_pixmap("Images/logos/Logo.png", QSize(100, 100))
         logo_label.setPixmap(logo_pixmap)
         top_layout.addWidget(logo_label, alignment=Qt.AlignLeft)
         top_layout.addStretch()
@@ -228,13 +184,13 @@ class FullScreenWindow(QMainWindow):
         # Wi-Fi Icon
         self.wifi_icon = ClickableLabel()
         self.wifi_icon.clicked.connect(self.show_wifi_info)
-        self.update_wifi_icon()
         top_layout.addWidget(self.wifi_icon, alignment=Qt.AlignRight)
 
-        # Timer to refresh icon
-        self.network_timer = QTimer()
-        self.network_timer.timeout.connect(self.update_wifi_icon)
-        self.network_timer.start(10000)
+        # Connectivity is probed on a background thread; the icon is only
+        # redrawn when the state actually changes.
+        monitor = connectivity.shared_monitor()
+        self.update_wifi_icon(bool(monitor.online))
+        monitor.state_changed.connect(self.update_wifi_icon)
 
         # Support Button
         support_button = QPushButton("Support")
@@ -307,8 +263,8 @@ class FullScreenWindow(QMainWindow):
 
         main_layout.addLayout(bottom_layout)
 
-    def update_wifi_icon(self):
-        icon_file = "wifi_connected.png" if is_connected() else "wifi_disconnected.png"
+    def update_wifi_icon(self, connected):
+        icon_file = "wifi_connected.png" if connected else "wifi_disconnected.png"
         icon_path = os.path.join("Images", "icons", icon_file)
 
         if not os.path.exists(icon_path):
@@ -316,23 +272,34 @@ class FullScreenWindow(QMainWindow):
             self.wifi_icon.clear()
             return
 
-        pixmap = QPixmap(icon_path)
+        pixmap = asset_cache.load_pixmap(icon_path, QSize(32, 32))
         if pixmap.isNull():
             print(f"⚠ Failed to load pixmap: {icon_path}")
             self.wifi_icon.clear()
         else:
-            self.wifi_icon.setPixmap(pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.wifi_icon.setPixmap(pixmap)
 
     def show_wifi_info(self):
-        current_ssid, networks = None, []
-
-        if platform.system() == "Linux":
-            current_ssid, networks = get_wifi_networks_linux()
-        elif platform.system() == "Darwin":  # macOS
-            current_ssid, networks = get_wifi_networks_mac()
-        elif platform.system() == "Windows":
-            current_ssid, networks = get_wifi_networks_windows()
-
+        # The popup is built once and reused. Its model is filled from the
+        # scanner's cache and patched in place by every fresh scan.
+        scanner = wifi_scanner.shared_scanner()
+        if self.wifi_popup is None:
+            self.wifi_popup = self.build_wifi_popup()
+            scanner.networks_updated.connect(self.update_wifi_networks)
+            self.update_wifi_networks(scanner.networks())
+            # NetworkManager events (connect, drop, roam) re-scan right away.
+            network_monitor = nm_monitor.shared_monitor()
+            if network_monitor is not None:
+                network_monitor.state_changed.connect(lambda state: scanner.refresh())
+        if not scanner.is_fresh():
+            scanner.refresh()
+
+        # Position under icon
+        global_pos = self.wifi_icon.mapToGlobal(QPoint(0, self.wifi_icon.height()))
+        self.wifi_popup.move(global_pos)
+        self.wifi_popup.show()
+
+    def build_wifi_popup(self):
         popup = QWidget(self)
         popup.setWindowFlags(Qt.FramelessWindowHint | Qt.Popup)
         popup.setStyleSheet("""
@@ -344,23 +311,139 @@ class FullScreenWindow(QMainWindow):
         """)
 
         layout = QVBoxLayout()
-        title = QLabel(f"Connected to: {current_ssid if current_ssid else 'None'}")
-        layout.addWidget(title)
-
-        list_widget = QListWidget()
-        for ssid, signal, is_active in networks:
-            item = QListWidgetItem(f"{ssid} ({signal}%)")
-            if is_active:
-                item.setBackground(Qt.lightGray)
-            list_widget.addItem(item)
-
-        def on_item_clicked(item):
-            selected_ssid = item.text().split(" (")[0]
-            QMessageBox.information(popup, "Wi-Fi", f"Connecting to {selected_ssid}...")
-            # Here you would implement the logic to connect to the selected network
-
-        list_widget.itemClicked.connect(on_item_clicked)
-        layout.addWidget(list_widget)
+        self.wifi_title = QLabel()
+        layout.addWidget(self.wifi_title)
+
+        self.wifi_model = WifiNetworkModel(popup)
+        self.wifi_list = QListView()
+        self.wifi_list.setModel(self.wifi_model)
+        self.wifi_list.setUniformItemSizes(True)
+        self.wifi_list.clicked.connect(self.on_network_clicked)
+        layout.addWidget(self.wifi_list)
+
+        # Connect progress; the attempt itself runs on the connector's thread.
+        status_layout = QHBoxLayout()
+        self.wifi_status = QLabel()
+        self.wifi_cancel_button = QPushButton("Cancel")
+        self.wifi_cancel_button.hide()
+        status_layout.addWidget(self.wifi_status, 1)
+        status_layout.addWidget(self.wifi_cancel_button)
+        layout.addLayout(status_layout)
+
+        self.wifi_connector = WifiConnector(parent=self)
+        self.wifi_connector.stage_changed.connect(self.on_connect_stage)
+        self.wifi_connector.finished.connect(self.on_connect_finished)
+        self.wifi_cancel_button.clicked.connect(self.wifi_connector.cancel)
+        self.connecting_network = None
 
         popup.setLayout(layout)
-        popup.show()
+        return popup
+
+    def update_wifi_networks(self, networks):
+        self.wifi_model.set_networks(networks)
+        current_ssid = self.wifi_model.current_ssid()
+        self.wifi_title.setText(f"Connected to: {current_ssid if current_ssid else 'None'}")
+
+    def on_network_clicked(self, index):
+        network = self.wifi_model.network_at(index.row())
+        if network.active:
+            self.wifi_status.setText(f"Already connected to {network.ssid}")
+        elif not self.wifi_connector.is_busy():
+            self.start_wifi_connect(network)
+
+    def start_wifi_connect(self, network, password=None):
+        self.connecting_network = network
+        self.wifi_connector.connect_to(network, password)
+        self.wifi_status.setText(f"Connecting to {network.ssid}…")
+        self.wifi_cancel_button.show()
+
+    def on_connect_stage(self, stage):
+        self.wifi_status.setText(f"{self.wifi_connector.ssid}: {STAGE_LABELS.get(stage, stage)}")
+
+    def on_connect_finished(self, ok, message):
+        self.wifi_cancel_button.hide()
+        network = self.connecting_network
+        if not ok and message in (PASSWORD_REQUIRED, PASSWORD_REJECTED):
+            if message == PASSWORD_REJECTED:
+                self.wifi_status.setText(f"⚠ {network.ssid}: wrong password, try again")
+            else:
+                self.wifi_status.clear()
+            dialog = PasswordDialog(network.ssid, self)
+            dialog.setAttribute(Qt.WA_DeleteOnClose)
+            dialog.password_entered.connect(lambda password: self.start_wifi_connect(network, password))
+            dialog.open()
+            return
+        self.wifi_status.setText(message if ok else f"⚠ {network.ssid}: {message}")
+        if ok:
+            wifi_scanner.shared_scanner().refresh()
+            connectivity.shared_monitor().trigger(immediate=True)
+
+    def confirm_exit(self):
+        msg = QMessageBox(self)
+        msg.setText("⚠ You are Logging Out. Do you want to continue?")
+        msg.setIcon(QMessageBox.Warning)
+        msg.setStandardButtons(QMessageBox.Yes | QMessageBox.Cancel)
+        msg.setDefaultButton(QMessageBox.Cancel)
+        msg.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
+        msg.setStyleSheet("""
+            QMessageBox {
+                background-color: #fefefe;
+                border: 2px solid #ccc;
+                border-radius: 15px;
+                font-size: 16px;
+            }
+            QPushButton {
+                min-width: 80px;
+                padding: 6px;
+                border-radius: 8px;
+                background-color: #3498db;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+            QPushButton:pressed {
+                background-color: #1c5980;
+            }
+        """)
+        result = msg.exec_()
+        if result == QMessageBox.Yes:
+            QApplication.quit()
+
+    def start_vital_slideshow(self):
+        self.current_mode = "vital"
+        self.slider.setVisible(True)
+        self.start_slideshow(self.vital_images)
+
+    def start_inventory_slideshow(self):
+        self.current_mode = "inventory"
+        self.slider.setVisible(True)
+        self.start_slideshow(self.inventory_images)
+
+    def start_slideshow(self, images):
+        self.current_images = [img for img in images if os.path.exists(img)]
+        if not self.current_images:
+            self.canvas_label.setText("No images found.")
+            self.timer.stop()
+            return
+        self.image_index = 0
+        self.update_slideshow()
+        self.timer.start(3000)
+
+    def update_slideshow(self):
+        if not self.current_images:
+            return
+        size = self.canvas_label.size()
+        self.slide_loader.request(self.current_images[self.image_index], size)
+        self.image_index = (self.image_index + 1) % len(self.current_images)
+        # Decode the next slide while this one is on screen.
+        self.slide_loader.prefetch(self.current_images[self.image_index], size)
+
+    def show_slide(self, image_path, image):
+        if image_path in self.current_images:
+            self.canvas_label.setPixmap(QPixmap.fromImage(image))
+
+# ================== Run App ==================
+if __name__ == '__main__':
+    from main_controller import run
+    sys.exit(run("admin_dashboard"))
@@ -0,0 +1,243 @@
+import os
+import sys
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt, QSize
+
+from image_loader import read_scaled_image
+
+# ================== Settings ==================
+CACHE_DIR = os.environ.get(
+    "DROID_ASSET_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "droid_gui", "assets"),
+)
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+# Decoded derivatives kept in memory, so repeated requests (backgrounds and
+# logos shared by several screens, the Wi-Fi icons on every connectivity
+# change) don't even touch the disk cache. Bounded by decoded size: one
+# full-screen background weighs as much as hundreds of icons.
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+
+MODE_NAMES = {
+    Qt.IgnoreAspectRatio: "ignore",
+    Qt.KeepAspectRatio: "keep",
+    Qt.KeepAspectRatioByExpanding: "expand",
+}
+
+_memory = OrderedDict()
+_memory_bytes = 0
+_lock = threading.Lock()
+
+
+# ========== Utility: Cache Keys ==========
+def cache_key(path, size, mode=Qt.KeepAspectRatio):
+    """Key a derivative on (source path, mtime, file size, target size, mode).
+
+    Returns None when the source doesn't exist.
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    raw = f"{path}|{st.st_mtime_ns}|{st.st_size}|{size.width()}x{size.height()}|{MODE_NAMES[mode]}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _cache_file(key, path):
+    # Keep JPEG sources as JPEG (small, fast to decode); PNG keeps alpha.
+    ext = ".jpg" if path.lower().endswith((".jpg", ".jpeg")) else ".png"
+    return os.path.join(CACHE_DIR, key + ext)
+
+
+def _remember(key, image):
+    global _memory_bytes
+    with _lock:
+        previous = _memory.pop(key, None)
+        if previous is not None:
+            _memory_bytes -= previous.sizeInBytes()
+        _memory[key] = image
+        _memory_bytes += image.sizeInBytes()
+        # The newest image stays even if it alone is over the budget.
+        while _memory_bytes > MAX_MEMORY_BYTES and len(_memory) > 1:
+            _memory_bytes -= _memory.popitem(last=False)[1].sizeInBytes()
+
+
+def memory_usage():
+    """(images, decoded bytes) held in memory."""
+    with _lock:
+        return len(_memory), _memory_bytes
+
+
+# ================== Derivatives ==================
+def build_derivative(path, size, mode=Qt.KeepAspectRatio):
+    """Decode ``path`` and scale it to ``size`` exactly as the screens did
+    with ``QPixmap(path).scaled(size, mode, Qt.SmoothTransformation)``."""
+    image = read_scaled_image(path, size, mode)
+    if image.isNull():
+        return image
+    target = image.size().scaled(size, mode)
+    if image.size() != target:
+        image = image.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def load_image(path, size, mode=Qt.KeepAspectRatio):
+    """Return ``path`` scaled to ``size`` as a QImage, from the cache when
+    possible. Safe to call from worker threads."""
+    key = cache_key(path, size, mode)
+    if key is None:
+        print(f"⚠ Asset not found: {path}")
+        return QImage()
+
+    with _lock:
+        image = _memory.get(key)
+        if image is not None:
+            _memory.move_to_end(key)
+            return image
+
+    cache_file = _cache_file(key, path)
+    image = QImage(cache_file) if os.path.exists(cache_file) else QImage()
+    if not image.isNull():
+        try:
+            os.utime(cache_file)  # mark as recently used for eviction
+        except OSError:
+            pass
+    else:
+        image = build_derivative(path, size, mode)
+        if image.isNull():
+            return image
+        _store(cache_file, image)
+    _remember(key, image)
+    return image
+
+
+def load_pixmap(path, size, mode=Qt.KeepAspectRatio):
+    """GUI-thread convenience wrapper around :func:`load_image`."""
+    return QPixmap.fromImage(load_image(path, size, mode))
+
+
+def _store(cache_file, image):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fmt = "JPG" if cache_file.endswith(".jpg") else "PNG"
+        if image.save(tmp_file, fmt, 92 if fmt == "JPG" else -1):
+            os.replace(tmp_file, cache_file)
+        elif os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    except OSError as e:
+        print(f"⚠ Could not write asset cache: {e}")
+        return
+    evict()
+
+
+# ================== LRU Eviction ==================
+def cache_entries(directory=None):
+    """(path, bytes, last-used mtime) for every cached file, oldest first.
+    ``directory`` defaults to CACHE_DIR (the thumbnail cache uses it too)."""
+    directory = directory or CACHE_DIR
+    entries = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return entries
+    for name in names:
+        if name.endswith(".tmp"):
+            continue
+        file_path = os.path.join(directory, name)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        entries.append((file_path, st.st_size, st.st_mtime))
+    entries.sort(key=lambda entry: entry[2])
+    return entries
+
+
+def evict(max_bytes=None, directory=None):
+    """Delete least recently used derivatives until the cache fits."""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = cache_entries(directory)
+    total = sum(entry[1] for entry in entries)
+    for file_path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(file_path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def clear():
+    global _memory_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+    for file_path, _, _ in cache_entries():
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+# ================== Prebuild ==================
+# Assets the screens request, as (path, size, mode). "screen" means the
+# full-screen size the window will have.
+SCREEN_ASSETS = [
+    ("Images/background.jpg", "screen", Qt.IgnoreAspectRatio),
+    ("Images/3f879af94e037b6ee67e2193cdbb436d 1.png", "screen", Qt.KeepAspectRatioByExpanding),
+    ("Images/3f879af94e037b6ee67e2193cdbb436d 1.png", "screen", Qt.IgnoreAspectRatio),
+    ("Images/9070125.jpg", "screen", Qt.KeepAspectRatioByExpanding),
+    ("Images/download2.jpeg", "screen", Qt.KeepAspectRatioByExpanding),
+    ("Images/logos/Logo.png", QSize(100, 100), Qt.KeepAspectRatio),
+    ("Images/logos/Logo.png", QSize(120, 60), Qt.IgnoreAspectRatio),
+    ("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(200, 100), Qt.IgnoreAspectRatio),
+    ("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(120, 60), Qt.IgnoreAspectRatio),
+    ("Images/icons/wifi_connected.png", QSize(32, 32), Qt.KeepAspectRatio),
+    ("Images/icons/wifi_disconnected.png", QSize(32, 32), Qt.KeepAspectRatio),
+    ("Images/icons/Group 8.png", QSize(300, 50), Qt.IgnoreAspectRatio),
+    ("Images/Slide_images/slide1_vital.jpg", QSize(700, 460), Qt.KeepAspectRatio),
+    ("Images/Slide_images/slide2_vital.jpg", QSize(700, 460), Qt.KeepAspectRatio),
+    ("Images/Slide_images/slide3_vital.jpg", QSize(700, 460), Qt.KeepAspectRatio),
+    ("Images/Slide_images/slide1_inventory.jpg", QSize(700, 460), Qt.KeepAspectRatio),
+]
+
+
+def prebuild(screen_size):
+    built = 0
+    for path, size, mode in SCREEN_ASSETS:
+        size = screen_size if size == "screen" else size
+        if not load_image(path, size, mode).isNull():
+            built += 1
+    return built
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the display-sized asset cache.")
+    parser.add_argument("command", choices=["prebuild", "stats", "clear"])
+    parser.add_argument("--width", type=int, help="screen width (default: primary screen)")
+    parser.add_argument("--height", type=int, help="screen height (default: primary screen)")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if args.command == "prebuild":
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+        screen_size = app.primaryScreen().size()
+        if args.width and args.height:
+            screen_size = QSize(args.width, args.height)
+        count = prebuild(screen_size)
+        print(f"Prebuilt {count} assets for {screen_size.width()}x{screen_size.height()} in {CACHE_DIR}")
+    elif args.command == "stats":
+        entries = cache_entries()
+        total = sum(entry[1] for entry in entries)
+        print(f"{len(entries)} files, {total / 1024 / 1024:.1f} MB of {MAX_CACHE_BYTES / 1024 / 1024:.0f} MB in {CACHE_DIR}")
+    else:
+        clear()
+        print(f"Cleared {CACHE_DIR}")
@@ -0,0 +1,58 @@
+import time
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPixmap, QPainter
+from PyQt5.QtCore import Qt, QSize
+
+import asset_cache
+
+
+# ===== BACKGROUND WIDGET =====
+class BackgroundWidget(QWidget):
+    """Paints a background image stretched to the widget.
+
+    The scaled pixmap is built on the first paint after a size change (through
+    the asset cache) and repaints only blit the exposed region, so keystrokes, focus changes
+    and caret blinks don't rescale a full-screen image.
+    """
+
+    def __init__(self, background_path, parent=None):
+        super().__init__(parent)
+        self.background_path = background_path
+        self.scaled_pixmap = QPixmap()
+        self.scaled_size = QSize()
+
+        # Paint-time counters, see paint_stats().
+        self.paint_count = 0
+        self.scale_count = 0
+        self.paint_time_ms = 0.0
+        self.scale_time_ms = 0.0
+        self.last_paint_ms = 0.0
+
+    def rescale(self):
+        start = time.perf_counter()
+        self.scaled_size = QSize(self.size())
+        self.scaled_pixmap = asset_cache.load_pixmap(self.background_path, self.scaled_size, Qt.IgnoreAspectRatio)
+        self.scale_time_ms += (time.perf_counter() - start) * 1000
+        self.scale_count += 1
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        if self.scaled_size != self.size():
+            self.rescale()
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawPixmap(rect, self.scaled_pixmap, rect)
+        painter.end()
+
+        self.last_paint_ms = (time.perf_counter() - start) * 1000
+        self.paint_time_ms += self.last_paint_ms
+        self.paint_count += 1
+
+    def paint_stats(self):
+        return {
+            "paints": self.paint_count,
+            "rescales": self.scale_count,
+            "avg_paint_ms": self.paint_time_ms / self.paint_count if self.paint_count else 0.0,
+            "last_paint_ms": self.last_paint_ms,
+            "total_scale_ms": self.scale_time_ms,
+        }
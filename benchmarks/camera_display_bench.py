@@ -0,0 +1,130 @@
+"""Per-frame cost of showing a camera frame, old path vs VideoSurface.
+
+``label`` is the original CameraScreen path: cvtColor BGR->RGB, QImage over
+the copy, QPixmap.fromImage and QLabel.setPixmap. QLabel doesn't scale, so
+it only ever shows the top-left corner of a large frame; ``label_fit`` adds
+the smooth aspect-fit scale needed to show the whole frame that way.
+``surface`` hands the BGR array to video_surface.VideoSurface
+(``surface_fast`` with nearest-neighbour scaling). Every path is repainted
+synchronously under ``QT_QPA_PLATFORM=offscreen`` and timed from frame
+hand-off to the end of the paint.
+
+    python benchmarks/camera_display_bench.py
+    python benchmarks/camera_display_bench.py --resolutions 1920x1080 --frames 300 --output display.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QLabel
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt
+
+from video_surface import VideoSurface
+
+RESOLUTIONS = ["1280x720", "1920x1080"]
+# Roughly the camera feed's share of a 1920x1080 screen.
+DISPLAY_SIZE = "1024x648"
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def synthetic_frames(width, height, count=8):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def show_with_label(label, frame):
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = frame.shape
+    qimg = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
+    label.setPixmap(QPixmap.fromImage(qimg))
+    label.repaint()
+
+
+def show_with_label_fit(label, frame):
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = frame.shape
+    qimg = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
+    label.setPixmap(QPixmap.fromImage(qimg).scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+    label.repaint()
+
+
+def show_with_surface(surface, frame):
+    surface.set_frame(frame)
+    surface.repaint()
+
+
+def time_path(show, widget, frames, count):
+    for frame in frames:  # warm up
+        show(widget, frame)
+    times = []
+    for i in range(count):
+        start = time.perf_counter()
+        show(widget, frames[i % len(frames)])
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "p90_ms": round(times[int(len(times) * 0.9)], 3),
+        "fps_equivalent": round(1000 / statistics.median(times), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolutions", nargs="+", default=RESOLUTIONS, help="frame sizes, WxH")
+    parser.add_argument("--display", default=DISPLAY_SIZE, help="widget size, WxH")
+    parser.add_argument("--frames", type=int, default=200, help="timed frames per path")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    display_w, display_h = parse_size(args.display)
+
+    label = QLabel()
+    label.setStyleSheet("background-color: black;")
+    label.resize(display_w, display_h)
+    label.show()
+    surface = VideoSurface()
+    surface.resize(display_w, display_h)
+    surface.show()
+    fast_surface = VideoSurface(smooth=False)
+    fast_surface.resize(display_w, display_h)
+    fast_surface.show()
+    app.processEvents()
+
+    results = {}
+    for resolution in args.resolutions:
+        frames = synthetic_frames(*parse_size(resolution))
+        results[resolution] = {
+            "label": time_path(show_with_label, label, frames, args.frames),
+            "label_fit": time_path(show_with_label_fit, label, frames, args.frames),
+            "surface": time_path(show_with_surface, surface, frames, args.frames),
+            "surface_fast": time_path(show_with_surface, fast_surface, frames, args.frames),
+        }
+
+    print(f"{'frame':>10} {'path':>13} {'median ms':>10} {'p90 ms':>8}")
+    for resolution, paths in results.items():
+        for path, result in paths.items():
+            print(f"{resolution:>10} {path:>13} {result['median_ms']:>10.2f} {result['p90_ms']:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"display": args.display, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
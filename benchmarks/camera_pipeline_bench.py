@@ -0,0 +1,131 @@
+"""Headless benchmark of the full camera path: capture -> display.
+
+A SyntheticSource feeds CaptureWorker on its capture thread exactly as a
+camera would; the GUI side takes the newest frame, hands it to VideoSurface
+and repaints it synchronously under ``QT_QPA_PLATFORM=offscreen``. For each
+resolution it reports sustained displayed FPS, capture-to-painted latency
+(p50/p99), dropped frames and process CPU time per displayed frame (all
+threads).
+
+    python benchmarks/camera_pipeline_bench.py
+    python benchmarks/camera_pipeline_bench.py --resolutions 1920x1080 --fps 60 --seconds 10
+    python benchmarks/camera_pipeline_bench.py --source file:clip.mp4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from camera_capture import CaptureWorker
+from frame_sources import SyntheticSource, parse_source
+from video_surface import VideoSurface
+
+RESOLUTIONS = ["1280x720", "1920x1080", "3840x2160"]
+DISPLAY_SIZE = "1024x648"
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_pipeline(app, source, surface, seconds, warmup=1.0):
+    capture = CaptureWorker(source)
+    latencies = []
+    state = {"measuring": False, "displayed": 0}
+
+    def show_frame():
+        frame = capture.take_latest()
+        if frame is None:
+            return
+        surface.set_frame(frame.image)
+        surface.repaint()
+        capture.mark_displayed(frame)
+        if state["measuring"]:
+            latencies.append((time.monotonic() - frame.timestamp) * 1000)
+            state["displayed"] += 1
+
+    capture.frame_ready.connect(show_frame)
+    capture.start()
+    end = time.monotonic() + warmup
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.0005)
+
+    captured_start = capture.captured
+    dropped_start = capture.ring.dropped
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    state["measuring"] = True
+    end = wall_start + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.0005)
+    state["measuring"] = False
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    capture.stop()
+
+    displayed = state["displayed"]
+    return {
+        "source": source.name,
+        "captured_fps": round((capture.captured - captured_start) / wall, 1),
+        "displayed_fps": round(displayed / wall, 1),
+        "dropped": capture.ring.dropped - dropped_start,
+        "latency_p50_ms": round(percentile(latencies, 0.5), 2) if latencies else None,
+        "latency_p99_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "cpu_ms_per_frame": round(cpu * 1000 / displayed, 2) if displayed else None,
+        "cpu_cores": round(cpu / wall, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolutions", nargs="+", default=RESOLUTIONS, help="synthetic frame sizes, WxH")
+    parser.add_argument("--fps", type=float, default=30.0, help="synthetic source rate (0 = as fast as possible)")
+    parser.add_argument("--source", help="frame_sources spec to use instead of synthetic frames")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured time per run")
+    parser.add_argument("--display", default=DISPLAY_SIZE, help="video surface size, WxH")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    surface = VideoSurface()
+    surface.resize(*parse_size(args.display))
+    surface.show()
+    app.processEvents()
+
+    if args.source:
+        runs = {args.source: parse_source(args.source)}
+    else:
+        runs = {resolution: SyntheticSource(*parse_size(resolution), args.fps) for resolution in args.resolutions}
+
+    results = {}
+    for label, source in runs.items():
+        results[label] = run_pipeline(app, source, surface, args.seconds)
+        r = results[label]
+        print(f"{label:>12}: {r['displayed_fps']:6.1f} fps shown of {r['captured_fps']:6.1f} captured, "
+              f"latency p50 {r['latency_p50_ms']} ms / p99 {r['latency_p99_ms']} ms, "
+              f"{r['cpu_ms_per_frame']} ms CPU/frame ({r['cpu_cores']} cores), {r['dropped']} dropped")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"display": args.display, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
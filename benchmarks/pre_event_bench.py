@@ -0,0 +1,106 @@
+"""Memory and CPU cost of the pre-event buffer.
+
+Feeds a CaptureWorker from a noisy SyntheticSource (noise keeps the JPEG
+sizes close to real footage) and runs it once without and once with a
+PreEventBuffer. Reports JPEG bytes per buffered frame, the memory a 30/60/120 s
+window needs, encode time, the extra CPU the buffer costs (in cores, all
+threads) and how long saving a full buffer to disk takes.
+
+    python benchmarks/pre_event_bench.py
+    python benchmarks/pre_event_bench.py --resolutions 1920x1080 --seconds 20 --fps 15 --quality 60
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from camera_capture import CaptureWorker
+from frame_sources import SyntheticSource
+from pre_event_buffer import PreEventBuffer, BUFFER_FPS, JPEG_QUALITY
+
+RESOLUTIONS = ["1280x720", "1920x1080"]
+WINDOWS = (30, 60, 120)
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def cpu_cores(source, seconds, buffer=None):
+    capture = CaptureWorker(source)
+    if buffer is not None:
+        buffer.start()
+        capture.add_listener(buffer.push)
+    capture.start()
+    time.sleep(1.0)  # warm-up
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    time.sleep(seconds)
+    cores = (time.process_time() - cpu_start) / (time.monotonic() - wall_start)
+    capture.stop()
+    if buffer is not None:
+        buffer.stop()
+    return cores
+
+
+def measure(size, args):
+    width, height = size
+    source = lambda: SyntheticSource(width, height, args.camera_fps, noise=args.noise)
+    baseline = cpu_cores(source(), args.seconds)
+    output_dir = tempfile.mkdtemp(prefix="pre_event_bench_")
+    buffer = PreEventBuffer(seconds=max(WINDOWS), fps=args.fps, quality=args.quality, output_dir=output_dir)
+    with_buffer = cpu_cores(source(), args.seconds, buffer)
+
+    chunks = buffer.chunks()
+    frame_bytes = sum(len(chunk.jpeg) for chunk in chunks) / len(chunks)
+    started = time.monotonic()
+    path = os.path.join(output_dir, "event.mp4")
+    buffer._write_event(chunks, path)
+    flush_s = time.monotonic() - started
+    flushed_seconds = chunks[-1].timestamp - chunks[0].timestamp
+    return {
+        "kb_per_frame": round(frame_bytes / 1024, 1),
+        "mb_per_window": {f"{window}s": round(frame_bytes * args.fps * window / 1024 / 1024, 1) for window in WINDOWS},
+        "raw_mb_per_window": {f"{window}s": round(width * height * 3 * args.fps * window / 1024 / 1024) for window in WINDOWS},
+        "avg_encode_ms": buffer.stats()["avg_encode_ms"],
+        "skipped": buffer.skipped,
+        "cpu_cores_capture_only": round(baseline, 3),
+        "cpu_cores_with_buffer": round(with_buffer, 3),
+        "buffer_cpu_cores": round(with_buffer - baseline, 3),
+        "flush_s_per_buffered_minute": round(flush_s * 60 / flushed_seconds, 2) if flushed_seconds else None,
+        "flushed_file_mb": round(os.path.getsize(path) / 1024 / 1024, 1) if os.path.exists(path) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolutions", nargs="+", default=RESOLUTIONS, help="frame sizes, WxH")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measured time per run")
+    parser.add_argument("--fps", type=float, default=BUFFER_FPS, help="buffered frames per second")
+    parser.add_argument("--quality", type=int, default=JPEG_QUALITY, help="JPEG quality")
+    parser.add_argument("--camera-fps", type=float, default=30.0, help="synthetic camera rate")
+    parser.add_argument("--noise", type=float, default=4.0, help="synthetic sensor noise (grey levels)")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for resolution in args.resolutions:
+        r = results[resolution] = measure(parse_size(resolution), args)
+        windows = ", ".join(f"{window} {mb} MB" for window, mb in r["mb_per_window"].items())
+        print(f"{resolution:>10}: {r['kb_per_frame']} KB/frame -> {windows} "
+              f"(raw would be {r['raw_mb_per_window']['60s']} MB for 60s); "
+              f"encode {r['avg_encode_ms']} ms, +{r['buffer_cpu_cores']} cores; "
+              f"flush {r['flush_s_per_buffered_minute']} s per buffered minute")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"fps": args.fps, "quality": args.quality, "noise": args.noise, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Cold-start benchmark for the entry scripts.
+
+Each run launches a fresh interpreter under ``QT_QPA_PLATFORM=offscreen`` and
+times each phase: interpreter start, imports (PyQt5, the screen module and
+its heavy dependencies), QApplication creation, widget construction
+(``initUI``/``init_ui`` run from ``__init__``) and first paint. Medians over
+N runs are written as JSON.
+
+    python benchmarks/startup_bench.py --runs 5 --output startup.json
+    python benchmarks/startup_bench.py --runs 5 --compare startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = [
+    "Nurse_dashboard.py",
+    "admin_dashboard.py",
+    "camera_screen.py",
+    "inventory_table.py",
+    "screen_saver.py",
+    "login.py",
+    "patient_login.py",
+]
+
+PHASES = ["interpreter_ms", "import_ms", "qapplication_ms", "construct_ms", "first_paint_ms", "total_ms"]
+
+RESULT_MARKER = "BENCH_RESULT "
+
+# Runs inside the child interpreter. {repo} and {module} are filled in.
+CHILD_SCRIPT = r'''
+import time
+wall_start = time.time()
+start = time.perf_counter()
+import sys, json
+sys.path.insert(0, {repo!r})
+
+import_start = time.perf_counter()
+from PyQt5.QtCore import Qt, QCoreApplication, QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+import screen_registry
+name = next(n for n, s in screen_registry.SCREENS.items() if s.module == {module!r})
+page_class = screen_registry.load_screen_class(name)
+import_end = time.perf_counter()
+
+QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+app = QApplication(sys.argv)
+app_end = time.perf_counter()
+
+class FirstPaint(QObject):
+    painted_at = None
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.painted_at is None:
+            self.painted_at = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+
+window = page_class()
+construct_end = time.perf_counter()
+window.show()
+QTimer.singleShot(10000, app.quit)
+app.exec_()
+paint_end = first_paint.painted_at or time.perf_counter()
+
+print({marker!r} + json.dumps({{
+    "wall_start": wall_start,
+    "import_ms": (import_end - import_start) * 1000,
+    "qapplication_ms": (app_end - import_end) * 1000,
+    "construct_ms": (construct_end - app_end) * 1000,
+    "first_paint_ms": (paint_end - construct_end) * 1000,
+    "child_ms": (paint_end - start) * 1000,
+    "painted": first_paint.painted_at is not None,
+}}), flush=True)
+window.close()
+'''
+
+
+def run_once(script):
+    module = os.path.splitext(script)[0]
+    code = CHILD_SCRIPT.format(repo=REPO_DIR, module=module, marker=RESULT_MARKER)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+
+    launched = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_DIR, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+            break
+    else:
+        raise RuntimeError(f"{script} produced no result (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+    interpreter_ms = (result.pop("wall_start") - launched) * 1000
+    child_ms = result.pop("child_ms")
+    result["interpreter_ms"] = interpreter_ms
+    result["total_ms"] = interpreter_ms + child_ms
+    return result
+
+
+def run_benchmark(scripts, runs):
+    report = {"runs": runs, "python": sys.version.split()[0], "scripts": {}}
+    for script in scripts:
+        samples = []
+        for i in range(runs):
+            samples.append(run_once(script))
+            print(f"{script} run {i + 1}/{runs}: {samples[-1]['total_ms']:.0f} ms", file=sys.stderr)
+        report["scripts"][script] = {
+            "median": {phase: round(statistics.median(s[phase] for s in samples), 2) for phase in PHASES},
+            "painted": all(s["painted"] for s in samples),
+            "samples": samples,
+        }
+    return report
+
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """Return a list of regressions: phases slower than the baseline by more
+    than ``threshold`` (fraction) and by at least ``min_delta_ms``."""
+    regressions = []
+    for script, data in current["scripts"].items():
+        base = baseline["scripts"].get(script)
+        if base is None:
+            continue
+        for phase in PHASES:
+            old, new = base["median"][phase], data["median"][phase]
+            if new - old >= min_delta_ms and new > old * (1 + threshold):
+                regressions.append(f"{script} {phase}: {old:.1f} ms -> {new:.1f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="runs per script (default 5)")
+    parser.add_argument("--scripts", nargs="+", default=SCRIPTS, help="entry scripts to measure")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if a phase regressed against this report")
+    parser.add_argument("--current", metavar="REPORT", help="compare this saved report instead of running")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown per phase (default 0.20)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run_benchmark(args.scripts, args.runs)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+import time
+import threading
+from collections import deque, namedtuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import cv2
+
+import camera_modes
+from frame_sources import DeviceSource
+
+# One captured frame. ``image`` is the BGR numpy array straight from
+# VideoCapture.read(); ``timestamp`` is time.monotonic() at capture.
+Frame = namedtuple("Frame", "seq image timestamp")
+
+RING_CAPACITY = 3
+LATENCY_WINDOW = 120
+REOPEN_DELAY = 2.0
+# A rate whose newest event is older than this has stopped: 0.
+RATE_STALE_SECONDS = 1.0
+PAUSED_POLL = 0.05
+
+
+def fit_within(width, height, max_size):
+    """(width, height) scaled down, keeping the aspect ratio, to fit
+    ``max_size`` (never up; None: unchanged)."""
+    if max_size is None or (width <= max_size[0] and height <= max_size[1]):
+        return width, height
+    scale = min(max_size[0] / width, max_size[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _rate(times):
+    """Events per second over a window of monotonic timestamps."""
+    if len(times) < 2 or times[-1] <= times[0] or time.monotonic() - times[-1] > RATE_STALE_SECONDS:
+        return 0.0
+    return (len(times) - 1) / (times[-1] - times[0])
+
+
+# ================== Frame Ring ==================
+class FrameRing:
+    """Small drop-oldest ring of frames shared by the capture thread and the
+    GUI. Frames that are pushed out, or skipped over by ``take_latest()``,
+    count as dropped."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self._frames = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def push(self, frame):
+        with self._lock:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+
+    def take_latest(self):
+        with self._lock:
+            if not self._frames:
+                return None
+            frame = self._frames.pop()
+            self.dropped += len(self._frames)
+            self._frames.clear()
+            return frame
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+
+# ================== Capture Worker ==================
+class CaptureWorker(QObject):
+    """Owns a frame source (frame_sources; a device index means a
+    DeviceSource) and reads it on its own thread, so the loop runs at
+    whatever rate the device delivers.
+
+    Every frame goes into a FrameRing. ``frame_ready`` is a queued
+    notification with at most one in flight; the GUI answers it with
+    ``take_latest()`` and reports back with ``mark_displayed()`` so
+    capture-to-display latency can be measured.
+
+    ``hardware_zoom`` is the device's CAP_PROP_ZOOM value at 1x when the
+    device accepts zoom requests (None otherwise); ``set_hardware_zoom()``
+    applies a zoom factor on the capture thread before the next read.
+
+    Capture modes work the same way: ``set_mode()`` (a CameraMode,
+    ``camera_modes.AUTO`` with the display size, or None for the driver
+    default) is applied on the capture thread, again after every reopen,
+    and ``mode_changed`` reports what the device actually delivers.
+    ``request_modes()`` lists the supported modes through ``modes_listed``.
+
+    Listeners added with ``add_listener()`` get every frame on the capture
+    thread (recording, snapshots, ...). They must return quickly: anything
+    slow belongs on the listener's own thread.
+
+    ``max_size`` (w, h) shrinks frames on the capture thread before anyone
+    sees them, for small views of big sources. While ``paused`` the source
+    keeps streaming but frames are only grabbed, not decoded or delivered.
+    ``stats()`` includes the capture thread's own CPU use.
+    """
+    frame_ready = pyqtSignal()
+    modes_listed = pyqtSignal(list)
+    mode_changed = pyqtSignal(object)
+
+    def __init__(self, source=0, capacity=RING_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.source = DeviceSource(source) if isinstance(source, int) else source
+        self.ring = FrameRing(capacity)
+
+        self.captured = 0
+        self.displayed = 0
+        self.read_failures = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._capture_times = deque(maxlen=LATENCY_WINDOW)
+        self._display_times = deque(maxlen=LATENCY_WINDOW)
+        # (wall, capture-thread CPU) per loop, for the thread's CPU use.
+        self._cpu_samples = deque(maxlen=LATENCY_WINDOW)
+        self.hardware_zoom = None
+        self._pending_zoom = None
+        self.mode = None
+        self.modes = None
+        self.default_mode = None        # what the device came up in
+        self.requested_mode = None
+        self.auto_size = None
+        self._mode_pending = False
+        self._modes_requested = False
+        self.max_size = None
+        self.paused = False
+        self._listeners = ()
+        self._notify_pending = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.is_running():
+            return
+        # Each run has its own stop event. A previous run whose read outlived
+        # stop()'s timeout keeps its (set) event, delivers nothing more and
+        # leaves the source to this run when its read returns.
+        self._stop = threading.Event()
+        self._reset_windows()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._reset_windows()
+
+    def _reset_windows(self):
+        # Rates, latencies and CPU use describe the current run only: a
+        # stopped worker reports none, and a window that spans a stop would
+        # average in the time the camera was closed.
+        for window in (self._latencies, self._capture_times, self._display_times, self._cpu_samples):
+            window.clear()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def set_hardware_zoom(self, factor):
+        self._pending_zoom = factor
+
+    def set_mode(self, mode, auto_size=None):
+        self.requested_mode = mode
+        self.auto_size = auto_size
+        self._mode_pending = True
+
+    def request_modes(self):
+        self._modes_requested = True
+
+    def add_listener(self, listener):
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener):
+        self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    def take_latest(self):
+        """Newest frame (or None); anything older is dropped."""
+        self._notify_pending.clear()
+        return self.ring.take_latest()
+
+    def mark_displayed(self, frame):
+        self.displayed += 1
+        self._display_times.append(time.monotonic())
+        self._latencies.append((time.monotonic() - frame.timestamp) * 1000)
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+        fps = _rate(self._capture_times)
+        samples = list(self._cpu_samples)
+        span = samples[-1][0] - samples[0][0] if len(samples) > 1 else 0.0
+        cores = (samples[-1][1] - samples[0][1]) / span if span > 0 else 0.0
+        return {
+            "captured": self.captured,
+            "displayed": self.displayed,
+            "dropped": self.ring.dropped,
+            "read_failures": self.read_failures,
+            "capture_fps": round(fps, 1),
+            "displayed_fps": round(_rate(self._display_times), 1),
+            "latency_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "latency_max_ms": round(latencies[-1], 1) if latencies else None,
+            "mode": camera_modes.mode_label(self.mode),
+            "paused": self.paused,
+            "cpu_cores": round(cores, 3),
+            "cpu_ms_per_frame": round(cores * 1000 / fps, 2) if fps and not self.paused else None,
+        }
+
+    def _open(self):
+        cap = self.source
+        if cap.open():
+            zoom = cap.get(cv2.CAP_PROP_ZOOM)
+            self.hardware_zoom = zoom if zoom > 0 and cap.set(cv2.CAP_PROP_ZOOM, zoom) else None
+            self.modes = None
+            self.default_mode = camera_modes.current_mode(cap)
+            self._mode_pending = True
+            return cap
+        cap.release()
+        return None
+
+    def _run(self, stop):
+        cap = None
+        warned = False
+        try:
+            while not stop.is_set():
+                if cap is None:
+                    cap = self._open()
+                    if cap is None:
+                        if not warned:
+                            print(f"⚠ Could not open camera {self.source.name}")
+                            warned = True
+                        stop.wait(REOPEN_DELAY)
+                        continue
+                    warned = False
+
+                zoom, self._pending_zoom = self._pending_zoom, None
+                if zoom is not None and self.hardware_zoom is not None:
+                    cap.set(cv2.CAP_PROP_ZOOM, self.hardware_zoom * zoom)
+                if self._modes_requested or self._mode_pending:
+                    if not self._update_mode(cap):
+                        break  # owner deleted
+
+                if self.paused:
+                    # Keep the stream flowing (no stale frames on resume)
+                    # without decoding anything.
+                    grab = getattr(cap, "grab", None)
+                    if grab is None or not grab():
+                        stop.wait(PAUSED_POLL)
+                    self._cpu_samples.append((time.monotonic(), time.thread_time()))
+                    continue
+
+                # Blocks until the device has a frame: the device sets the pace.
+                ok, image = cap.read()
+                if stop.is_set():
+                    break  # stopped while blocked in read()
+                if not ok:
+                    self.read_failures += 1
+                    cap.release()
+                    cap = None
+                    stop.wait(REOPEN_DELAY)
+                    continue
+                max_size = self.max_size
+                if max_size is not None:
+                    height, width = image.shape[:2]
+                    size = fit_within(width, height, max_size)
+                    if size != (width, height):
+                        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+                now = time.monotonic()
+                self.captured += 1
+                self._capture_times.append(now)
+                frame = Frame(self.captured, image, now)
+                self.ring.push(frame)
+                for listener in self._listeners:
+                    try:
+                        listener(frame)
+                    except Exception as e:
+                        print(f"⚠ Frame listener failed: {e}")
+                self._cpu_samples.append((time.monotonic(), time.thread_time()))
+                if not self._notify_pending.is_set():
+                    self._notify_pending.set()
+                    try:
+                        self.frame_ready.emit()
+                    except RuntimeError:
+                        break  # owner deleted
+        finally:
+            # A newer run may have opened the source meanwhile: it's theirs.
+            if cap is not None and stop is self._stop:
+                cap.release()
+
+    def _update_mode(self, cap):
+        requested = self.requested_mode
+        try:
+            if self._modes_requested or (requested == camera_modes.AUTO and self.modes is None):
+                self.modes = camera_modes.list_modes(cap)
+            if self._modes_requested:
+                self._modes_requested = False
+                self.modes_listed.emit(list(self.modes))
+            if self._mode_pending:
+                self._mode_pending = False
+                if requested == camera_modes.AUTO:
+                    requested = camera_modes.choose_auto(self.modes, *self.auto_size) if self.auto_size else None
+                if requested is None and self.mode not in (None, self.default_mode):
+                    # Back to the driver default after another mode was used.
+                    requested = self.default_mode
+                if requested is not None:
+                    self.mode = camera_modes.apply_mode(cap, requested)
+                else:
+                    self.mode = camera_modes.current_mode(cap)
+                self.mode_changed.emit(self.mode)
+        except RuntimeError:
+            return False
+        return True
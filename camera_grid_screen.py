@@ -0,0 +1,276 @@
+import sys
+import time
+from collections import deque
+from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QGridLayout, QWidget
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
+
+import asset_cache
+import camera_modes
+from camera_capture import CaptureWorker
+from frame_sources import default_sources
+from main_controller import navigate_back
+from video_surface import VideoSurface
+
+# All tiles are repainted together, at most this often.
+DISPLAY_FPS = 30
+STATS_INTERVAL_MS = 1000
+# Process CPU is averaged over this many stats intervals.
+CPU_WINDOW = 5
+# A tile's camera mode is renegotiated once its size has settled.
+RESIZE_SETTLE_MS = 300
+CAPTURE_STOP_TIMEOUT = 1.0
+
+CAPTION_STYLE = "font-size: 13px; color: #333; background-color: rgba(0, 0, 0, 0);"
+SUMMARY_STYLE = "font-size: 14px; color: #222; background-color: rgba(0, 0, 0, 0);"
+
+
+# ================== Camera Tile ==================
+class CameraTile(QWidget):
+    """One camera of the grid: its own CaptureWorker (and capture thread),
+    a VideoSurface and a caption with its stats. Frames are shrunk to the
+    tile on the capture thread, and the camera is asked for the smallest
+    mode that still fills the tile. Double-click asks for focus."""
+    focus_requested = pyqtSignal(object)
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.capture = CaptureWorker(source, parent=self)
+        self.requested_size = None
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self.resize_timer.timeout.connect(self.negotiate_mode)
+
+        self.surface = VideoSurface()
+        self.caption = QLabel(source.name)
+        self.caption.setStyleSheet(CAPTION_STYLE)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.addWidget(self.surface, 1)
+        layout.addWidget(self.caption)
+
+    def display_size(self):
+        ratio = self.surface.devicePixelRatioF()
+        return round(self.surface.width() * ratio), round(self.surface.height() * ratio)
+
+    def refresh(self, visible):
+        """One display tick: pause or resume decoding, follow the tile size
+        and show the newest frame. True if a frame was shown."""
+        self.capture.paused = not visible
+        if not visible:
+            return False
+        size = self.display_size()
+        if size != self.requested_size:
+            self.requested_size = size
+            self.capture.max_size = size
+            self.resize_timer.start()
+        captured = self.capture.take_latest()
+        if captured is None:
+            return False
+        self.surface.set_frame(captured.image)
+        self.capture.mark_displayed(captured)
+        return True
+
+    def negotiate_mode(self):
+        if self.requested_size is not None:
+            self.capture.set_mode(camera_modes.AUTO, self.requested_size)
+
+    def stats(self):
+        """Capture stats plus the GUI thread's paint cost."""
+        stats = self.capture.stats()
+        stats["name"] = self.capture.source.name
+        stats["tile_size"] = self.requested_size
+        stats["avg_paint_ms"] = round(self.surface.paint_stats()["avg_paint_ms"], 2)
+        return stats
+
+    def update_caption(self, stats):
+        if stats["paused"]:
+            self.caption.setText(f"{stats['name']} · paused")
+            return
+        self.caption.setText(f"{stats['name']} · {stats['mode']} · {stats['displayed_fps']:.0f}/"
+                             f"{stats['capture_fps']:.0f} fps · {stats['cpu_cores']:.2f} cores")
+
+    def mouseDoubleClickEvent(self, event):
+        self.focus_requested.emit(self)
+        super().mouseDoubleClickEvent(event)
+
+
+# ================== Camera Grid Screen ==================
+class CameraGridScreen(QMainWindow):
+    """Every camera in the room at once (frame_sources.default_sources()).
+
+    Each camera has its own capture thread; one display timer repaints all
+    tiles at up to DISPLAY_FPS, so the GUI thread does one round of paints
+    per tick however many cameras there are. Tiles that aren't visible (the
+    page hidden or minimized, or another tile focused) keep their camera
+    open but stop decoding.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tiles = [CameraTile(source) for source in default_sources()]
+        self.focused = None
+        self.last_stats = None
+        # (wall, process CPU) once per stats interval
+        self._cpu_samples = deque(maxlen=CPU_WINDOW)
+        self.display_timer = QTimer(self)
+        self.display_timer.setInterval(1000 // DISPLAY_FPS)
+        self.display_timer.timeout.connect(self.refresh_tiles)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(STATS_INTERVAL_MS)
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Camera Grid")
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
+
+        # Central Widget
+        central_widget = QWidget(self)
+        self.setCentralWidget(central_widget)
+
+        # Background label
+        bg_label = QLabel(central_widget)
+        bg_label.setPixmap(asset_cache.load_pixmap("Images/3f879af94e037b6ee67e2193cdbb436d 1.png", self.size(), Qt.IgnoreAspectRatio))
+        bg_label.setScaledContents(True)
+        bg_label.setGeometry(0, 0, self.width(), self.height())
+
+        # Header Widget (same as main dashboard)
+        header = QWidget(central_widget)
+        header.setStyleSheet("background-color: rgba(0, 0, 0, 0);")
+        header.setFixedHeight(100)
+        header.setGeometry(0, 0, self.width(), 100)
+
+        logo_label = QLabel(header)
+        logo_label.setPixmap(asset_cache.load_pixmap("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(120, 60), Qt.IgnoreAspectRatio))
+        logo_label.setScaledContents(True)
+        logo_label.setGeometry(20, 20, 120, 60)
+
+        camera_icon = QLabel(header)
+        camera_icon.setPixmap(asset_cache.load_pixmap("Images/icons/Group 8.png", QSize(300, 50), Qt.IgnoreAspectRatio))
+        camera_icon.setScaledContents(True)
+        camera_icon.setGeometry(160, 22, 300, 50)
+
+        # Add Back Button
+        self.back_button = QPushButton("Back", central_widget)
+        self.back_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: #555; color: white;")
+        self.back_button.setGeometry(20, self.height() - 60, 100, 40)
+        self.back_button.clicked.connect(self.go_back)
+
+        #Power Off Button
+        self.power_off_button = QPushButton("Power Off", central_widget)
+        self.power_off_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: red; color: white;")
+        self.power_off_button.setGeometry(self.width() - 120, self.height() - 60, 100, 40)
+        self.power_off_button.clicked.connect(lambda: self.window().close())
+
+        # Tiles, as square a grid as the camera count allows
+        grid_layout = QGridLayout()
+        columns = 1
+        while columns * columns < len(self.tiles):
+            columns += 1
+        for i, tile in enumerate(self.tiles):
+            tile.focus_requested.connect(self.toggle_focus)
+            grid_layout.addWidget(tile, i // columns, i % columns)
+
+        self.summary_label = QLabel(f"{len(self.tiles)} cameras")
+        self.summary_label.setStyleSheet(SUMMARY_STYLE)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(grid_layout, 1)
+        main_layout.addWidget(self.summary_label)
+
+        # Container for the layout
+        container = QWidget(central_widget)
+        container.setLayout(main_layout)
+        container.setGeometry(int(self.width() * 0.1), int(self.height() * 0.2), int(self.width() * 0.8), int(self.height() * 0.6))
+        container.setStyleSheet("background-color: rgba(255, 255, 255, 180); border-radius: 15px;")
+
+        if self.parent() is None:
+            self.show()
+
+    def go_back(self):
+        navigate_back(self)
+
+    def toggle_focus(self, tile):
+        """Show one tile alone (its camera gets the whole area), or all again."""
+        self.focused = None if self.focused is tile else tile
+        for other in self.tiles:
+            other.setVisible(self.focused is None or other is self.focused)
+
+    def refresh_tiles(self):
+        minimized = self.window().isMinimized()
+        for tile in self.tiles:
+            visible = not minimized and tile.isVisible() and not tile.visibleRegion().isEmpty()
+            tile.refresh(visible)
+
+    def grid_stats(self):
+        """Per-tile stats and totals over the last few seconds: what N
+        cameras cost on this machine."""
+        tiles = [tile.stats() for tile in self.tiles]
+        now, now_cpu = time.monotonic(), time.process_time()
+        since, cpu = self._cpu_samples[0] if self._cpu_samples else (now, now_cpu)
+        active = [stats for stats in tiles if not stats["paused"]]
+        return {
+            "tiles": tiles,
+            "total": {
+                "cameras": len(tiles),
+                "active": len(active),
+                "capture_fps": round(sum(stats["capture_fps"] for stats in active), 1),
+                "displayed_fps": round(sum(stats["displayed_fps"] for stats in tiles), 1),
+                "capture_cores": round(sum(stats["cpu_cores"] for stats in tiles), 3),
+                "process_cores": round((now_cpu - cpu) / (now - since), 3) if now > since else 0.0,
+            },
+        }
+
+    def update_stats(self):
+        self._cpu_samples.append((time.monotonic(), time.process_time()))
+        stats = self.grid_stats()
+        for tile, tile_stats in zip(self.tiles, stats["tiles"]):
+            tile.update_caption(tile_stats)
+        total = stats["total"]
+        self.summary_label.setText(f"{total['active']}/{total['cameras']} cameras · {total['displayed_fps']:.0f} fps shown · "
+                                   f"capture {total['capture_cores']:.2f} cores · app {total['process_cores']:.2f} cores")
+        self.last_stats = stats
+
+    def showEvent(self, event):
+        for tile in self.tiles:
+            tile.capture.start()
+        self._cpu_samples.clear()
+        self._cpu_samples.append((time.monotonic(), time.process_time()))
+        self.display_timer.start()
+        self.stats_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        if event.spontaneous():
+            # Minimized: the display timer keeps the tiles paused, and the
+            # cameras stay open for when the window comes back.
+            super().hideEvent(event)
+            return
+        # Left the page: release the devices so the single-camera page can
+        # open them.
+        self.display_timer.stop()
+        self.stats_timer.stop()
+        self.stop_captures()
+        super().hideEvent(event)
+
+    def stop_captures(self):
+        # Signal every thread first, so slow devices close in parallel.
+        for tile in self.tiles:
+            tile.capture.stop(0)
+        for tile in self.tiles:
+            tile.capture.stop(CAPTURE_STOP_TIMEOUT)
+
+    def closeEvent(self, event):
+        self.display_timer.stop()
+        self.stats_timer.stop()
+        self.stop_captures()
+        event.accept()
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = CameraGridScreen()
+    sys.exit(app.exec_())
@@ -0,0 +1,272 @@
+import os
+import re
+import json
+import threading
+import subprocess
+from collections import namedtuple
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton
+from PyQt5.QtCore import Qt, pyqtSignal
+
+import cv2
+
+import media_paths
+
+# One capture mode: pixel format (FOURCC string), frame size and frame rate.
+CameraMode = namedtuple("CameraMode", "fourcc width height fps")
+
+AUTO = "auto"
+
+SETTINGS_FILE = os.environ.get(
+    "DROID_CAMERA_SETTINGS",
+    os.path.join(os.path.expanduser("~"), ".config", "droid_gui", "camera_modes.json"),
+)
+
+# Tried one by one when the driver can't be asked for its list (no v4l2-ctl).
+PROBE_FOURCCS = ("MJPG", "YUYV")
+PROBE_SIZES = ((640, 480), (800, 600), (1280, 720), (1280, 960), (1600, 1200), (1920, 1080), (2592, 1944), (3840, 2160))
+
+# Auto mode wants at least this rate and otherwise the fewest pixels per
+# second. Compressed formats cost a JPEG decode per frame; raw formats only a
+# colour conversion (but more USB bandwidth, which shows up as a lower fps).
+AUTO_MIN_FPS = 25
+FORMAT_COST = {"MJPG": 2.5, "H264": 3.0}
+
+V4L2_FORMAT_RE = re.compile(r"\[\d+\]: '(\w+)'")
+V4L2_SIZE_RE = re.compile(r"Size: Discrete (\d+)x(\d+)")
+V4L2_FPS_RE = re.compile(r"Interval: Discrete [\d.]+s \(([\d.]+) fps\)")
+
+
+def mode_label(mode):
+    if mode is None:
+        return "Driver default"
+    if mode == AUTO:
+        return "Auto (fits display)"
+    fourcc = f"{mode.fourcc} " if mode.fourcc else ""
+    return f"{fourcc}{mode.width}x{mode.height} @ {mode.fps:g} fps"
+
+
+def fourcc_string(value):
+    value = int(value)
+    if value <= 0:
+        return ""
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+# ================== Reading / Applying Modes ==================
+# All of these talk to an open source and run on the capture thread.
+def current_mode(cap):
+    width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if width <= 0 or height <= 0:
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return CameraMode(fourcc_string(cap.get(cv2.CAP_PROP_FOURCC)), width, height, round(fps, 2) if fps > 0 else 0)
+
+
+def apply_mode(cap, mode):
+    """Ask for ``mode`` and return what the device actually delivers. The
+    pixel format goes first: drivers pick the sizes and rates on offer per
+    format."""
+    if mode.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    return current_mode(cap)
+
+
+def parse_v4l2_formats(text):
+    modes = []
+    fourcc = size = None
+    for line in text.splitlines():
+        match = V4L2_FORMAT_RE.search(line)
+        if match:
+            fourcc, size = match.group(1), None
+            continue
+        match = V4L2_SIZE_RE.search(line)
+        if match:
+            size = int(match.group(1)), int(match.group(2))
+            continue
+        match = V4L2_FPS_RE.search(line)
+        if match and fourcc and size:
+            modes.append(CameraMode(fourcc, size[0], size[1], round(float(match.group(1)), 2)))
+    return modes
+
+
+def v4l2_modes(index):
+    try:
+        result = subprocess.run(["v4l2-ctl", "--device", f"/dev/video{index}", "--list-formats-ext"],
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    return parse_v4l2_formats(result.stdout) if result.returncode == 0 else []
+
+
+def probe_modes(cap):
+    """Find modes by asking for each candidate and keeping what sticks.
+    Slow (a format change can restart the stream), so only a fallback."""
+    original = current_mode(cap)
+    modes = set()
+    for fourcc in PROBE_FOURCCS:
+        for width, height in PROBE_SIZES:
+            mode = apply_mode(cap, CameraMode(fourcc, width, height, 0))
+            if mode is not None and mode.fourcc == fourcc:
+                modes.add(mode)
+    if original is not None:
+        apply_mode(cap, original)
+    return sorted(modes)
+
+
+def list_modes(cap):
+    """Modes the open source supports, sorted by format, size and rate."""
+    if hasattr(cap, "modes"):
+        return sorted(cap.modes())
+    index = getattr(cap, "index", None)
+    if index is None:
+        mode = current_mode(cap)
+        return [mode] if mode is not None else []
+    return sorted(set(v4l2_modes(index))) or probe_modes(cap)
+
+
+def choose_auto(modes, width, height):
+    """Cheapest mode whose picture, fitted into a width x height display,
+    still has at least one camera pixel per display pixel."""
+    if not modes:
+        return None
+
+    def fills(mode):
+        scale = min(width / mode.width, height / mode.height)
+        return scale <= 1
+
+    def cost(mode):
+        return mode.width * mode.height * (mode.fps or AUTO_MIN_FPS) * FORMAT_COST.get(mode.fourcc, 1.0)
+
+    filling = [mode for mode in modes if fills(mode)]
+    if not filling:
+        # Nothing is big enough: the largest picture, then the best rate.
+        return max(modes, key=lambda mode: (mode.width * mode.height, mode.fps, -cost(mode)))
+    smooth = [mode for mode in filling if mode.fps >= AUTO_MIN_FPS]
+    if not smooth:
+        best_fps = max(mode.fps for mode in filling)
+        smooth = [mode for mode in filling if mode.fps == best_fps]
+    return min(smooth, key=cost)
+
+
+# ================== Saved Choice ==================
+class CameraSettings:
+    """The chosen mode per device, kept in a small JSON file. A device is
+    saved as ``AUTO``, a CameraMode, or not at all (driver default)."""
+
+    def __init__(self, path=SETTINGS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def mode_for(self, device):
+        saved = self._load().get(device)
+        if saved == AUTO:
+            return AUTO
+        if isinstance(saved, dict):
+            try:
+                return CameraMode(**saved)
+            except TypeError:
+                pass
+        return None
+
+    def save(self, device, mode):
+        with self._lock:
+            settings = self._load()
+            if mode is None:
+                settings.pop(device, None)
+            else:
+                settings[device] = mode if mode == AUTO else mode._asdict()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                media_paths.write_atomic(self.path, json.dumps(settings, indent=2).encode())
+            except OSError as e:
+                print(f"⚠ Could not save camera settings: {e}")
+
+
+# ================== Settings Dialog ==================
+class CameraSettingsDialog(QDialog):
+    """Lists the camera's modes (filled in by ``set_modes()`` once the
+    capture thread has read them) and emits the chosen one, AUTO, or None
+    for the driver default."""
+    mode_selected = pyqtSignal(object)
+
+    def __init__(self, selected=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Camera Settings")
+        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #fefefe;
+                border: 2px solid #ccc;
+                border-radius: 15px;
+            }
+            QListWidget, QPushButton {
+                font-size: 18px;
+            }
+            QPushButton {
+                padding: 10px;
+            }
+        """)
+        self.selected = selected
+
+        layout = QVBoxLayout()
+        title = QLabel("Camera mode")
+        title.setStyleSheet("font-size: 20px; font-weight: bold;")
+        layout.addWidget(title)
+        self.current_label = QLabel()
+        layout.addWidget(self.current_label)
+
+        self.mode_list = QListWidget()
+        self.mode_list.setMinimumSize(420, 320)
+        self.mode_list.itemDoubleClicked.connect(lambda item: self.accept())
+        layout.addWidget(self.mode_list)
+        self.set_modes(None)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        apply_button = QPushButton("Apply")
+        apply_button.clicked.connect(self.accept)
+        buttons.addWidget(cancel_button)
+        buttons.addWidget(apply_button)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def set_current(self, mode):
+        self.current_label.setText(f"Now: {mode_label(mode) if mode else 'unknown'}")
+
+    def set_modes(self, modes):
+        self.mode_list.clear()
+        self._add_item(AUTO)
+        self._add_item(None)
+        if modes is None:
+            loading = QListWidgetItem("Reading camera modes…")
+            loading.setFlags(Qt.NoItemFlags)
+            self.mode_list.addItem(loading)
+            return
+        for mode in modes:
+            self._add_item(mode)
+
+    def _add_item(self, mode):
+        item = QListWidgetItem(mode_label(mode))
+        item.setData(Qt.UserRole, mode)
+        self.mode_list.addItem(item)
+        if mode == self.selected:
+            self.mode_list.setCurrentItem(item)
+
+    def accept(self):
+        item = self.mode_list.currentItem()
+        if item is not None and item.flags() & Qt.ItemIsSelectable:
+            self.mode_selected.emit(item.data(Qt.UserRole))
+        super().accept()
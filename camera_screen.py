@@ -1,17 +1,113 @@
+import os
 import sys
-import cv2
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QWidget
-from PyQt5.QtGui import QPixmap, QImage, QIcon
-from PyQt5.QtCore import QTimer, QSize
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, QSize, QTimer, QVariantAnimation, QEasingCurve
+
+import asset_cache
+import camera_modes
+import media_index
+import media_paths
+import screen_registry
+from camera_capture import CaptureWorker
+from frame_sources import default_source
+from main_controller import navigate_back, navigate_to
+from video_surface import VideoSurface
+from video_recorder import VideoRecorder, DEFAULT_FPS
+from snapshot_writer import SnapshotWriter
+from camera_zoom import DigitalZoom
+from frame_bus import FrameBus
+from frame_analysis import AnalysisPool, plugins_from_env
+from pre_event_buffer import PreEventBuffer, PRE_EVENT_SECONDS
+
+CONTROL_BUTTON_STYLE = "font-size: 16px; padding: 10px; border-radius: 10px;"
+RECORDING_BUTTON_STYLE = CONTROL_BUTTON_STYLE + " background-color: red; color: white;"
+
+# Holding Capture for BURST_HOLD_MS takes a burst instead of one snapshot.
+BURST_HOLD_MS = 600
+BURST_COUNT = 5
+BURST_INTERVAL_MS = 200
+
+ZOOM_ANIMATION_MS = 150
+
+# A wedged USB read can't be interrupted; don't hang the GUI waiting on it.
+CAPTURE_STOP_TIMEOUT = 1.0
 
 class CameraScreen(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Frames are read on the worker's thread and only the newest one is
+        # shown. Capture runs while the page is visible.
+        self.capture = CaptureWorker(default_source(0), parent=self)
+        self.capture.frame_ready.connect(self.update_frame)
+        # Capture mode (format/size/fps) as chosen in Settings, per device.
+        self.camera_settings = camera_modes.CameraSettings()
+        self.saved_mode = self.camera_settings.mode_for(self.capture.source.key)
+        # The recorder is fed from the capture thread and encodes on its own.
+        self.recorder = VideoRecorder(parent=self)
+        self.recorder.recording_changed.connect(self.update_record_button)
+        self.recorder.segment_finished.connect(self.index_media)
+        self.capture.add_listener(self.recorder.push)
+        # Snapshots are encoded and written on the writer's own pool.
+        self.patient_id = None
+        self.snapshots = SnapshotWriter(parent=self)
+        self.snapshots.snapshot_saved.connect(self.on_snapshot_saved)
+        self.snapshots.snapshot_failed.connect(lambda error: self.flash_capture_button("Failed"))
+        self.capture.add_listener(self.snapshots.on_frame)
+        # Other consumers (in this process or others) read frames from
+        # shared memory instead of opening the camera themselves.
+        try:
+            self.frame_bus = FrameBus()
+            self.capture.add_listener(self.frame_bus.publish)
+        except OSError as e:
+            print(f"⚠ Frame bus unavailable: {e}")
+            self.frame_bus = None
+        # Optional MJPEG preview for the nursing station (DROID_PREVIEW_PORT).
+        # Imported only then: asyncio alone would blow the page's import budget.
+        self.preview_server = None
+        if os.environ.get("DROID_PREVIEW_PORT"):
+            from mjpeg_server import MjpegServer
+            self.preview_server = MjpegServer.from_env()
+        if self.preview_server is not None:
+            try:
+                self.preview_server.start()
+                self.capture.add_listener(self.preview_server.push)
+                print(f"Camera preview at {self.preview_server.url()}")
+            except OSError as e:
+                print(f"⚠ Camera preview server unavailable: {e}")
+                self.preview_server = None
+        # Analysis plugins (DROID_ANALYSIS) run in their own processes, fed
+        # from the frame bus; their annotations are drawn over the preview.
+        plugins = plugins_from_env() if self.frame_bus is not None else []
+        self.analysis = AnalysisPool(plugins, self.frame_bus.name, parent=self) if plugins else None
+        if self.analysis is not None:
+            self.analysis.start()
+        # The last PRE_EVENT_SECONDS of footage, kept as JPEG in memory so an
+        # event can be documented from before it happened.
+        self.pre_event = PreEventBuffer(parent=self) if PRE_EVENT_SECONDS > 0 else None
+        if self.pre_event is not None:
+            self.pre_event.event_saved.connect(self.index_media)
+            self.pre_event.start()
+            self.capture.add_listener(self.pre_event.push)
+        self.burst_timer = QTimer(self)
+        self.burst_timer.setSingleShot(True)
+        self.burst_timer.setInterval(BURST_HOLD_MS)
+        self.burst_timer.timeout.connect(self.take_burst)
+        # Zoom crops the raw frame before display; steps are animated.
+        self.zoom = DigitalZoom()
+        self.shown_zoom_level = self.zoom.level
+        self.zoom_animation = QVariantAnimation(self)
+        self.zoom_animation.setDuration(ZOOM_ANIMATION_MS)
+        self.zoom_animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.zoom_animation.valueChanged.connect(self.zoom.set_level)
         self.initUI()
         
     def initUI(self):
         self.setWindowTitle("Camera Interface")
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
         
         # Central Widget
         central_widget = QWidget(self)
@@ -19,7 +115,7 @@ class CameraScreen(QMainWindow):
         
         # Background label
         bg_label = QLabel(central_widget)
-        bg_label.setPixmap(QPixmap("./images/3f879af94e037b6ee67e2193cdbb436d 1.png"))
+        bg_label.setPixmap(asset_cache.load_pixmap("Images/3f879af94e037b6ee67e2193cdbb436d 1.png", self.size(), Qt.IgnoreAspectRatio))
         bg_label.setScaledContents(True)
         bg_label.setGeometry(0, 0, self.width(), self.height())
         
@@ -31,13 +127,13 @@ class CameraScreen(QMainWindow):
         
         # Add logo to the header
         logo_label = QLabel(header)
-        logo_label.setPixmap(QPixmap("./images/LOGO_edited_edited-removebg-preview.png"))
+        logo_label.setPixmap(asset_cache.load_pixmap("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(120, 60), Qt.IgnoreAspectRatio))
         logo_label.setScaledContents(True)
         logo_label.setGeometry(20, 20, 120, 60)
         
         # Add camera icon beside the logo
         camera_icon = QLabel(header)
-        camera_icon.setPixmap(QPixmap("icons/Group 8.png"))
+        camera_icon.setPixmap(asset_cache.load_pixmap("Images/icons/Group 8.png", QSize(300, 50), Qt.IgnoreAspectRatio))
         camera_icon.setScaledContents(True)
         camera_icon.setGeometry(160, 22, 300, 50)
 
@@ -45,20 +141,21 @@ class CameraScreen(QMainWindow):
         self.back_button = QPushButton("Back", central_widget)
         self.back_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: #555; color: white;")
         self.back_button.setGeometry(20, self.height() - 60, 100, 40)
-        self.back_button.clicked.connect(self.close)
+        self.back_button.clicked.connect(self.go_back)
 
         #Power Off Button
         self.power_off_button = QPushButton("Power Off", central_widget)
         self.power_off_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: red; color: white;")
         self.power_off_button.setGeometry(self.width() - 120, self.height() - 60, 100, 40)
-        self.power_off_button.clicked.connect(self.close)
+        self.power_off_button.clicked.connect(lambda: self.window().close())
         
         # Main layout
         main_layout = QHBoxLayout()
         
         # Left column (Camera Feed)
-        self.camera_label = QLabel()
-        self.camera_label.setStyleSheet("background-color: black;")
+        self.camera_label = VideoSurface()
+        self.camera_label.dragged.connect(self.pan_camera)
+        self.camera_label.frame_painted.connect(self.record_frame_time)
         main_layout.addWidget(self.camera_label, 2)  # Camera feed takes 2/3 of the space
         
         # Right column (Control Panel)
@@ -67,17 +164,31 @@ class CameraScreen(QMainWindow):
             ("Capture", "icons/capture.png"),
             ("Record", "icons/record.png"),
             ("Gallery", "icons/gallery.png"),
+            ("All Cameras", "icons/grid.png"),
             ("Settings", "icons/settings.png"),
+            ("Mark Event", "icons/event.png"),
             ("Zoom In", "icons/zoom-in.png"),
             ("Zoom Out", "icons/zoom-out.png")
         ]
         
+        self.control_buttons = {}
         for text, icon in buttons:
             btn = QPushButton(text)
             btn.setIcon(QIcon(icon))
             btn.setIconSize(QSize(24, 24))
-            btn.setStyleSheet("font-size: 16px; padding: 10px; border-radius: 10px;")
+            btn.setStyleSheet(CONTROL_BUTTON_STYLE)
             control_layout.addWidget(btn)
+            self.control_buttons[text] = btn
+        self.control_buttons["Record"].clicked.connect(self.toggle_recording)
+        self.control_buttons["Capture"].pressed.connect(self.burst_timer.start)
+        self.control_buttons["Capture"].released.connect(self.on_capture_released)
+        self.control_buttons["Gallery"].clicked.connect(self.open_gallery)
+        self.control_buttons["All Cameras"].clicked.connect(self.open_grid)
+        self.control_buttons["Settings"].clicked.connect(self.open_settings)
+        self.control_buttons["Mark Event"].clicked.connect(self.trigger_event)
+        self.control_buttons["Mark Event"].setEnabled(self.pre_event is not None)
+        self.control_buttons["Zoom In"].clicked.connect(lambda: self.zoom_by(1))
+        self.control_buttons["Zoom Out"].clicked.connect(lambda: self.zoom_by(-1))
         
         main_layout.addLayout(control_layout, 1)  # Control panel takes 1/3 of the space
         
@@ -87,25 +198,212 @@ class CameraScreen(QMainWindow):
         container.setGeometry(int(self.width() * 0.1), int(self.height() * 0.2), int(self.width() * 0.8), int(self.height() * 0.6))
         container.setStyleSheet("background-color: rgba(255, 255, 255, 180); border-radius: 15px;")
         
-        # Camera setup
-        self.cap = cv2.VideoCapture(0)
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
-        
-        self.show()
-    
+        if self.parent() is None:
+            self.show()
+
+    def go_back(self):
+        navigate_back(self)
+
     def update_frame(self):
-        ret, frame = self.cap.read()
-        if ret:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            self.camera_label.setPixmap(QPixmap.fromImage(qimg))
-    
+        captured = self.capture.take_latest()
+        if captured is None:
+            return
+        # Frames shown mid-animation aren't attributed to any zoom level.
+        animating = self.zoom_animation.state() == QVariantAnimation.Running
+        self.shown_zoom_level = None if animating else self.zoom.effective_level()
+        self.camera_label.set_frame(self.zoom.crop(captured.image))
+        if self.analysis is not None:
+            height, width = captured.image.shape[:2]
+            self.camera_label.set_overlay(self.analysis_overlay(width, height))
+        self.capture.mark_displayed(captured)
+
+    def analysis_overlay(self, width, height):
+        """The latest annotations, moved from the full frame into the
+        zoomed region that is on screen."""
+        x0, y0, x1, y1 = self.zoom.roi(width, height)
+        scale_x, scale_y = width / (x1 - x0), height / (y1 - y0)
+        offset_x, offset_y = x0 / width, y0 / height
+        overlay = []
+        for result in self.analysis.fresh_results():
+            for annotation in result.annotations:
+                x, y, w, h = annotation.rect
+                overlay.append(annotation._replace(rect=((x - offset_x) * scale_x, (y - offset_y) * scale_y,
+                                                         w * scale_x, h * scale_y)))
+        return overlay
+
+    def record_frame_time(self, ms):
+        if self.shown_zoom_level is not None:
+            self.zoom.record(self.shown_zoom_level, ms)
+
+    def zoom_by(self, direction):
+        # Step from the level last asked for: the device's when it zooms
+        # itself, the animation's target while one runs.
+        animating = self.zoom_animation.state() == QVariantAnimation.Running
+        current = self.zoom_animation.endValue() if animating else self.zoom.effective_level()
+        target = self.zoom.step(direction, current)
+        if self.capture.hardware_zoom is not None:
+            # The device zooms itself; no cropping (and so no pan) needed.
+            self.capture.set_hardware_zoom(target)
+            self.zoom.hardware_level = target
+            return
+        self.zoom_animation.stop()
+        self.zoom_animation.setStartValue(float(self.zoom.level))
+        self.zoom_animation.setEndValue(float(target))
+        self.zoom_animation.start()
+
+    def pan_camera(self, dx, dy):
+        target = self.camera_label.frame_rect()
+        self.zoom.pan_by(dx, dy, target.width(), target.height())
+
+    def on_capture_released(self):
+        # Released before the hold time: a single snapshot.
+        if self.burst_timer.isActive():
+            self.burst_timer.stop()
+            self.take_snapshot()
+
+    def take_snapshot(self):
+        if not self.snapshots.capture(self.patient_id):
+            self.flash_capture_button("No frame")
+
+    def take_burst(self):
+        if self.snapshots.burst(BURST_COUNT, BURST_INTERVAL_MS, self.patient_id):
+            self.control_buttons["Capture"].setText(f"Burst ×{BURST_COUNT}")
+
+    def on_snapshot_saved(self, path):
+        self.flash_capture_button("Saved")
+        self.index_media(path)
+
+    def index_media(self, path):
+        media_index.shared_indexer().add(path)
+
+    def open_gallery(self):
+        if not navigate_to(self, "gallery"):
+            self.gallery = screen_registry.load_screen_class("gallery")()
+
+    def open_grid(self):
+        if not navigate_to(self, "camera_grid"):
+            self.grid = screen_registry.load_screen_class("camera_grid")()
+
+    def display_size(self):
+        ratio = self.camera_label.devicePixelRatioF()
+        return round(self.camera_label.width() * ratio), round(self.camera_label.height() * ratio)
+
+    def open_settings(self):
+        dialog = camera_modes.CameraSettingsDialog(self.saved_mode, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.set_current(self.capture.mode)
+        self.capture.modes_listed.connect(dialog.set_modes)
+        self.capture.mode_changed.connect(dialog.set_current)
+        dialog.mode_selected.connect(self.select_mode)
+        self.capture.request_modes()
+        dialog.open()
+
+    def select_mode(self, mode):
+        self.saved_mode = mode
+        self.camera_settings.save(self.capture.source.key, mode)
+        self.capture.set_mode(mode, self.display_size())
+
+    def flash_capture_button(self, text):
+        button = self.control_buttons["Capture"]
+        button.setText(text)
+        QTimer.singleShot(1000, lambda: button.setText("Capture"))
+
+    def trigger_event(self):
+        """Document an incident (the Mark Event button, or an alarm): save the
+        buffered footage from before it and keep recording from here on."""
+        if self.pre_event is None:
+            return
+        # One id in the names of the clip and of the segments that follow.
+        event_id = media_paths.event_id()
+        saved = self.pre_event.trigger(self.patient_id, event_id)
+        if self.recorder.is_recording():
+            self.recorder.tag(event_id)
+        else:
+            self.start_recording(event_id)
+        button = self.control_buttons["Mark Event"]
+        button.setText("Event saved" if saved else "No footage")
+        QTimer.singleShot(1000, lambda: button.setText("Mark Event"))
+
+    def toggle_recording(self):
+        if self.recorder.is_recording():
+            # Returns at once; the writer drains its backlog in the background.
+            self.recorder.stop(0)
+        else:
+            self.start_recording()
+
+    def start_recording(self, event_id=None):
+        self.recorder.fps = self.recording_fps()
+        # Segments are named like snapshots: rec_<patient>_<time>[_<event>].mp4
+        self.recorder.patient_id = self.patient_id
+        self.recorder.event_id = event_id
+        self.recorder.start()
+
+    def recording_fps(self):
+        # The rate the camera was set to, not the measured one: that is 0
+        # right after a start and noisy anyway.
+        mode = self.capture.mode
+        return mode.fps if mode is not None and mode.fps > 0 else DEFAULT_FPS
+
+    def update_record_button(self, recording):
+        button = self.control_buttons["Record"]
+        button.setText("Stop" if recording else "Record")
+        button.setStyleSheet(RECORDING_BUTTON_STYLE if recording else CONTROL_BUTTON_STYLE)
+
+    def camera_stats(self):
+        stats = self.capture.stats()
+        stats.update(self.camera_label.paint_stats())
+        stats["recording"] = self.recorder.stats()
+        stats["snapshots"] = {"saved": self.snapshots.saved, "failed": self.snapshots.failed}
+        stats["bus"] = self.frame_bus.stats() if self.frame_bus is not None else None
+        stats["preview"] = self.preview_server.stats() if self.preview_server is not None else None
+        stats["analysis"] = self.analysis.stats() if self.analysis is not None else None
+        stats["pre_event"] = self.pre_event.stats() if self.pre_event is not None else None
+        stats["zoom"] = {
+            "level": round(self.zoom.effective_level(), 2),
+            "hardware": self.capture.hardware_zoom is not None,
+            "ms_per_frame": self.zoom.timing_stats(),
+        }
+        return stats
+
+    def showEvent(self, event):
+        if self.saved_mode is not None:
+            # Auto depends on the display size, which is only final now.
+            self.capture.set_mode(self.saved_mode, self.display_size())
+        self.capture.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.capture.stop(CAPTURE_STOP_TIMEOUT)
+        # No more frames: a burst still waiting for some would never end.
+        self.snapshots.cancel_burst()
+        # The writer finishes its segment on its own thread.
+        self.recorder.stop(0)
+        if self.pre_event is not None:
+            # Footage from before the page was left isn't "just before" an
+            # event any more.
+            self.pre_event.clear()
+        super().hideEvent(event)
+
     def closeEvent(self, event):
-        self.cap.release()
+        self.capture.stop(CAPTURE_STOP_TIMEOUT)
+        self.snapshots.cancel_burst()
+        # Let snapshots being written finish: the pool's destructor would
+        # wait for them without releasing the GIL they need.
+        self.snapshots.wait(int(CAPTURE_STOP_TIMEOUT * 1000))
+        self.recorder.stop(0)
+        if self.analysis is not None:
+            self.analysis.stop()
+            self.analysis = None
+        if self.pre_event is not None:
+            self.capture.remove_listener(self.pre_event.push)
+            self.pre_event.stop(CAPTURE_STOP_TIMEOUT)
+        if self.frame_bus is not None:
+            self.capture.remove_listener(self.frame_bus.publish)
+            self.frame_bus.close()
+            self.frame_bus = None
+        if self.preview_server is not None:
+            self.preview_server.stop(CAPTURE_STOP_TIMEOUT)
+            self.preview_server = None
         event.accept()
 
 if __name__ == "__main__":
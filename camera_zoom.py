@@ -0,0 +1,80 @@
+import statistics
+from collections import defaultdict, deque
+
+MIN_ZOOM = 1.0
+MAX_ZOOM = 8.0
+ZOOM_STEP = 1.5
+TIMING_WINDOW = 120
+
+
+# ================== Digital Zoom ==================
+class DigitalZoom:
+    """Region-of-interest zoom on raw capture frames.
+
+    ``crop(image)`` returns a numpy view of the visible region: no pixels
+    are copied, converted or scaled, so everything downstream (display,
+    encode) only touches the pixels that are shown. ``center`` is the ROI
+    centre in normalised frame coordinates and is clamped so the ROI stays
+    inside the frame.
+    """
+
+    def __init__(self):
+        self.level = MIN_ZOOM
+        self.center = (0.5, 0.5)
+        self.hardware_level = None  # set when the device zooms instead
+        self._timings = defaultdict(lambda: deque(maxlen=TIMING_WINDOW))
+
+    def set_level(self, level):
+        self.level = max(MIN_ZOOM, min(MAX_ZOOM, level))
+        self._clamp()
+
+    def effective_level(self):
+        return self.hardware_level or self.level
+
+    def step(self, direction, level=None):
+        """Next zoom level up (direction > 0) or down from ``level``
+        (default: the current one)."""
+        factor = ZOOM_STEP if direction > 0 else 1 / ZOOM_STEP
+        level = self.level if level is None else level
+        return max(MIN_ZOOM, min(MAX_ZOOM, level * factor))
+
+    def roi(self, width, height):
+        """(x0, y0, x1, y1) of the visible region in a width x height frame."""
+        roi_w = max(1, round(width / self.level))
+        roi_h = max(1, round(height / self.level))
+        x0 = round(self.center[0] * width - roi_w / 2)
+        y0 = round(self.center[1] * height - roi_h / 2)
+        x0 = max(0, min(width - roi_w, x0))
+        y0 = max(0, min(height - roi_h, y0))
+        return x0, y0, x0 + roi_w, y0 + roi_h
+
+    def crop(self, image):
+        if self.level <= MIN_ZOOM:
+            return image
+        h, w = image.shape[:2]
+        x0, y0, x1, y1 = self.roi(w, h)
+        return image[y0:y1, x0:x1]
+
+    def pan_by(self, dx, dy, display_width, display_height):
+        """Move the ROI by a drag of (dx, dy) display pixels, so the image
+        follows the finger."""
+        if display_width <= 0 or display_height <= 0:
+            return
+        cx, cy = self.center
+        self.center = (cx - dx / (display_width * self.level), cy - dy / (display_height * self.level))
+        self._clamp()
+
+    def _clamp(self):
+        half = 0.5 / self.level
+        cx = max(half, min(1 - half, self.center[0]))
+        cy = max(half, min(1 - half, self.center[1]))
+        self.center = (cx, cy)
+
+    # ----- per-level frame timing -----
+    def record(self, level, ms):
+        self._timings[round(level, 1)].append(ms)
+
+    def timing_stats(self):
+        """{"x2.2": median ms per frame, ...} for the levels seen recently."""
+        return {f"x{level:g}": round(statistics.median(times), 2)
+                for level, times in sorted(self._timings.items()) if times}
@@ -0,0 +1,264 @@
+import os
+import time
+import socket
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from netlink_monitor import NetlinkWatcher
+
+# With kernel link/route events driving re-checks, polling is only a
+# safety net for changes the kernel can't see (e.g. upstream outages).
+HEARTBEAT_INTERVAL = 120.0
+# After a failed round while online, re-check this soon rather than a whole
+# interval later, so an outage the kernel doesn't see is still reported in
+# seconds.
+RETRY_INTERVAL = 5.0
+# Link events come in bursts (carrier, addresses, routes); one check once a
+# burst has been quiet this long.
+EVENT_SETTLE = 1.0
+
+
+# ================== Probes ==================
+# A probe has a ``name`` and a blocking ``check()`` that returns True when
+# the network looks usable. Probes only ever run on the monitor's thread.
+
+class TcpProbe:
+    def __init__(self, host="8.8.8.8", port=53, timeout=2):
+        self.name = f"tcp:{host}:{port}"
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def check(self):
+        try:
+            socket.create_connection((self.host, self.port), timeout=self.timeout).close()
+            return True
+        except OSError:
+            return False
+
+
+class DnsProbe:
+    def __init__(self, hostname="connectivitycheck.gstatic.com"):
+        self.name = f"dns:{hostname}"
+        self.hostname = hostname
+
+    def check(self):
+        try:
+            return bool(socket.getaddrinfo(self.hostname, None))
+        except OSError:
+            return False
+
+
+class GatewayProbe:
+    """Passes when the kernel has a default route (Linux /proc/net/route)."""
+
+    def __init__(self, route_file="/proc/net/route"):
+        self.name = "gateway"
+        self.route_file = route_file
+
+    def check(self):
+        try:
+            with open(self.route_file) as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    # Destination 00000000 with the RTF_UP flag set.
+                    if len(fields) > 3 and fields[1] == "00000000" and int(fields[3], 16) & 0x1:
+                        return True
+        except (OSError, ValueError):
+            pass
+        return False
+
+
+class FakeProbe:
+    """Scripted probe for running without a network.
+
+    ``results`` is a bool, a callable returning a bool, or a sequence of bools
+    that is replayed (the last value repeats once it runs out).
+    """
+
+    def __init__(self, results=True):
+        self.name = "fake"
+        self.results = results
+        self.calls = 0
+
+    def check(self):
+        self.calls += 1
+        if callable(self.results):
+            return bool(self.results())
+        if isinstance(self.results, bool):
+            return self.results
+        index = min(self.calls, len(self.results)) - 1
+        return bool(self.results[index])
+
+
+def default_probes():
+    """Probes used by the dashboards.
+
+    Set ``DROID_FAKE_NETWORK=up`` / ``down`` / ``flap`` to run without a real
+    network (e.g. in tests or on a build box).
+    """
+    fake = os.environ.get("DROID_FAKE_NETWORK")
+    if fake == "up":
+        return [FakeProbe(True)]
+    if fake == "down":
+        return [FakeProbe(False)]
+    if fake == "flap":
+        state = {"up": False}
+
+        def flap():
+            state["up"] = not state["up"]
+            return state["up"]
+        return [FakeProbe(flap)]
+    # Cheapest first: no default route means no point waiting on a timeout.
+    return [GatewayProbe(), TcpProbe(), DnsProbe()]
+
+
+# ================== Connectivity Monitor ==================
+class ConnectivityMonitor(QObject):
+    """Runs connectivity probes on a background thread.
+
+    ``state_changed(bool)`` is emitted (queued to the GUI thread) only when
+    the online state flips. The gateway probe is a precondition: if it fails
+    the network is considered down without waiting on the others. Otherwise
+    the network is up when any remaining probe passes.
+
+    Hysteresis: ``down_after`` consecutive failed rounds are needed to report
+    offline and ``up_after`` passing rounds to report online again. While
+    offline the polling interval backs off exponentially up to
+    ``max_interval``. A failed round while online is re-checked after
+    ``retry_interval`` (at most ``interval``). ``trigger()`` forces an
+    immediate re-check, and ``trigger(immediate=True)`` also reports its
+    result without waiting for the hysteresis. ``link_changed()`` is for
+    kernel link/route events: a burst of them leads to one immediate check,
+    ``settle`` seconds after the last one.
+    """
+    state_changed = pyqtSignal(bool)
+
+    def __init__(self, probes=None, interval=10.0, max_interval=60.0, up_after=1, down_after=2,
+                 retry_interval=RETRY_INTERVAL, settle=EVENT_SETTLE, parent=None):
+        super().__init__(parent)
+        self.probes = default_probes() if probes is None else probes
+        self.interval = interval
+        self.max_interval = max_interval
+        self.up_after = up_after
+        self.down_after = down_after
+        self.retry_interval = retry_interval
+        self.settle = settle
+
+        self.online = None          # last reported state, None until known
+        self.current_interval = interval
+        self.checks = 0
+        self._streak = 0            # consecutive rounds disagreeing with self.online
+        self._immediate = False     # next round bypasses the hysteresis
+        self._settle_until = 0.0    # monotonic end of a link event burst
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def trigger(self, immediate=False):
+        """Re-check now instead of waiting for the next interval."""
+        if immediate:
+            self._immediate = True
+        self.current_interval = self.interval
+        self._wake.set()
+
+    def link_changed(self):
+        """A kernel link/address/route event (any thread)."""
+        self._settle_until = time.monotonic() + self.settle
+        self.trigger(immediate=True)
+
+    def check_once(self):
+        """Run one probe round and return its raw result."""
+        self.checks += 1
+        for probe in self.probes:
+            try:
+                ok = probe.check()
+            except Exception as e:
+                print(f"⚠ Probe {probe.name} failed: {e}")
+                ok = False
+            if isinstance(probe, GatewayProbe):
+                if not ok:
+                    return False
+                if len(self.probes) > 1:
+                    continue
+            if ok:
+                return True
+        return False
+
+    def update(self, ok, immediate=False):
+        """Feed one probe result through the hysteresis; returns True when
+        the reported state changed."""
+        if self.online is None or (immediate and ok != self.online):
+            self._set_online(ok)
+            return True
+        if ok == self.online:
+            self._streak = 0
+        else:
+            self._streak += 1
+            if self._streak >= (self.up_after if ok else self.down_after):
+                self._set_online(ok)
+                return True
+
+        if self.online and self._streak:
+            self.current_interval = min(self.retry_interval, self.interval)
+        elif self.online or self._streak:
+            self.current_interval = self.interval
+        else:
+            self.current_interval = min(self.current_interval * 2, self.max_interval)
+        return False
+
+    def _set_online(self, online):
+        self.online = online
+        self._streak = 0
+        self.current_interval = self.interval
+        self.state_changed.emit(online)
+
+    def _run(self):
+        while not self._stop.is_set():
+            settling = self._settle_until - time.monotonic()
+            if settling > 0:
+                # More events of the same burst push the check back.
+                self._wake.wait(settling)
+                self._wake.clear()
+                continue
+            immediate, self._immediate = self._immediate, False
+            self.update(self.check_once(), immediate)
+            self._wake.wait(self.current_interval)
+            self._wake.clear()
+
+
+_shared_monitor = None
+_netlink_watcher = None
+
+
+def shared_monitor():
+    """The process-wide monitor, started on first use.
+
+    On Linux, rtnetlink link/address/route events trigger re-checks and
+    periodic probing drops to a slow heartbeat; elsewhere it polls.
+    """
+    global _shared_monitor, _netlink_watcher
+    if _shared_monitor is None:
+        monitor = ConnectivityMonitor()
+        watcher = NetlinkWatcher(lambda names: monitor.link_changed())
+        if watcher.start():
+            monitor.interval = monitor.current_interval = HEARTBEAT_INTERVAL
+            monitor.max_interval = max(monitor.max_interval, HEARTBEAT_INTERVAL)
+            _netlink_watcher = watcher
+        monitor.start()
+        _shared_monitor = monitor
+    return _shared_monitor
@@ -0,0 +1,274 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from collections import namedtuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import cv2
+
+from camera_capture import fit_within
+from frame_bus import BUS_NAME, FrameBusReader
+
+# What a plugin found. ``rect`` is (x, y, w, h) in the plugin's input image;
+# the pool hands it on normalised to 0..1 of the camera frame. ``kind`` is
+# "box" (outlined, with ``label``) or "mask" (filled, e.g. a face to hide).
+Annotation = namedtuple("Annotation", "kind rect label color", defaults=("", None))
+
+# Annotations for one frame, tagged with CaptureWorker's frame seq and the
+# frame's capture time.
+AnalysisResult = namedtuple("AnalysisResult", "plugin frame_seq timestamp annotations elapsed_ms")
+
+ANALYSIS_PLUGINS = os.environ.get("DROID_ANALYSIS", "")
+STOP_TIMEOUT = 2.0
+BUS_RETRY_DELAY = 0.5
+
+
+# ================== Plugins ==================
+class AnalysisPlugin:
+    """Base for frame analysis. Each plugin runs in its own process and sees
+    the newest camera frame at most ``fps`` times a second, downscaled to
+    fit ``input_size`` (None: full size). ``setup()`` runs once in that
+    process; ``process(image)`` gets a BGR array it may keep or modify and
+    returns a list of Annotations."""
+    name = "plugin"
+    fps = 5
+    input_size = (640, 360)
+    color = "#00c853"
+
+    def setup(self):
+        pass
+
+    def process(self, image):
+        return []
+
+
+class MotionPlugin(AnalysisPlugin):
+    """Boxes around regions that changed since the previous analysed frame."""
+    name = "motion"
+    fps = 10
+    input_size = (320, 180)
+    color = "#ffab00"
+    MIN_AREA = 0.002  # of the frame
+    THRESHOLD = 25
+
+    def setup(self):
+        self.previous = None
+
+    def process(self, image):
+        gray = cv2.GaussianBlur(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        previous, self.previous = self.previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return []
+        _, changed = cv2.threshold(cv2.absdiff(previous, gray), self.THRESHOLD, 255, cv2.THRESH_BINARY)
+        changed = cv2.dilate(changed, None, iterations=2)
+        contours, _ = cv2.findContours(changed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self.MIN_AREA * gray.shape[0] * gray.shape[1]
+        return [Annotation("box", cv2.boundingRect(contour), "motion")
+                for contour in contours if cv2.contourArea(contour) >= min_area]
+
+
+class PrivacyPlugin(AnalysisPlugin):
+    """Masks faces on the preview."""
+    name = "privacy"
+    fps = 5
+    input_size = (640, 360)
+    color = "#263238"
+
+    def setup(self):
+        # Haar cascades left the main OpenCV package in 5.x.
+        if not hasattr(cv2, "CascadeClassifier"):
+            raise RuntimeError("this OpenCV build has no CascadeClassifier")
+        self.detector = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml"))
+
+    def process(self, image):
+        gray = cv2.equalizeHist(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        faces = self.detector.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5, minSize=(24, 24))
+        return [Annotation("mask", tuple(int(v) for v in face)) for face in faces]
+
+
+class WristbandPlugin(AnalysisPlugin):
+    """Reads barcodes, e.g. a patient wristband held up to the camera."""
+    name = "wristband"
+    fps = 2
+    input_size = (1280, 720)
+    color = "#2962ff"
+
+    def setup(self):
+        self.detector = cv2.barcode.BarcodeDetector()
+        # Renamed in OpenCV 4.8; both return (ok, texts, types, corners).
+        self.detect = getattr(self.detector, "detectAndDecodeWithType", self.detector.detectAndDecode)
+
+    def process(self, image):
+        ok, texts, _, corners = self.detect(image)
+        if not ok or corners is None:
+            return []
+        return [Annotation("box", cv2.boundingRect(points.astype("float32")), text)
+                for text, points in zip(texts, corners) if text]
+
+
+PLUGINS = {plugin.name: plugin for plugin in (MotionPlugin, PrivacyPlugin, WristbandPlugin)}
+
+
+def plugins_from_env():
+    """Plugins named in DROID_ANALYSIS (e.g. "motion,privacy")."""
+    plugins = []
+    for name in filter(None, (part.strip() for part in ANALYSIS_PLUGINS.split(","))):
+        if name in PLUGINS:
+            plugins.append(PLUGINS[name]())
+        else:
+            print(f"⚠ Unknown analysis plugin: {name}")
+    return plugins
+
+
+# ================== Worker Process ==================
+def _run_plugin(plugin, bus_name, results, stop):
+    reader = None
+    while reader is None and not stop.is_set():
+        try:
+            reader = FrameBusReader(bus_name)
+        except FileNotFoundError:
+            stop.wait(BUS_RETRY_DELAY)
+    if reader is None:
+        return
+    interval = 1 / plugin.fps
+    due = time.monotonic()
+    warned = False
+    try:
+        try:
+            plugin.setup()
+        except Exception as e:
+            print(f"⚠ Analysis plugin {plugin.name} unavailable: {e}")
+            return
+        while not stop.is_set():
+            delay = due - time.monotonic()
+            if delay > 0 and stop.wait(delay):
+                break
+            frame = reader.latest()
+            if frame is None:
+                stop.wait(0.005)
+                continue
+            due = max(due + interval, time.monotonic())
+
+            height, width = frame.image.shape[:2]
+            size = fit_within(width, height, plugin.input_size)
+            if size == (width, height):
+                image = frame.image.copy()
+            else:
+                image = cv2.resize(frame.image, size, interpolation=cv2.INTER_AREA)
+            if not reader.valid(frame):
+                continue  # overwritten while we read it
+
+            started = time.perf_counter()
+            try:
+                annotations = plugin.process(image)
+            except Exception as e:
+                if not warned:
+                    print(f"⚠ Analysis plugin {plugin.name} failed: {e}")
+                    warned = True
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            sx, sy = 1 / size[0], 1 / size[1]
+            normalised = [
+                annotation._replace(rect=(annotation.rect[0] * sx, annotation.rect[1] * sy,
+                                          annotation.rect[2] * sx, annotation.rect[3] * sy),
+                                    color=annotation.color or plugin.color)
+                for annotation in annotations
+            ]
+            results.put(AnalysisResult(plugin.name, frame.frame_seq, frame.timestamp, normalised, elapsed_ms))
+    finally:
+        reader.close()
+
+
+# ================== Analysis Pool ==================
+class AnalysisPool(QObject):
+    """Runs each plugin in its own process, fed from the frame bus, so no
+    analysis touches the GUI thread. Results arrive through
+    ``result_ready`` as they come; ``fresh_results()`` is the newest result
+    per plugin that is still recent enough to draw."""
+    result_ready = pyqtSignal(object)
+
+    def __init__(self, plugins, bus_name=BUS_NAME, parent=None):
+        super().__init__(parent)
+        self.plugins = {plugin.name: plugin for plugin in plugins}
+        self.bus_name = bus_name
+        self.latest = {}
+        self._counts = {name: 0 for name in self.plugins}
+        self._elapsed = {name: 0.0 for name in self.plugins}
+        self._latency = {name: 0.0 for name in self.plugins}
+        self._first = {}
+        self._processes = []
+        self._results = None
+        self._stop = None
+        self._collector = None
+
+    def start(self):
+        if self._processes:
+            return
+        # spawn: forking a process that runs Qt threads isn't safe.
+        context = multiprocessing.get_context("spawn")
+        self._results = context.Queue()
+        self._stop = context.Event()
+        for plugin in self.plugins.values():
+            process = context.Process(target=_run_plugin, args=(plugin, self.bus_name, self._results, self._stop),
+                                      name=f"analysis-{plugin.name}", daemon=True)
+            process.start()
+            self._processes.append(process)
+        self._collector = threading.Thread(target=self._collect, name="analysis-results", daemon=True)
+        self._collector.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        if not self._processes:
+            return
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._collector.join(timeout)
+
+    def fresh_results(self):
+        now = time.monotonic()
+        fresh = []
+        for name, result in list(self.latest.items()):
+            max_age = max(0.5, 2 / self.plugins[name].fps)
+            if now - result.timestamp <= max_age:
+                fresh.append(result)
+        return fresh
+
+    def stats(self):
+        now = time.monotonic()
+        stats = {}
+        for name in self.plugins:
+            count = self._counts[name]
+            result = self.latest.get(name)
+            elapsed = now - self._first[name] if name in self._first else 0
+            stats[name] = {
+                "results": count,
+                "fps": round((count - 1) / elapsed, 1) if elapsed else 0.0,
+                "avg_process_ms": round(self._elapsed[name] / count, 2) if count else None,
+                "avg_latency_ms": round(self._latency[name] / count, 1) if count else None,
+                "last_frame_seq": result.frame_seq if result else None,
+            }
+        return stats
+
+    def _collect(self):
+        while not self._stop.is_set():
+            try:
+                result = self._results.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            self.latest[result.plugin] = result
+            self._first.setdefault(result.plugin, time.monotonic())
+            self._counts[result.plugin] += 1
+            self._elapsed[result.plugin] += result.elapsed_ms
+            self._latency[result.plugin] += (time.monotonic() - result.timestamp) * 1000
+            try:
+                self.result_ready.emit(result)
+            except RuntimeError:
+                break  # owner deleted
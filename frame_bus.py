@@ -0,0 +1,417 @@
+import os
+import time
+import secrets
+import tempfile
+import contextlib
+from collections import namedtuple
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+
+import cv2
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ================== Frame Bus ==================
+# Camera frames in shared memory, written once by the capture owner and read
+# in place by any number of threads or processes (recorders, detectors,
+# remote previews) without a second VideoCapture on the device.
+#
+# Layout, all little uint64 words:
+#   bus header      HEADER_WORDS    magic, version, slots, slot bytes,
+#                                   newest sequence number, writer pid, ...
+#   slot headers    slots x 8       seqlock counter (odd while the slot is
+#                                   being written), bus seq, timestamp ns,
+#                                   height, width, channels, bytes, the
+#                                   capture's own frame seq
+#   reader table    MAX_READERS x 8 token, pid, last seq, reads, overruns,
+#                                   skipped
+#   slot data       slots x slot bytes, 64-byte aligned
+#
+# A reader gets a numpy view straight into a slot. The view stays valid until
+# the writer comes round to that slot again (``slots - 1`` frames later);
+# ``valid(frame)`` tells whether that happened, and such frames count as
+# overruns. Readers that keep frames longer ask for ``copy=True``.
+#
+# Frames bigger than a slot (e.g. a 4K mode) are scaled down into the slot
+# and counted as ``downscaled``; readers see the slot's size in the frame.
+#
+# The seqlock has no memory barriers (numpy stores are plain stores). On
+# x86-64 stores become visible in program order, so a reader that sees the
+# same even counter before and after reading a slot read a whole frame. On
+# weakly ordered CPUs (ARM) that isn't guaranteed: a rarely torn frame is
+# possible. Either way, check ``valid(frame)`` *after* copying or using a
+# frame, and drop it if that fails (as frame_analysis does).
+
+BUS_NAME = os.environ.get("DROID_FRAME_BUS", "droid_camera")
+SLOTS = 4
+SLOT_BYTES = 1920 * 1080 * 3
+MAX_READERS = 16
+
+MAGIC = 0x4452_4F49_4442_5553  # "DROIDBUS"
+VERSION = 1
+HEADER_WORDS = 8
+SLOT_WORDS = 8
+READER_WORDS = 8
+ALIGN = 64
+
+# bus header
+H_MAGIC, H_VERSION, H_SLOTS, H_SLOT_BYTES, H_SEQ, H_WRITER_PID, H_TOO_LARGE, H_DOWNSCALED = range(8)
+# slot header
+S_LOCK, S_SEQ, S_TIME, S_HEIGHT, S_WIDTH, S_CHANNELS, S_BYTES, S_FRAME_SEQ = range(8)
+# reader entry
+R_TOKEN, R_PID, R_LAST, R_READS, R_OVERRUNS, R_SKIPPED = range(6)
+
+# ``image`` is a view into shared memory unless the frame was copied out.
+# ``seq`` numbers frames on the bus, ``frame_seq`` is CaptureWorker's.
+BusFrame = namedtuple("BusFrame", "seq image timestamp slot lock frame_seq")
+
+
+def _layout(slots):
+    slot_headers = HEADER_WORDS * 8
+    readers = slot_headers + slots * SLOT_WORDS * 8
+    data = readers + MAX_READERS * READER_WORDS * 8
+    data = (data + ALIGN - 1) // ALIGN * ALIGN
+    return slot_headers, readers, data
+
+
+class _BusMemory:
+    """numpy views over one mapped bus."""
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.header = np.ndarray((HEADER_WORDS,), np.uint64, shm.buf)
+        slots, slot_bytes = int(self.header[H_SLOTS]), int(self.header[H_SLOT_BYTES])
+        slot_headers, readers, data = _layout(slots)
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.slot_headers = np.ndarray((slots, SLOT_WORDS), np.uint64, shm.buf, slot_headers)
+        self.readers = np.ndarray((MAX_READERS, READER_WORDS), np.uint64, shm.buf, readers)
+        self.data = np.ndarray((slots, slot_bytes), np.uint8, shm.buf, data)
+
+    def release(self):
+        # Views must go before the mapping can be closed.
+        self.header = self.slot_headers = self.readers = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # a caller still holds a frame view; unmapped when it goes
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _lock_path(name):
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"{name}.readers.lock")
+
+
+@contextlib.contextmanager
+def _registry_lock(name):
+    """Serialises reader-table changes across processes (flock on a file
+    next to the bus), so two readers can't claim the same entry."""
+    if fcntl is None:
+        yield
+        return
+    with open(_lock_path(name), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def bus_stats(memory):
+    newest = int(memory.header[H_SEQ])
+    readers = []
+    for entry in memory.readers:
+        if not entry[R_TOKEN]:
+            continue
+        readers.append({
+            "pid": int(entry[R_PID]),
+            "lag": newest - int(entry[R_LAST]) if entry[R_LAST] else None,
+            "reads": int(entry[R_READS]),
+            "overruns": int(entry[R_OVERRUNS]),
+            "skipped": int(entry[R_SKIPPED]),
+        })
+    return {
+        "written": newest,
+        "downscaled": int(memory.header[H_DOWNSCALED]),
+        "too_large": int(memory.header[H_TOO_LARGE]),
+        "readers": readers,
+    }
+
+
+# ================== Writer ==================
+class FrameBus:
+    """The writing end, owned by whoever owns the camera. ``publish()`` is a
+    CaptureWorker listener: one copy of the frame into the next slot, and
+    nothing at all while no reader is attached. Frames bigger than a slot
+    are scaled down to fit (counted as ``downscaled``); frames that can't
+    be stored at all (not 8-bit images) are skipped as ``too_large``."""
+
+    def __init__(self, name=BUS_NAME, slots=SLOTS, slot_bytes=SLOT_BYTES):
+        self.name = name
+        size = _layout(slots)[2] + slots * slot_bytes
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left over from a crashed run, unless its writer is still alive.
+            stale = shared_memory.SharedMemory(name=name)
+            writer = int(np.ndarray((HEADER_WORDS,), np.uint64, stale.buf)[H_WRITER_PID]) if stale.size >= HEADER_WORDS * 8 else 0
+            stale.close()
+            if writer and writer != os.getpid() and _pid_alive(writer):
+                raise FileExistsError(f"frame bus {name} is in use by process {writer}")
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_WORDS,), np.uint64, shm.buf)
+        header[:] = 0
+        header[H_VERSION] = VERSION
+        header[H_SLOTS] = slots
+        header[H_SLOT_BYTES] = slot_bytes
+        header[H_WRITER_PID] = os.getpid()
+        memory = _BusMemory(shm)
+        memory.slot_headers[:] = 0
+        memory.readers[:] = 0
+        header[H_MAGIC] = MAGIC  # last: readers wait for it
+        del header
+        self.memory = memory
+        self.seq = 0
+        self._warned = False
+        self._next_reap = 0.0
+
+    def has_readers(self):
+        return bool(self.memory.readers[:, R_TOKEN].any())
+
+    def publish(self, frame):
+        memory = self.memory
+        if memory is None:
+            return
+        if time.monotonic() >= self._next_reap:
+            self._next_reap = time.monotonic() + 1.0
+            self.reap_readers()
+        if not self.has_readers():
+            return
+        image = frame.image
+        if image.dtype != np.uint8 or image.ndim not in (2, 3):
+            memory.header[H_TOO_LARGE] += 1
+            return
+        shape = image.shape
+        if image.nbytes > memory.slot_bytes:
+            scale = (memory.slot_bytes / image.nbytes) ** 0.5
+            shape = (int(shape[0] * scale), int(shape[1] * scale)) + shape[2:]
+            memory.header[H_DOWNSCALED] += 1
+            if not self._warned:
+                print(f"⚠ Frame bus: {image.shape[1]}x{image.shape[0]} frames are scaled to "
+                      f"{shape[1]}x{shape[0]} to fit a slot")
+                self._warned = True
+        nbytes = int(np.prod(shape))
+
+        self.seq += 1
+        slot = self.seq % memory.slots
+        header = memory.slot_headers[slot]
+        height, width = shape[:2]
+        target = memory.data[slot, :nbytes].reshape(shape)
+        header[S_LOCK] += 1  # odd: being written
+        if shape == image.shape:
+            np.copyto(target, image)
+        else:
+            # Straight into the slot: no intermediate copy.
+            cv2.resize(image, (width, height), dst=target, interpolation=cv2.INTER_AREA)
+        header[S_SEQ] = self.seq
+        header[S_TIME] = int(frame.timestamp * 1e9)
+        header[S_HEIGHT] = height
+        header[S_WIDTH] = width
+        header[S_CHANNELS] = shape[2] if len(shape) == 3 else 1
+        header[S_BYTES] = nbytes
+        header[S_FRAME_SEQ] = frame.seq
+        header[S_LOCK] += 1  # even: complete
+        memory.header[H_SEQ] = self.seq
+
+    def reap_readers(self):
+        """Free the entries of reader processes that died without closing."""
+        with _registry_lock(self.name):
+            for entry in self.memory.readers:
+                if entry[R_TOKEN] and not _pid_alive(int(entry[R_PID])):
+                    entry[:] = 0
+
+    def stats(self):
+        return bus_stats(self.memory) if self.memory is not None else {}
+
+    def close(self):
+        if self.memory is None:
+            return
+        shm = self.memory.shm
+        self.memory.release()
+        self.memory = None
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(_lock_path(self.name))
+
+
+# ================== Reader ==================
+class FrameBusReader:
+    """One reader of a bus (per thread: a reader is not thread-safe).
+
+    ``latest()`` returns the newest frame, skipping any in between;
+    ``next()`` returns frames in order and counts the ones the writer
+    overwrote first as overruns. Both return None when nothing new is there.
+    Lag (frames behind the writer), reads, overruns and skips are kept in
+    the bus so the writer's ``stats()`` shows every reader.
+    """
+
+    def __init__(self, name=BUS_NAME):
+        shm = self._attach(name)
+        header = np.ndarray((HEADER_WORDS,), np.uint64, shm.buf)
+        if header[H_MAGIC] != MAGIC or header[H_VERSION] != VERSION:
+            del header
+            shm.close()
+            raise ValueError(f"{name} is not a frame bus")
+        if int(header[H_WRITER_PID]) != os.getpid() and multiprocessing.parent_process() is None:
+            # Only the writer may unlink the bus; stop this process's
+            # resource tracker from removing it when the reader exits.
+            # (Child processes share their parent's tracker: leave it be.)
+            self._untrack(shm)
+        del header
+        self.name = name
+        self.memory = _BusMemory(shm)
+        self.entry = self._register()
+        self.last_seq = 0
+
+    @staticmethod
+    def _attach(name):
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13
+            return shared_memory.SharedMemory(name=name)
+
+    @staticmethod
+    def _untrack(shm):
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+
+    def _register(self):
+        # Readers register once, at start-up; entries of dead processes are
+        # freed by the writer.
+        token = secrets.randbits(63) or 1
+        with _registry_lock(self.name):
+            for entry in self.memory.readers:
+                if entry[R_TOKEN] == 0:
+                    entry[R_PID] = os.getpid()
+                    entry[R_TOKEN] = token
+                    return entry
+        raise RuntimeError(f"frame bus has no free reader entries ({MAX_READERS})")
+
+    def _frame(self, seq, copy):
+        """The frame ``seq`` if it is still in its slot, else None."""
+        memory = self.memory
+        slot = seq % memory.slots
+        header = memory.slot_headers[slot]
+        lock = int(header[S_LOCK])
+        if lock % 2 or header[S_SEQ] != seq:
+            return None
+        shape = (int(header[S_HEIGHT]), int(header[S_WIDTH]), int(header[S_CHANNELS]))
+        image = memory.data[slot, :int(header[S_BYTES])].reshape(shape)
+        timestamp = int(header[S_TIME]) / 1e9
+        frame_seq = int(header[S_FRAME_SEQ])
+        if copy:
+            image = image.copy()
+        if header[S_LOCK] != lock:
+            return None
+        return BusFrame(seq, image, timestamp, slot, lock, frame_seq)
+
+    def _delivered(self, frame):
+        entry = self.entry
+        if self.last_seq and frame.seq > self.last_seq + 1:
+            entry[R_SKIPPED] += frame.seq - self.last_seq - 1
+        self.last_seq = frame.seq
+        entry[R_LAST] = frame.seq
+        entry[R_READS] += 1
+        return frame
+
+    def latest(self, copy=False):
+        while True:
+            newest = int(self.memory.header[H_SEQ])
+            if newest <= self.last_seq:
+                return None
+            frame = self._frame(newest, copy)
+            if frame is not None:
+                return self._delivered(frame)
+            if int(self.memory.header[H_SEQ]) == newest:
+                return None  # still being written
+
+    def next(self, copy=False):
+        newest = int(self.memory.header[H_SEQ])
+        if newest <= self.last_seq:
+            return None
+        seq = max(self.last_seq + 1, newest - self.memory.slots + 2)
+        lapped = seq - self.last_seq - 1 if self.last_seq else 0
+        while seq <= newest:
+            frame = self._frame(seq, copy)
+            if frame is not None:
+                if lapped:
+                    self.entry[R_OVERRUNS] += lapped
+                    self.last_seq = frame.seq - 1
+                return self._delivered(frame)
+            lapped += 1
+            seq += 1
+        return None
+
+    def valid(self, frame):
+        """True while ``frame``'s slot hasn't been reused. A frame that was
+        overwritten while in use counts as an overrun."""
+        ok = self.memory.slot_headers[frame.slot, S_LOCK] == frame.lock
+        if not ok:
+            self.entry[R_OVERRUNS] += 1
+        return ok
+
+    def stats(self):
+        return bus_stats(self.memory)
+
+    def close(self):
+        if self.memory is None:
+            return
+        self.entry[:] = 0
+        self.entry = None
+        self.memory.release()
+        self.memory = None
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Read the camera frame bus and print reader stats.")
+    parser.add_argument("--name", default=BUS_NAME)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--in-order", action="store_true", help="read every frame (next) instead of the newest (latest)")
+    args = parser.parse_args()
+
+    reader = FrameBusReader(args.name)
+    read = reader.next if args.in_order else reader.latest
+    end = time.monotonic() + args.seconds
+    next_report = time.monotonic() + 1.0
+    while time.monotonic() < end:
+        frame = read()
+        if frame is None:
+            time.sleep(0.002)
+        if time.monotonic() >= next_report:
+            next_report += 1.0
+            for entry in reader.stats()["readers"]:
+                print(f"pid {entry['pid']}: lag {entry['lag']}, {entry['reads']} reads, "
+                      f"{entry['overruns']} overruns, {entry['skipped']} skipped")
+            print()
+    reader.close()
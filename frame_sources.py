@@ -0,0 +1,331 @@
+import os
+import glob
+import time
+
+import cv2
+import numpy as np
+
+from camera_modes import CameraMode
+
+# ================== Frame Sources ==================
+# A frame source looks like a cv2.VideoCapture to CaptureWorker: ``open()``,
+# ``isOpened()``, a blocking ``read()`` returning (ok, BGR array), ``get()``/
+# ``set()`` for capture properties and ``release()``. Every read returns a
+# new array, because consumers (display ring, recorder, snapshots) hold on
+# to frames after the next read. ``grab()`` takes the next frame without
+# decoding it (a paused view). ``key`` names the device for saved settings.
+
+
+class _Pacer:
+    """Sleeps so reads come at ``fps``, like a device would deliver them.
+    Falling behind resets the schedule instead of bursting to catch up."""
+
+    def __init__(self, fps):
+        self.interval = 1 / fps if fps and fps > 0 else 0
+        self.due = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.due is None or now - self.due > self.interval:
+            self.due = now
+        elif self.due > now:
+            time.sleep(self.due - now)
+        self.due += self.interval
+
+
+class DeviceSource:
+    """A live camera, by index (``backend`` e.g. cv2.CAP_V4L2)."""
+
+    def __init__(self, index=0, backend=cv2.CAP_ANY):
+        self.name = f"device:{index}"
+        self.index = index
+        self.backend = backend
+        self.cap = None
+
+    @property
+    def key(self):
+        # The model name too, so a different camera on the same index
+        # doesn't inherit the old one's settings.
+        try:
+            with open(f"/sys/class/video4linux/video{self.index}/name") as f:
+                return f"{self.name}:{f.read().strip()}"
+        except OSError:
+            return self.name
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index, self.backend)
+        return self.cap.isOpened()
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def grab(self):
+        return self.cap.grab()
+
+    def get(self, prop):
+        return self.cap.get(prop) if self.cap is not None else -1
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value) if self.cap is not None else False
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class _SoftwareSource:
+    """Base for sources that aren't a device: no capture properties."""
+    fps = 0
+
+    @property
+    def key(self):
+        return self.name
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return -1
+
+    def set(self, prop, value):
+        return False
+
+
+class FileSource(_SoftwareSource):
+    """A video file, paced at its own frame rate (``realtime``) and looped."""
+
+    def __init__(self, path, realtime=True, loop=True):
+        self.name = f"file:{path}"
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = None
+        self.pacer = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = _Pacer(self.fps if self.realtime else 0)
+        return self.cap.isOpened()
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        self.pacer.wait()
+        ok, image = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, image = self.cap.read()
+        return ok, image
+
+    def grab(self):
+        self.pacer.wait()
+        if self.cap.grab():
+            return True
+        if not self.loop:
+            return False
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageSequenceSource(_SoftwareSource):
+    """Still images (a glob pattern or a list of paths) played at ``fps``."""
+
+    def __init__(self, paths, fps=30.0, loop=True):
+        self.name = f"images:{paths if isinstance(paths, str) else len(paths)}"
+        self.paths = sorted(glob.glob(paths)) if isinstance(paths, str) else list(paths)
+        self.fps = fps
+        self.loop = loop
+        self.position = 0
+        self.pacer = None
+
+    def open(self):
+        self.position = 0
+        self.pacer = _Pacer(self.fps)
+        return bool(self.paths)
+
+    def isOpened(self):
+        return self.pacer is not None and bool(self.paths)
+
+    def read(self):
+        if self.position >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.position = 0
+        self.pacer.wait()
+        image = cv2.imread(self.paths[self.position], cv2.IMREAD_COLOR)
+        self.position += 1
+        return image is not None, image
+
+    def grab(self):
+        if self.position >= len(self.paths) and not self.loop:
+            return False
+        self.pacer.wait()
+        self.position = self.position % len(self.paths) + 1
+        return True
+
+    def release(self):
+        self.pacer = None
+
+
+class SyntheticSource(_SoftwareSource):
+    """Generated frames at a given resolution and frame rate. A bright bar
+    sweeps across so motion, encoding and zoom behave like real footage;
+    ``fps=0`` delivers frames as fast as they can be copied. Size and rate
+    can be changed like a camera's (``modes()``, ``set()``). ``noise`` adds
+    sensor-like noise (std. dev. in grey levels), so frames compress about
+    as well as real footage does."""
+
+    PATTERNS = 8
+    FOURCC = "BGR3"
+    SIZES = ((640, 480), (1280, 720), (1920, 1080), (3840, 2160))
+
+    def __init__(self, width=1280, height=720, fps=30.0, noise=0):
+        self.name = f"synthetic:{width}x{height}@{fps:g}"
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.noise = noise
+        self.frames = None
+        self.count = 0
+        self.pacer = None
+
+    def open(self):
+        self.render()
+        self.count = 0
+        return True
+
+    def render(self):
+        # A few pre-rendered frames; each read copies one, like a decode
+        # into a fresh buffer would.
+        ramp = np.linspace(0, 255, self.width, dtype=np.uint8)
+        base = np.empty((self.height, self.width, 3), np.uint8)
+        base[:, :, 0] = ramp
+        base[:, :, 1] = np.linspace(0, 255, self.height, dtype=np.uint8)[:, None]
+        base[:, :, 2] = 128
+        bar = max(1, self.width // (self.PATTERNS * 2))
+        rng = np.random.default_rng(0)
+        self.frames = []
+        for i in range(self.PATTERNS):
+            frame = base.copy()
+            x = i * self.width // self.PATTERNS
+            frame[:, x:x + bar] = 255
+            if self.noise:
+                noisy = frame + rng.normal(0, self.noise, frame.shape)
+                frame = np.clip(noisy, 0, 255).astype(np.uint8)
+            self.frames.append(frame)
+        self.pacer = _Pacer(self.fps)
+
+    def isOpened(self):
+        return self.frames is not None
+
+    def modes(self):
+        sizes = set(self.SIZES) | {(self.width, self.height)}
+        return [CameraMode(self.FOURCC, w, h, self.fps) for w, h in sizes]
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(cv2.VideoWriter_fourcc(*self.FOURCC))
+        return super().get(prop)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = float(value)
+        else:
+            return False
+        # Re-rendered on the next read, once width and height both apply.
+        self.frames = None if self.frames is None else []
+        return True
+
+    def read(self):
+        if not self.frames:
+            self.render()
+        self.pacer.wait()
+        image = self.frames[self.count % self.PATTERNS].copy()
+        self.count += 1
+        return True, image
+
+    def grab(self):
+        if not self.frames:
+            self.render()
+        self.pacer.wait()
+        self.count += 1
+        return True
+
+    def release(self):
+        self.frames = None
+
+
+def parse_source(spec):
+    """Build a source from a spec string:
+
+    ``0`` (device index), ``file:clip.mp4``, ``images:shots/*.jpg[@fps]``,
+    ``synthetic:1920x1080[@30]``.
+    """
+    spec = str(spec).strip()
+    if spec.isdigit():
+        return DeviceSource(int(spec))
+    kind, _, arg = spec.partition(":")
+    if kind == "file":
+        return FileSource(arg)
+    if kind == "images":
+        pattern, _, fps = arg.rpartition("@") if "@" in arg else (arg, "", "")
+        return ImageSequenceSource(pattern, float(fps or 30))
+    if kind == "synthetic":
+        size, _, fps = arg.partition("@")
+        width, height = (int(v) for v in (size or "1280x720").lower().split("x"))
+        return SyntheticSource(width, height, float(fps or 30))
+    raise ValueError(f"unknown frame source: {spec}")
+
+
+def default_source(index=0):
+    """The camera at ``index``, unless ``DROID_CAMERA_SOURCE`` names another
+    source (e.g. ``synthetic:1920x1080@30`` on a machine without a webcam)."""
+    spec = os.environ.get("DROID_CAMERA_SOURCE")
+    return parse_source(spec) if spec else DeviceSource(index)
+
+
+def v4l2_devices():
+    """Indices of the V4L2 capture devices (a camera's first node; extra
+    nodes such as metadata have a higher ``index``)."""
+    indices = []
+    for path in glob.glob("/sys/class/video4linux/video*"):
+        try:
+            with open(os.path.join(path, "index")) as f:
+                if f.read().strip() != "0":
+                    continue
+        except OSError:
+            pass
+        number = os.path.basename(path)[len("video"):]
+        if number.isdigit():
+            indices.append(int(number))
+    return sorted(indices)
+
+
+def default_sources():
+    """Every camera for a multi-camera view: ``DROID_CAMERA_SOURCES``
+    (comma-separated specs, e.g. ``0,2,synthetic:1920x1080``), else each
+    V4L2 capture device, else ``default_source()``."""
+    specs = os.environ.get("DROID_CAMERA_SOURCES")
+    if specs:
+        return [parse_source(spec) for spec in specs.split(",") if spec.strip()]
+    return [DeviceSource(index) for index in v4l2_devices()] or [default_source()]
@@ -0,0 +1,257 @@
+import sys
+import time
+from collections import OrderedDict
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QWidget, QListView, QDialog
+)
+from PyQt5.QtGui import QPixmap, QColor
+from PyQt5.QtCore import Qt, QSize, QAbstractListModel, QModelIndex
+
+import asset_cache
+import media_index
+from image_loader import read_scaled_image
+from main_controller import navigate_back
+from thumbnail_loader import ThumbnailLoader, THUMB_SIZE
+
+# Index rows are fetched in pages and only a few pages are kept, so the
+# model's cost doesn't grow with the number of files.
+PAGE_ROWS = 256
+MAX_PAGES = 8
+MAX_THUMBNAILS = 512
+
+MediaRole = Qt.UserRole + 1
+
+
+# ================== Media Model ==================
+class MediaModel(QAbstractListModel):
+    """Paged list model over a MediaIndex, newest first.
+
+    ``rowCount`` is one COUNT query; rows are read a page at a time as the
+    view asks for them. Thumbnails are requested only when the view asks
+    for a cell's decoration, i.e. for cells that are actually painted.
+    """
+
+    def __init__(self, index, thumbnails, parent=None):
+        super().__init__(parent)
+        self.index_db = index
+        self.thumbnails = thumbnails
+        self.thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.placeholder = QPixmap(THUMB_SIZE)
+        self.placeholder.fill(QColor("#ddd"))
+
+        self._count = index.count()
+        self._first = self._first_path()
+        self._pages = OrderedDict()
+        self._pixmaps = OrderedDict()
+        self._rows_by_path = {}
+
+    def refresh(self):
+        """Catch up with the index. New files are usually the newest, i.e.
+        rows at the top: those are inserted, keeping the view's selection
+        and scroll position. Anything else resets the model."""
+        first = self._first
+        count = self.index_db.count()
+        added = count - self._count
+        self._pages.clear()
+        self._first = self._first_path()
+        if added == 0 and first is not None and self._first == first:
+            self.dataChanged.emit(self.index(0), self.index(count - 1))
+            return
+        moved = self.item(added) if added > 0 and first is not None else None
+        if moved is not None and moved.path == first:
+            self.beginInsertRows(QModelIndex(), 0, added - 1)
+            self._count = count
+            self._rows_by_path = {path: row + added for path, row in self._rows_by_path.items()}
+            self.endInsertRows()
+            return
+        self.beginResetModel()
+        self._count = count
+        self._pages.clear()
+        self._rows_by_path.clear()
+        self.endResetModel()
+
+    def _first_path(self):
+        rows = self.index_db.page(0, 1)
+        return rows[0].path if rows else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def item(self, row):
+        page_no = row // PAGE_ROWS
+        page = self._pages.get(page_no)
+        if page is None:
+            page = self.index_db.page(page_no * PAGE_ROWS, PAGE_ROWS)
+            self._pages[page_no] = page
+            while len(self._pages) > MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        offset = row - page_no * PAGE_ROWS
+        return page[offset] if offset < len(page) else None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._count:
+            return None
+        item = self.item(index.row())
+        if item is None:
+            return None
+        if role == Qt.DisplayRole:
+            label = time.strftime("%d %b %H:%M:%S", time.localtime(item.timestamp))
+            return f"{item.patient} · {label}" if item.patient else label
+        if role == Qt.DecorationRole:
+            pixmap = self._pixmaps.get(item.path)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(item.path)
+                return pixmap
+            self._rows_by_path[item.path] = index.row()
+            self.thumbnails.request(item.path)
+            return self.placeholder
+        if role == Qt.ToolTipRole:
+            details = f"{item.width}x{item.height}"
+            if item.duration:
+                details += f", {item.duration:.0f} s"
+            return f"{item.path}\n{details}"
+        if role == MediaRole:
+            return item
+        return None
+
+    def on_thumbnail_ready(self, path, image):
+        # A failed decode keeps the placeholder rather than retrying forever.
+        self._pixmaps[path] = QPixmap.fromImage(image) if not image.isNull() else self.placeholder
+        while len(self._pixmaps) > MAX_THUMBNAILS:
+            self._pixmaps.popitem(last=False)
+        row = self._rows_by_path.pop(path, None)
+        if row is not None and row < self._count:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+# ================== Gallery Screen ==================
+class GalleryScreen(QMainWindow):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Rescanned on every show to pick up files added in the meantime.
+        self.indexer = media_index.shared_indexer()
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Gallery")
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
+
+        central_widget = QWidget(self)
+        self.setCentralWidget(central_widget)
+
+        bg_label = QLabel(central_widget)
+        bg_label.setPixmap(asset_cache.load_pixmap("Images/3f879af94e037b6ee67e2193cdbb436d 1.png", self.size(), Qt.IgnoreAspectRatio))
+        bg_label.setScaledContents(True)
+        bg_label.setGeometry(0, 0, self.width(), self.height())
+
+        logo_label = QLabel(central_widget)
+        logo_label.setPixmap(asset_cache.load_pixmap("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(120, 60), Qt.IgnoreAspectRatio))
+        logo_label.setScaledContents(True)
+        logo_label.setGeometry(20, 20, 120, 60)
+
+        self.back_button = QPushButton("Back", central_widget)
+        self.back_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: #555; color: white;")
+        self.back_button.setGeometry(20, self.height() - 60, 100, 40)
+        self.back_button.clicked.connect(self.go_back)
+
+        self.power_off_button = QPushButton("Power Off", central_widget)
+        self.power_off_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: red; color: white;")
+        self.power_off_button.setGeometry(self.width() - 120, self.height() - 60, 100, 40)
+        self.power_off_button.clicked.connect(lambda: self.window().close())
+
+        # Grid of captures and recordings
+        self.index_db = media_index.MediaIndex()
+        self.thumbnails = ThumbnailLoader(parent=self)
+        self.model = MediaModel(self.index_db, self.thumbnails, self)
+
+        layout = QVBoxLayout()
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-size: 20px; font-weight: bold; background: transparent;")
+        layout.addWidget(self.title_label)
+
+        self.grid = QListView()
+        self.grid.setViewMode(QListView.IconMode)
+        self.grid.setResizeMode(QListView.Adjust)
+        self.grid.setMovement(QListView.Static)
+        self.grid.setUniformItemSizes(True)
+        self.grid.setIconSize(THUMB_SIZE)
+        self.grid.setGridSize(QSize(THUMB_SIZE.width() + 20, THUMB_SIZE.height() + 40))
+        # Lay out in batches so a huge index doesn't delay the first paint.
+        self.grid.setLayoutMode(QListView.Batched)
+        self.grid.setBatchSize(500)
+        self.grid.setModel(self.model)
+        self.grid.doubleClicked.connect(self.show_preview)
+        layout.addWidget(self.grid)
+
+        container = QWidget(central_widget)
+        container.setLayout(layout)
+        container.setGeometry(int(self.width() * 0.1), int(self.height() * 0.15), int(self.width() * 0.8), int(self.height() * 0.7))
+        container.setStyleSheet("background-color: rgba(255, 255, 255, 180); border-radius: 15px;")
+
+        self.update_title()
+        self.indexer.index_changed.connect(self.on_index_changed)
+
+        if self.parent() is None:
+            self.show()
+
+    def update_title(self):
+        self.title_label.setText(f"Gallery ({self.model.rowCount()} items)")
+
+    def on_index_changed(self):
+        self.model.refresh()
+        self.update_title()
+
+    def showEvent(self, event):
+        self.indexer.rescan()
+        super().showEvent(event)
+
+    def show_preview(self, index):
+        item = self.model.data(index, MediaRole)
+        if item is None:
+            return
+        dialog = QDialog(self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.setWindowTitle(index.data())
+        layout = QVBoxLayout(dialog)
+        preview = QLabel()
+        preview.setAlignment(Qt.AlignCenter)
+        if item.kind == "image":
+            image = read_scaled_image(item.path, QSize(int(self.width() * 0.7), int(self.height() * 0.7)))
+            preview.setPixmap(QPixmap.fromImage(image))
+        else:
+            preview.setPixmap(index.data(Qt.DecorationRole))
+        layout.addWidget(preview)
+        details = f"{item.width}x{item.height}"
+        if item.duration:
+            details += f" · {item.duration:.0f} s video"
+        layout.addWidget(QLabel(details))
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.close)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+        dialog.open()
+
+    def go_back(self):
+        navigate_back(self)
+
+    def closeEvent(self, event):
+        self.thumbnails.clear_pending()
+        try:
+            self.indexer.index_changed.disconnect(self.on_index_changed)
+        except TypeError:
+            pass
+        event.accept()
+
+
+if __name__ == "__main__":
+    from main_controller import run
+    sys.exit(run("gallery"))
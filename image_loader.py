@@ -0,0 +1,109 @@
+from PyQt5.QtGui import QImage, QImageReader
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+
+# How many decoded images the loader keeps around for instant display.
+MAX_READY_IMAGES = 4
+
+
+# ========== Utility: Decode Straight to Display Size ==========
+def read_scaled_image(path, target_size, aspect_mode=Qt.KeepAspectRatio):
+    """Decode ``path`` directly at (about) ``target_size``.
+
+    QImageReader.setScaledSize lets the JPEG decoder downscale while decoding,
+    so a 4K slide shown in a 700x460 label never exists at full resolution.
+    Returns a null QImage if the file can't be read.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid() and target_size.isValid():
+        scaled = QSize(source_size)
+        scaled.scale(target_size, aspect_mode)
+        if scaled.width() < source_size.width() or scaled.height() < source_size.height():
+            reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        print(f"⚠ Failed to load image: {path} ({reader.errorString()})")
+    return image
+
+
+# ================== Worker ==================
+class _LoadSignals(QObject):
+    loaded = pyqtSignal(object, QImage)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, key, signals, load_function):
+        super().__init__()
+        self.key = key
+        self.signals = signals
+        self.load_function = load_function
+
+    def run(self):
+        path, width, height = self.key
+        image = self.load_function(path, QSize(width, height))
+        try:
+            self.signals.loaded.emit(self.key, image)
+        except RuntimeError:
+            # The loader was destroyed while this image was decoding.
+            pass
+
+
+# ================== Image Loader ==================
+class ImageLoader(QObject):
+    """Loads display-sized images on a QThreadPool.
+
+    ``request()`` asks for the image to show next; ``image_ready`` fires on the
+    GUI thread once it is decoded (immediately if it was prefetched).
+    ``prefetch()`` decodes an image in the background so a later request is
+    instant. ``load_function(path, size)`` does the decoding on the worker
+    (e.g. ``asset_cache.load_image``); it defaults to :func:`read_scaled_image`.
+    """
+    image_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, parent=None, pool=None, load_function=read_scaled_image):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.load_function = load_function
+        self.ready = {}     # key -> QImage, oldest first
+        self.pending = {}   # key -> running task
+        self.wanted = None  # key the caller is waiting to display
+        self.signals = _LoadSignals(self)
+        self.signals.loaded.connect(self._on_loaded)
+
+    @staticmethod
+    def _key(path, size):
+        return (path, size.width(), size.height())
+
+    def request(self, path, size):
+        key = self._key(path, size)
+        if key in self.ready:
+            self.wanted = None
+            self.image_ready.emit(path, self.ready[key])
+            return
+        self.wanted = key
+        self._start(key)
+
+    def prefetch(self, path, size):
+        key = self._key(path, size)
+        if key not in self.ready:
+            self._start(key)
+
+    def _start(self, key):
+        if key in self.pending:
+            return
+        task = _LoadTask(key, self.signals, self.load_function)
+        self.pending[key] = task
+        self.pool.start(task)
+
+    def _on_loaded(self, key, image):
+        self.pending.pop(key, None)
+        if image.isNull():
+            return
+        self.ready.pop(key, None)
+        self.ready[key] = image
+        while len(self.ready) > MAX_READY_IMAGES:
+            self.ready.pop(next(iter(self.ready)))
+        if key == self.wanted:
+            self.wanted = None
+            self.image_ready.emit(key[0], image)
@@ -5,24 +5,30 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem, QHeaderView, QAbstractItemView
 )
 from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSize
+
+import asset_cache
+from main_controller import navigate_back
 
 
 class RobotDashboard(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle("Medical Robot Dashboard")
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
 
         selected_image = "Images/background.jpg" # Add you Background img as per your requirements 
         self.central_widget = QWidget(self)
         self.setCentralWidget(self.central_widget)
 
         self.bg_label = QLabel(self.central_widget)
-        self.bg_label.setPixmap(QPixmap(selected_image))
+        self.bg_label.setPixmap(asset_cache.load_pixmap(selected_image, self.size(), Qt.IgnoreAspectRatio))
         self.bg_label.setScaledContents(True)
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
 
@@ -38,22 +44,25 @@ class RobotDashboard(QMainWindow):
         header.setGeometry(0, 0, self.width(), 100)
 
         logo_label = QLabel(header)
-        logo_label.setPixmap(QPixmap("Images/logos/Logo.png")) # Add Logo, you guys are comfortable with.
+        logo_label.setPixmap(asset_cache.load_pixmap("Images/logos/Logo.png", QSize(120, 60), Qt.IgnoreAspectRatio)) # Add Logo, you guys are comfortable with.
         logo_label.setScaledContents(True)
         logo_label.setGeometry(20, 20, 120, 60)
 
         self.back_button = QPushButton("Back", self.central_widget)
         self.back_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: #555; color: white;")
         self.back_button.setGeometry(20, self.height() - 60, 100, 40)
-        self.back_button.clicked.connect(self.close)
+        self.back_button.clicked.connect(self.go_back)
 
         self.power_off_button = QPushButton("Power Off", self.central_widget)
         self.power_off_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: red; color: white;")
         self.power_off_button.setGeometry(self.width() - 120, self.height() - 60, 100, 40)
-        self.power_off_button.clicked.connect(self.close)
+        self.power_off_button.clicked.connect(lambda: self.window().close())
 
         self.create_inventory_table()
 
+    def go_back(self):
+        navigate_back(self)
+
     def create_inventory_table(self):
         self.clear_layout(self.canvas_layout)
 
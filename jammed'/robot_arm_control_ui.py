@@ -7,13 +7,16 @@ from PyQt5.QtCore import QUrl
 
 
 class RobotArmControl(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle("Robot Arm Control")
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
 
         selected_image = "./images/3f879af94e037b6ee67e2193cdbb436d 1.png"
 
@@ -38,7 +41,7 @@ class RobotArmControl(QMainWindow):
         self.power_off_button = QPushButton("Power Off", central_widget)
         self.power_off_button.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 10px; background-color: red; color: white;")
         self.power_off_button.setGeometry(self.width() - 120, self.height() - 60, 100, 40)
-        self.power_off_button.clicked.connect(self.close)
+        self.power_off_button.clicked.connect(lambda: self.window().close())
 
         main_layout = QGridLayout()
         content_widget = QWidget(central_widget)
@@ -73,7 +76,8 @@ class RobotArmControl(QMainWindow):
 
         main_layout.addWidget(self.web_view, 0, 0)
         main_layout.addWidget(control_panel, 0, 1)
-        self.show()
+        if self.parent() is None:
+            self.show()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
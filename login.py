@@ -5,27 +5,20 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton,
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit
 )
-from PyQt5.QtGui import QPixmap, QPainter
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, QEvent
 
-from virtual_keyboard import VirtualKeyboard  # 🧩 Importing Virtual Keyboard
-
-# ===== BACKGROUND WIDGET =====
-class BackgroundWidget(QWidget):
-    def __init__(self, background_path):
-        super().__init__()
-        self.background_pixmap = QPixmap(background_path)
+from background_widget import BackgroundWidget
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        scaled_pixmap = self.background_pixmap.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-        painter.drawPixmap(self.rect(), scaled_pixmap)
+from virtual_keyboard import VirtualKeyboard  # 🧩 Importing Virtual Keyboard
 
-# ===== MAIN WINDOW =====
 class FullscreenWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.showFullScreen()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
 
         self.background_widget = BackgroundWidget("Images/background.jpg")
         self.setCentralWidget(self.background_widget)
@@ -0,0 +1,107 @@
+import sys
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
+from PyQt5.QtCore import Qt, QTimer, QCoreApplication
+
+import screen_registry
+
+
+# Start importing heavy screen dependencies once the first page is up.
+PREWARM_DELAY_MS = 3000
+
+
+# ================== Navigation ==================
+# Screens also run standalone (``python camera_screen.py``); these route
+# through the shell when there is one.
+def navigate_to(widget, name):
+    """Show page ``name`` in the shell ``widget`` lives in. False when it
+    isn't running inside MainController."""
+    router = widget.window()
+    if router is widget or not hasattr(router, "show_page"):
+        return False
+    router.show_page(name)
+    return True
+
+
+def navigate_back(widget):
+    """Back to the previous page, or close ``widget`` when standalone."""
+    router = widget.window()
+    if router is not widget and hasattr(router, "go_back"):
+        router.go_back()
+    else:
+        widget.close()
+
+
+# ================== Main Controller ==================
+class MainController(QMainWindow):
+    """Single application shell: every screen is a page in one QStackedWidget.
+
+    Pages are built on first visit and then kept alive, so switching screens
+    is a widget swap instead of a new interpreter.
+    """
+
+    def __init__(self, start_page="nurse_dashboard", prewarm=True):
+        super().__init__()
+        self.setWindowTitle("Droid GUI")
+
+        self.stacked_widget = QStackedWidget()
+        self.setCentralWidget(self.stacked_widget)
+
+        self.pages = {}
+        self.history = []
+
+        # Pages size themselves from the stack, so go fullscreen first.
+        self.showFullScreen()
+        self.show_page(start_page)
+
+        if prewarm:
+            QTimer.singleShot(PREWARM_DELAY_MS, screen_registry.prewarm)
+
+    def page(self, name):
+        """Return the page called ``name``, building it on first use."""
+        if name not in self.pages:
+            page_class = screen_registry.load_screen_class(name)
+            page = page_class(self.stacked_widget)
+            # QMainWindow always sets Qt.Window; make it a plain child page.
+            page.setWindowFlags(Qt.Widget)
+            self.stacked_widget.addWidget(page)
+            self.pages[name] = page
+        return self.pages[name]
+
+    def show_page(self, name):
+        page = self.page(name)
+        current = self.current_page_name()
+        if current is not None and current != name:
+            self.history.append(current)
+        self.stacked_widget.setCurrentWidget(page)
+
+    def go_back(self):
+        if self.history:
+            name = self.history.pop()
+            self.stacked_widget.setCurrentWidget(self.page(name))
+
+    def current_page_name(self):
+        current = self.stacked_widget.currentWidget()
+        for name, page in self.pages.items():
+            if page is current:
+                return name
+        return None
+
+    def closeEvent(self, event):
+        # Give pages a chance to release devices (e.g. the camera).
+        for page in self.pages.values():
+            page.close()
+        event.accept()
+
+
+def run(start_page="nurse_dashboard"):
+    # Lets QtWebEngine be imported lazily, after the QApplication exists.
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = MainController(start_page)
+    window.show()
+    return app.exec_()
+
+
+# ================== Run App ==================
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1] if len(sys.argv) > 1 else "nurse_dashboard"))
@@ -0,0 +1,227 @@
+import os
+import re
+import time
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from PyQt5.QtGui import QImageReader
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import media_paths
+
+# One indexed capture or recording. ``timestamp`` is seconds since the
+# epoch; ``duration`` is None for images.
+MediaItem = namedtuple("MediaItem", "path kind timestamp patient width height duration")
+
+INDEX_FILE = "media_index.sqlite"
+MEDIA_KINDS = ("snapshots", "recordings")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv")
+
+# Names written by media_paths.media_name(), with the suffixes callers add:
+# burst frames (_b01), an event id (_ev<17 digits>, media_paths.event_id())
+# and pre-event clips (_pre).
+MEDIA_NAME_RE = re.compile(
+    r"^(?P<prefix>[a-z]+)_(?:(?P<patient>.+?)_)?(?P<stamp>\d{8}_\d{6})_(?P<ms>\d{3})"
+    r"(?:_b\d+)?(?:_(?P<event>ev\d{17}))?(?:_pre)?\.\w+$"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    patient TEXT,
+    width INTEGER,
+    height INTEGER,
+    duration REAL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_by_time ON media (timestamp DESC);
+"""
+
+
+def is_media_file(name):
+    lower = name.lower()
+    if lower.endswith(".tmp") or ".part." in lower:
+        return False  # still being written
+    return lower.endswith(IMAGE_EXTENSIONS + VIDEO_EXTENSIONS)
+
+
+def parse_media_name(name, fallback_time):
+    """(timestamp, patient) from a media_name()-style file name."""
+    match = MEDIA_NAME_RE.match(name)
+    if not match:
+        return fallback_time, None
+    try:
+        stamp = time.mktime(time.strptime(match.group("stamp"), "%Y%m%d_%H%M%S"))
+    except ValueError:
+        return fallback_time, match.group("patient")
+    return stamp + int(match.group("ms")) / 1000, match.group("patient")
+
+
+def probe_media(path):
+    """(kind, width, height, duration) read from the file's headers."""
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        size = QImageReader(path).size()
+        return "image", size.width(), size.height(), None
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        duration = frames / fps if fps > 0 else None
+    finally:
+        cap.release()
+    return "video", width, height, duration
+
+
+# ================== Index ==================
+class MediaIndex:
+    """SQLite index of the media directory. Each thread should use its own
+    MediaIndex (sqlite connections aren't shared); WAL mode lets the gallery
+    read while the indexer writes."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(media_paths.MEDIA_DIR, INDEX_FILE)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def page(self, offset, limit):
+        """Newest first."""
+        rows = self.db.execute(
+            "SELECT path, kind, timestamp, patient, width, height, duration FROM media "
+            "ORDER BY timestamp DESC, path LIMIT ? OFFSET ?", (limit, offset),
+        ).fetchall()
+        return [MediaItem(*row) for row in rows]
+
+    def known_files(self):
+        return {path: (mtime_ns, size) for path, mtime_ns, size in
+                self.db.execute("SELECT path, mtime_ns, size FROM media")}
+
+    def add(self, path, st=None):
+        st = st or os.stat(path)
+        kind, width, height, duration = probe_media(path)
+        timestamp, patient = parse_media_name(os.path.basename(path), st.st_mtime)
+        self.db.execute(
+            "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, kind, timestamp, patient, width, height, duration, st.st_mtime_ns, st.st_size),
+        )
+
+    def remove(self, paths):
+        self.db.executemany("DELETE FROM media WHERE path = ?", [(p,) for p in paths])
+
+    def scan(self, directories=None):
+        """Bring the index in line with the directories on disk. Only new or
+        changed files are probed. Returns the number of rows changed."""
+        if directories is None:
+            directories = [os.path.join(media_paths.MEDIA_DIR, kind) for kind in MEDIA_KINDS]
+        known = self.known_files()
+        seen = set()
+        changed = 0
+        for directory in directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_file() or not is_media_file(entry.name):
+                    continue
+                path = entry.path
+                seen.add(path)
+                st = entry.stat()
+                if known.get(path) == (st.st_mtime_ns, st.st_size):
+                    continue
+                try:
+                    self.add(path, st)
+                    changed += 1
+                except OSError as e:
+                    print(f"⚠ Could not index {path}: {e}")
+        missing = [path for path in known if path not in seen]
+        self.remove(missing)
+        self.db.commit()
+        return changed + len(missing)
+
+
+# ================== Background Indexer ==================
+class MediaIndexer(QObject):
+    """Keeps the index current on a background thread.
+
+    ``rescan()`` queues a directory scan and ``add(path)`` a single new file
+    (e.g. from the snapshot writer or recorder). ``index_changed`` is
+    emitted on the GUI thread whenever rows were added or removed.
+    """
+    index_changed = pyqtSignal()
+
+    def __init__(self, db_path=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self._jobs = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="media-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._jobs.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def rescan(self):
+        self._jobs.put(("scan", None))
+
+    def add(self, path):
+        self._jobs.put(("add", path))
+
+    def _run(self):
+        index = MediaIndex(self.db_path)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                action, path = job
+                try:
+                    if action == "scan":
+                        changed = index.scan()
+                    else:
+                        index.add(path)
+                        index.db.commit()
+                        changed = 1
+                except (OSError, sqlite3.Error) as e:
+                    print(f"⚠ Media index update failed: {e}")
+                    continue
+                if changed:
+                    try:
+                        self.index_changed.emit()
+                    except RuntimeError:
+                        break
+        finally:
+            index.close()
+
+
+_shared_indexer = None
+
+
+def shared_indexer():
+    """The process-wide indexer, started on first use."""
+    global _shared_indexer
+    if _shared_indexer is None:
+        _shared_indexer = MediaIndexer()
+        _shared_indexer.start()
+    return _shared_indexer
@@ -0,0 +1,53 @@
+import os
+import re
+import time
+import threading
+
+# Captures and recordings live here; override with DROID_MEDIA_DIR.
+MEDIA_DIR = os.environ.get("DROID_MEDIA_DIR", os.path.expanduser("~/DroidMedia"))
+
+SAFE_ID_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def media_dir(kind):
+    """``MEDIA_DIR/<kind>`` (e.g. "recordings", "snapshots"), created on demand."""
+    path = os.path.join(MEDIA_DIR, kind)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _stamp(when=None):
+    when = time.time() if when is None else when
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(when)) + f"_{int(when * 1000) % 1000:03d}"
+
+
+def event_id(when=None):
+    """``evYYYYmmddHHMMSSmmm``: shared by every file of one event (the
+    pre-event clip and the recording segments after it)."""
+    return "ev" + _stamp(when).replace("_", "")
+
+
+def media_name(prefix, extension, patient_id=None, when=None, suffix=""):
+    """``<prefix>_[<patient>_]YYYYmmdd_HHMMSS_mmm<suffix>.<extension>``."""
+    stamp = _stamp(when)
+    parts = [prefix]
+    if patient_id:
+        parts.append(SAFE_ID_RE.sub("-", str(patient_id)).strip("-"))
+    parts.append(stamp)
+    return "_".join(parts) + suffix + "." + extension
+
+
+def write_atomic(path, data):
+    """Write ``data`` next to ``path`` and rename it into place, so readers
+    (e.g. the gallery) never see a half-written file."""
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
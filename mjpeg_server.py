@@ -0,0 +1,331 @@
+import os
+import html
+import hmac
+import json
+import time
+import base64
+import asyncio
+import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+import cv2
+
+# Off unless a port is given; binds to localhost unless told otherwise.
+PREVIEW_PORT = os.environ.get("DROID_PREVIEW_PORT")
+PREVIEW_HOST = os.environ.get("DROID_PREVIEW_HOST", "127.0.0.1")
+# Required for anything but localhost: this is live patient video.
+PREVIEW_TOKEN = os.environ.get("DROID_PREVIEW_TOKEN") or None
+REALM = "Droid camera"
+
+DEFAULT_QUALITY = 75
+DEFAULT_FPS = 15
+MIN_QUALITY, MAX_QUALITY = 10, 95
+MAX_FPS = 30
+ENCODE_THREADS = 2
+# Per-client socket buffer: a slow client holds about one frame, then waits
+# and gets whatever is newest once it catches up.
+WRITE_BUFFER = 64 * 1024
+START_TIMEOUT = 5.0
+
+BOUNDARY = b"frame"
+INDEX_PAGE = """<!doctype html>
+<title>Droid camera</title>
+<body style="margin:0;background:#000">
+<img src="/stream{query}" style="width:100%;height:100vh;object-fit:contain">
+</body>
+"""
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a hostname or "" (all interfaces)
+
+
+def _clamp(value, low, high, default):
+    try:
+        return max(low, min(high, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+class _Latest:
+    """The newest value of something plus its sequence number; coroutines
+    wait for anything newer than what they have. Lives on the server loop."""
+
+    def __init__(self):
+        self.value = None
+        self.seq = 0
+        self._waiters = []
+
+    def publish(self, value):
+        self.value = value
+        self.seq += 1
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def newer_than(self, seq):
+        while self.seq <= seq:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        return self.value, self.seq
+
+
+# ================== Streams ==================
+class _Stream:
+    """One quality/fps combination. Its encoder turns camera frames into
+    JPEG at most ``fps`` times a second, once per frame however many
+    clients watch; it runs only while someone does."""
+
+    def __init__(self, server, quality, fps):
+        self.server = server
+        self.quality = quality
+        self.fps = fps
+        self.jpeg = _Latest()
+        self.clients = {}
+        self.encoded = 0
+        self.encode_ms = 0.0
+        self.task = None
+
+    async def encode_frames(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.fps
+        seq = 0
+        while self.clients:
+            frame, seq = await self.server.frames.newer_than(seq)
+            started = time.monotonic()
+            ok, data = await loop.run_in_executor(self.server.encoder, cv2.imencode, ".jpg", frame.image,
+                                                  [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            elapsed = time.monotonic() - started
+            if ok:
+                self.encoded += 1
+                self.encode_ms += elapsed * 1000
+                self.jpeg.publish(data.tobytes())
+            await asyncio.sleep(max(0.0, interval - elapsed))
+
+    def stats(self):
+        return {
+            "quality": self.quality,
+            "fps": self.fps,
+            "encoded": self.encoded,
+            "avg_encode_ms": round(self.encode_ms / self.encoded, 2) if self.encoded else None,
+            "clients": list(self.clients.values()),
+        }
+
+
+# ================== Preview Server ==================
+class MjpegServer:
+    """Serves the camera as ``multipart/x-mixed-replace`` MJPEG from an
+    asyncio loop on its own thread.
+
+    ``push()`` is a CaptureWorker listener: it only hands the newest frame
+    to the loop. ``GET /stream?quality=60&fps=10`` opens a stream (quality
+    and fps are capped per stream); ``/snapshot.jpg`` is one frame,
+    ``/stats`` the counters and ``/`` a page that shows the stream.
+
+    With a ``token`` every request must carry it: ``Authorization: Bearer
+    <token>``, basic auth with the token as password (browsers prompt for
+    it), or ``?token=<token>``. Without one the server only binds to
+    loopback; ``start()`` raises PermissionError otherwise.
+    """
+
+    def __init__(self, host=PREVIEW_HOST, port=0, token=None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.streams = {}
+        self.encoder = ThreadPoolExecutor(ENCODE_THREADS, thread_name_prefix="mjpeg-encode")
+        self.frames = None
+        self.bytes_sent = 0
+        self._loop = None
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+
+    @classmethod
+    def from_env(cls):
+        """A server for DROID_PREVIEW_PORT, or None when it isn't set."""
+        if not PREVIEW_PORT:
+            return None
+        return cls(PREVIEW_HOST, int(PREVIEW_PORT), PREVIEW_TOKEN)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not self.token and not is_loopback(self.host):
+            raise PermissionError(f"refusing to serve the camera on {self.host} without DROID_PREVIEW_TOKEN")
+        self._started.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="mjpeg-server", daemon=True)
+        self._thread.start()
+        self._started.wait(START_TIMEOUT)
+        if self._error is not None:
+            raise self._error
+
+    def stop(self, timeout=None):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._shutdown.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def push(self, frame):
+        loop = self._loop
+        if loop is None or not self.streams:
+            return
+        try:
+            loop.call_soon_threadsafe(self.frames.publish, frame)
+        except RuntimeError:
+            pass  # loop closed
+
+    def stats(self):
+        streams = list(self.streams.values())
+        return {
+            "port": self.port,
+            "clients": sum(len(stream.clients) for stream in streams),
+            "bytes_sent": self.bytes_sent,
+            "streams": [stream.stats() for stream in streams],
+        }
+
+    # ----- server loop -----
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self._error = e
+            self._started.set()
+
+    async def _serve(self):
+        self.frames = _Latest()
+        self._shutdown = asyncio.Event()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self._started.set()
+        try:
+            await self._shutdown.wait()
+        finally:
+            self._loop = None
+            server.close()
+            for stream in list(self.streams.values()):
+                if stream.task is not None:
+                    stream.task.cancel()
+            await server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = request.decode("latin-1").split("\r\n")
+            method, target = request_line.split(" ")[:2]
+            url = urlsplit(target)
+            headers = {}
+            for header in header_lines:
+                name, _, value = header.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if not self._authorized(headers, parse_qs(url.query)):
+                await self._respond(writer, "401 Unauthorized", "text/plain", b"token required\n",
+                                    f'WWW-Authenticate: Basic realm="{REALM}"\r\n')
+            elif method != "GET":
+                await self._respond(writer, "405 Method Not Allowed", "text/plain", b"GET only\n")
+            elif url.path == "/":
+                # Pass a ?token= on to the stream the page shows.
+                token = parse_qs(url.query).get("token")
+                query = "?" + urlencode({"token": token[0]}) if token else ""
+                await self._respond(writer, "200 OK", "text/html", INDEX_PAGE.format(query=html.escape(query)).encode())
+            elif url.path == "/stream":
+                await self._stream(writer, parse_qs(url.query))
+            elif url.path == "/snapshot.jpg":
+                await self._snapshot(writer, parse_qs(url.query))
+            elif url.path == "/stats":
+                await self._respond(writer, "200 OK", "application/json", json.dumps(self.stats()).encode())
+            else:
+                await self._respond(writer, "404 Not Found", "text/plain", b"not found\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server shutting down; end the connection quietly
+        finally:
+            writer.close()
+
+    def _authorized(self, headers, query):
+        if not self.token:
+            return True
+        offered = query.get("token", [""])[0]
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            offered = credentials.strip()
+        elif scheme.lower() == "basic":
+            try:
+                offered = base64.b64decode(credentials).decode("utf-8").partition(":")[2]
+            except ValueError:
+                return False
+        return hmac.compare_digest(offered.encode(), self.token.encode())
+
+    async def _respond(self, writer, status, content_type, body, extra_headers=""):
+        writer.write(f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nCache-Control: no-cache\r\n{extra_headers}\r\n".encode() + body)
+        await writer.drain()
+
+    def _open_stream(self, query, writer):
+        quality = _clamp(query.get("quality", [None])[0], MIN_QUALITY, MAX_QUALITY, DEFAULT_QUALITY)
+        fps = _clamp(query.get("fps", [None])[0], 1, MAX_FPS, DEFAULT_FPS)
+        stream = self.streams.get((quality, fps))
+        if stream is None:
+            stream = self.streams[(quality, fps)] = _Stream(self, quality, fps)
+        client = {"peer": str(writer.get_extra_info("peername")), "sent": 0, "skipped": 0}
+        stream.clients[writer] = client
+        if stream.task is None:
+            stream.task = asyncio.create_task(stream.encode_frames())
+        return stream, client
+
+    def _close_stream(self, stream, writer):
+        stream.clients.pop(writer, None)
+        if not stream.clients:
+            if stream.task is not None:
+                stream.task.cancel()
+            self.streams.pop((stream.quality, stream.fps), None)
+
+    async def _stream(self, writer, query):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER)
+        stream, client = self._open_stream(query, writer)
+        try:
+            writer.write(b"HTTP/1.0 200 OK\r\nCache-Control: no-cache\r\nConnection: close\r\n"
+                         b"Content-Type: multipart/x-mixed-replace; boundary=" + BOUNDARY + b"\r\n\r\n")
+            seq = 0
+            while True:
+                # Whatever is newest once the previous frame has gone out.
+                jpeg, newest = await stream.jpeg.newer_than(seq)
+                if seq:
+                    client["skipped"] += newest - seq - 1
+                seq = newest
+                writer.write(b"--" + BOUNDARY + b"\r\nContent-Type: image/jpeg\r\n"
+                             b"Content-Length: " + str(len(jpeg)).encode() + b"\r\n\r\n")
+                writer.write(jpeg)
+                writer.write(b"\r\n")
+                await writer.drain()
+                client["sent"] += 1
+                self.bytes_sent += len(jpeg)
+        finally:
+            self._close_stream(stream, writer)
+
+    async def _snapshot(self, writer, query):
+        stream, client = self._open_stream(query, writer)
+        try:
+            jpeg, _ = await asyncio.wait_for(stream.jpeg.newer_than(0), START_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self._respond(writer, "503 Service Unavailable", "text/plain", b"no camera frames\n")
+            return
+        finally:
+            self._close_stream(stream, writer)
+        await self._respond(writer, "200 OK", "image/jpeg", jpeg)
@@ -0,0 +1,109 @@
+import socket
+import struct
+import select
+import threading
+
+# ================== rtnetlink Constants ==================
+NETLINK_ROUTE = 0
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+GROUPS = RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE
+
+MESSAGE_TYPES = {
+    16: "RTM_NEWLINK",
+    17: "RTM_DELLINK",
+    20: "RTM_NEWADDR",
+    21: "RTM_DELADDR",
+    24: "RTM_NEWROUTE",
+    25: "RTM_DELROUTE",
+}
+
+NLMSG_HEADER = struct.Struct("=LHHLL")  # len, type, flags, seq, pid
+NLMSG_DONE = 3
+
+
+# ========== Utility: Parse Netlink Datagram ==========
+def parse_messages(data):
+    """Return the rtnetlink message names (e.g. ``"RTM_NEWLINK"``) packed in
+    one netlink datagram. Messages we don't watch are skipped; parsing stops
+    at NLMSG_DONE or a truncated message."""
+    names = []
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size or offset + length > len(data) or msg_type == NLMSG_DONE:
+            break  # malformed or truncated: nothing after it can be trusted
+        if msg_type in MESSAGE_TYPES:
+            names.append(MESSAGE_TYPES[msg_type])
+        offset += (length + 3) & ~3  # NLMSG_ALIGN
+    return names
+
+
+def netlink_supported():
+    return hasattr(socket, "AF_NETLINK")
+
+
+# ================== Netlink Watcher ==================
+class NetlinkWatcher:
+    """Calls ``callback(names)`` from a background thread whenever the kernel
+    reports link, address or route changes.
+
+    ``start()`` returns False when rtnetlink isn't available (non-Linux, or
+    the socket can't be bound) so callers can fall back to polling.
+    """
+
+    def __init__(self, callback, groups=GROUPS):
+        self.callback = callback
+        self.groups = groups
+        self.events = 0
+        self._sock = None
+        self._thread = None
+        self._stop_r, self._stop_w = None, None
+
+    def start(self):
+        if self._thread is not None:
+            return True
+        if not netlink_supported():
+            return False
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+            sock.bind((0, self.groups))
+        except OSError as e:
+            print(f"⚠ Netlink unavailable, falling back to polling: {e}")
+            return False
+        self._sock = sock
+        self._stop_r, self._stop_w = socket.socketpair()
+        self._thread = threading.Thread(target=self._run, name="netlink-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=None):
+        if self._thread is None:
+            return
+        self._stop_w.send(b"x")
+        self._thread.join(timeout)
+        for s in (self._sock, self._stop_r, self._stop_w):
+            s.close()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            readable, _, _ = select.select([self._sock, self._stop_r], [], [])
+            if self._stop_r in readable:
+                return
+            try:
+                data = self._sock.recv(65536)
+            except OSError as e:
+                print(f"⚠ Netlink read failed: {e}")
+                return
+            names = parse_messages(data)
+            if names:
+                self.events += len(names)
+                try:
+                    self.callback(names)
+                except Exception as e:
+                    print(f"⚠ Netlink callback failed: {e}")
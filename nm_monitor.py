@@ -0,0 +1,272 @@
+import re
+import copy
+import time
+import shutil
+import threading
+import subprocess
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from wifi_scanner import split_terse
+
+MONITOR_COMMAND = ["nmcli", "monitor"]
+DEVICE_LIST_COMMAND = ["nmcli", "-t", "-f", "DEVICE,TYPE,STATE,CONNECTION", "device"]
+MAX_RESTART_DELAY = 30.0
+
+NM_STATE_RE = re.compile(r"^NetworkManager is now in the '(?P<state>.+)' state$", re.IGNORECASE)
+CONNECTIVITY_RE = re.compile(r"^Connectivity is now '(?P<connectivity>.+)'$")
+PRIMARY_RE = re.compile(r"^'(?P<connection>.+)' is now the primary connection$")
+NO_PRIMARY_RE = re.compile(r"^There's no primary connection$")
+DEVICE_RE = re.compile(r"^(?P<device>[^\s:']+): (?P<event>.+)$")
+USING_RE = re.compile(r"^using connection '(?P<connection>.+)'$")
+# From ``nmcli connection up`` / ``device wifi connect`` when their output is
+# part of the transcript.
+ACTIVATION_FAILED_RE = re.compile(r"^Error: Connection activation failed: (?P<reason>.+)$")
+DEVICE_STATES = ("connected", "connecting", "disconnected", "disconnecting", "deactivating",
+                 "unavailable", "unmanaged", "connection failed")
+
+
+# ================== Network State ==================
+class NetworkState:
+    """Live NetworkManager state, as far as ``nmcli monitor`` has told us.
+
+    ``devices`` maps a device name to a dict with ``type``, ``state`` and
+    ``connection`` (the connection profile name, which for Wi-Fi is normally
+    the SSID). ``last_failure`` is the latest failed activation: a dict
+    with ``device``, ``connection`` and ``reason`` (each may be None).
+    """
+
+    def __init__(self):
+        self.nm_state = None
+        self.connectivity = None
+        self.primary_connection = None
+        self.devices = {}
+        self.last_failure = None
+
+    def wifi_devices(self):
+        for name, device in self.devices.items():
+            if device.get("type") == "wifi" or (device.get("type") is None and name.startswith("wl")):
+                yield name, device
+
+    @property
+    def active_ssid(self):
+        for _, device in self.wifi_devices():
+            if device.get("state") == "connected" and device.get("connection"):
+                return device["connection"]
+        return None
+
+    @property
+    def online(self):
+        if self.connectivity is not None:
+            return self.connectivity == "full"
+        return None if self.nm_state is None else self.nm_state.startswith("connected")
+
+    def as_dict(self):
+        return {
+            "nm_state": self.nm_state,
+            "connectivity": self.connectivity,
+            "primary_connection": self.primary_connection,
+            "active_ssid": self.active_ssid,
+            "devices": copy.deepcopy(self.devices),
+            "last_failure": copy.deepcopy(self.last_failure),
+        }
+
+
+# ================== Transcript Parser ==================
+class NetworkStateParser:
+    """Feeds ``nmcli monitor`` output line by line into a NetworkState.
+
+    ``feed(line)`` returns True when the line changed the state. Lines it
+    doesn't understand are ignored, so it copes with newer nmcli output.
+    """
+
+    def __init__(self, state=None):
+        self.state = state or NetworkState()
+
+    def seed_devices(self, output):
+        """Load ``nmcli -t -f DEVICE,TYPE,STATE,CONNECTION device`` output."""
+        for line in output.splitlines():
+            fields = split_terse(line)
+            if len(fields) != 4 or not fields[0]:
+                continue
+            name, dev_type, dev_state, connection = fields
+            self.state.devices[name] = {
+                "type": dev_type,
+                "state": dev_state.split(" (")[0],
+                "connection": connection or None,
+            }
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return False
+        state = self.state
+
+        match = NM_STATE_RE.match(line)
+        if match:
+            return self._set(state, "nm_state", match.group("state"))
+        match = CONNECTIVITY_RE.match(line)
+        if match:
+            return self._set(state, "connectivity", match.group("connectivity"))
+        match = PRIMARY_RE.match(line)
+        if match:
+            return self._set(state, "primary_connection", match.group("connection"))
+        if NO_PRIMARY_RE.match(line):
+            return self._set(state, "primary_connection", None)
+        match = ACTIVATION_FAILED_RE.match(line)
+        if match:
+            failure = state.last_failure
+            if failure is not None and failure["reason"] is None:
+                failure["reason"] = match.group("reason")  # same failure, now with a reason
+            else:
+                state.last_failure = {"device": None, "connection": None, "reason": match.group("reason")}
+            return True
+
+        match = DEVICE_RE.match(line)
+        if not match:
+            return False
+        name, event = match.group("device"), match.group("event")
+        if event == "device removed":
+            return state.devices.pop(name, None) is not None
+        using = USING_RE.match(event)
+        new_state = event.split(" (")[0]
+        # Anything else (e.g. "<profile>: connection profile changed") isn't
+        # about a device.
+        if event != "device created" and not using and new_state not in DEVICE_STATES:
+            return False
+        device = state.devices.setdefault(name, {"type": None, "state": None, "connection": None})
+        if event == "device created":
+            return True
+        if using:
+            return self._set(device, "connection", using.group("connection"))
+
+        if new_state == "connection failed":
+            state.last_failure = {"device": name, "connection": device["connection"], "reason": None}
+            self._set(device, "state", "failed")
+            self._set(device, "connection", None)
+            return True
+        changed = self._set(device, "state", new_state)
+        if new_state in ("disconnected", "unavailable", "unmanaged"):
+            changed = self._set(device, "connection", None) or changed
+        return changed
+
+    @staticmethod
+    def _set(target, key, value):
+        if isinstance(target, dict):
+            if target.get(key) == value:
+                return False
+            target[key] = value
+        else:
+            if getattr(target, key) == value:
+                return False
+            setattr(target, key, value)
+        return True
+
+
+# ================== Supervised Monitor ==================
+class NetworkStateMonitor(QObject):
+    """Keeps one long-lived ``nmcli monitor`` child and parses its output on a
+    reader thread. ``state`` is always current; ``state_changed(dict)`` is
+    emitted on the GUI thread with a snapshot after every change. The child
+    is restarted (with backoff) if it exits.
+    """
+    state_changed = pyqtSignal(dict)
+
+    def __init__(self, command=MONITOR_COMMAND, seed_command=DEVICE_LIST_COMMAND, parent=None):
+        super().__init__(parent)
+        self.command = command
+        self.seed_command = seed_command
+        self.parser = NetworkStateParser()
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._process = None
+        self._thread = None
+
+    @property
+    def state(self):
+        return self.parser.state
+
+    def snapshot(self):
+        with self._lock:
+            return self.parser.state.as_dict()
+
+    def active_ssid(self):
+        with self._lock:
+            return self.parser.state.active_ssid
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nm-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def feed_lines(self, lines):
+        """Parse ``lines`` (e.g. a recorded transcript) as if they came from
+        the child process."""
+        for line in lines:
+            with self._lock:
+                changed = self.parser.feed(line)
+                snapshot = self.parser.state.as_dict() if changed else None
+            if changed:
+                self.state_changed.emit(snapshot)
+
+    def _seed(self):
+        if not self.seed_command:
+            return
+        try:
+            output = subprocess.run(self.seed_command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠ Could not list network devices: {e}")
+            return
+        with self._lock:
+            self.parser.seed_devices(output)
+            snapshot = self.parser.state.as_dict()
+        self.state_changed.emit(snapshot)
+
+    def _run(self):
+        delay = 1.0
+        while not self._stop.is_set():
+            # Re-seed on every (re)start: events may have been missed.
+            self._seed()
+            started = time.monotonic()
+            try:
+                self._process = subprocess.Popen(
+                    self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, bufsize=1,
+                )
+            except OSError as e:
+                print(f"⚠ Could not start {' '.join(self.command)}: {e}")
+            else:
+                self.feed_lines(self._process.stdout)
+                self._process.wait()
+            if self._stop.is_set():
+                break
+            self.restarts += 1
+            # Back off if the child keeps dying straight away.
+            delay = 1.0 if time.monotonic() - started > MAX_RESTART_DELAY else min(delay * 2, MAX_RESTART_DELAY)
+            self._stop.wait(delay)
+
+
+_shared_monitor = None
+
+
+def nmcli_available():
+    return shutil.which("nmcli") is not None
+
+
+def shared_monitor():
+    """The process-wide NetworkManager monitor, or None without nmcli."""
+    global _shared_monitor
+    if _shared_monitor is None and nmcli_available():
+        _shared_monitor = NetworkStateMonitor()
+        _shared_monitor.start()
+    return _shared_monitor
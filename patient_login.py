@@ -6,27 +6,21 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
     QSizePolicy
 )
-from PyQt5.QtGui import QPixmap, QPainter
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, QEvent
 
-from virtual_keyboard import VirtualKeyboard  # <- IMPORT here
-
+from background_widget import BackgroundWidget
 
-class BackgroundWidget(QWidget):
-    def __init__(self, background_path):
-        super().__init__()
-        self.background_pixmap = QPixmap(background_path)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        scaled_pixmap = self.background_pixmap.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-        painter.drawPixmap(self.rect(), scaled_pixmap)
+from virtual_keyboard import VirtualKeyboard  # <- IMPORT here
 
 
 class FullscreenWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.showFullScreen()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
 
         self.background_widget = BackgroundWidget("Images/background.jpg")
         self.setCentralWidget(self.background_widget)
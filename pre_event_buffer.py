@@ -0,0 +1,196 @@
+import os
+import time
+import threading
+from collections import deque, namedtuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import cv2
+import numpy as np
+
+import media_paths
+
+# Seconds of footage kept before an event. Off (0) unless the site opts in:
+# the buffer holds patient video whether or not anything happens.
+PRE_EVENT_SECONDS = float(os.environ.get("DROID_PRE_EVENT_SECONDS", "0"))
+BUFFER_FPS = 10.0
+JPEG_QUALITY = 70
+# Hard cap whatever the scene: busy or noisy footage compresses worse.
+MAX_BUFFER_BYTES = 128 * 1024 * 1024
+# A longer gap in the buffered footage (e.g. the page was hidden) is a cut,
+# not a pause to reproduce frame by frame.
+MAX_GAP_SECONDS = 1.0
+FOURCC = "mp4v"
+EXTENSION = "mp4"
+
+# One buffered frame: capture time and its JPEG bytes.
+Chunk = namedtuple("Chunk", "timestamp jpeg")
+
+
+# ================== Pre-Event Buffer ==================
+class PreEventBuffer(QObject):
+    """Keeps the last ``seconds`` of camera footage as JPEG frames in memory.
+
+    ``push(frame)`` is a CaptureWorker listener. It takes a frame every
+    1/``fps`` s and hands it to the buffer's encoder thread (a newer frame
+    replaces one not yet encoded), so the capture thread never waits on the
+    encoder. Old chunks fall off by age and by ``max_bytes``.
+
+    ``trigger()`` takes what is buffered at that moment and writes it to a
+    video file on a writer thread while buffering carries on (named with
+    the event id, like the recording segments that follow the event);
+    ``event_saved(str)`` / ``event_failed(str)`` report the outcome.
+    """
+    event_saved = pyqtSignal(str)
+    event_failed = pyqtSignal(str)
+
+    def __init__(self, seconds=PRE_EVENT_SECONDS, fps=BUFFER_FPS, quality=JPEG_QUALITY,
+                 max_bytes=MAX_BUFFER_BYTES, output_dir=None, writer_factory=cv2.VideoWriter, parent=None):
+        super().__init__(parent)
+        self.seconds = seconds
+        self.fps = fps
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.output_dir = output_dir
+        self.writer_factory = writer_factory
+
+        self.encoded = 0
+        self.skipped = 0
+        self.encode_time = 0.0
+        self.events = []
+        self._chunks = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = None
+        self._wake = threading.Condition()
+        self._next_due = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pre-event-encoder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        with self._wake:
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def clear(self):
+        with self._lock:
+            self._chunks.clear()
+            self._bytes = 0
+
+    def push(self, frame):
+        if frame.timestamp < self._next_due or self._stop.is_set():
+            return
+        self._next_due = max(self._next_due + 1 / self.fps, frame.timestamp)
+        with self._wake:
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = frame
+            self._wake.notify()
+
+    def chunks(self):
+        with self._lock:
+            return list(self._chunks)
+
+    def stats(self):
+        with self._lock:
+            span = self._chunks[-1].timestamp - self._chunks[0].timestamp if len(self._chunks) > 1 else 0.0
+            count, size = len(self._chunks), self._bytes
+        return {
+            "seconds": round(span, 1),
+            "chunks": count,
+            "mb": round(size / 1024 / 1024, 1),
+            "encoded": self.encoded,
+            "skipped": self.skipped,
+            "avg_encode_ms": round(self.encode_time * 1000 / self.encoded, 2) if self.encoded else None,
+            "events": len(self.events),
+        }
+
+    def _run(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while True:
+            with self._wake:
+                while self._pending is None and not self._stop.is_set():
+                    self._wake.wait()
+                if self._stop.is_set():
+                    return
+                frame, self._pending = self._pending, None
+
+            started = time.perf_counter()
+            ok, data = cv2.imencode(".jpg", frame.image, params)
+            self.encode_time += time.perf_counter() - started
+            if not ok:
+                continue
+            self.encoded += 1
+            chunk = Chunk(frame.timestamp, data.tobytes())
+            with self._lock:
+                self._chunks.append(chunk)
+                self._bytes += len(chunk.jpeg)
+                oldest = chunk.timestamp - self.seconds
+                while self._chunks and (self._chunks[0].timestamp < oldest or self._bytes > self.max_bytes):
+                    self._bytes -= len(self._chunks.popleft().jpeg)
+
+    # ----- events -----
+    def trigger(self, patient_id=None, event_id=None):
+        """Save the buffered footage; False when nothing is buffered."""
+        chunks = self.chunks()
+        if not chunks:
+            return False
+        directory = self.output_dir or media_paths.media_dir("recordings")
+        suffix = f"_{event_id}_pre" if event_id else "_pre"
+        path = os.path.join(directory, media_paths.media_name("event", EXTENSION, patient_id, suffix=suffix))
+        threading.Thread(target=self._write_event, args=(chunks, path), name="pre-event-writer", daemon=True).start()
+        return True
+
+    def _write_event(self, chunks, path):
+        partial = path[:-len(EXTENSION)] + "part." + EXTENSION
+        writer = None
+        try:
+            for i, chunk in enumerate(chunks):
+                image = cv2.imdecode(np.frombuffer(chunk.jpeg, np.uint8), cv2.IMREAD_COLOR)
+                if image is None:
+                    continue
+                if writer is None:
+                    h, w = image.shape[:2]
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writer = self.writer_factory(partial, cv2.VideoWriter_fourcc(*FOURCC), self.fps, (w, h))
+                    if not writer.isOpened():
+                        raise OSError(f"could not open video writer for {partial}")
+                    size = (w, h)
+                if image.shape[1::-1] != size:
+                    image = cv2.resize(image, size)
+                # Repeat frames to fill the time until the next one, so the
+                # clip plays in real time even if frames were skipped.
+                gap = chunks[i + 1].timestamp - chunk.timestamp if i + 1 < len(chunks) else 1 / self.fps
+                repeats = max(1, round(gap * self.fps)) if gap <= MAX_GAP_SECONDS else 1
+                for _ in range(repeats):
+                    writer.write(image)
+            if writer is None:
+                raise OSError("no decodable frames")
+            writer.release()
+            writer = None
+            os.replace(partial, path)
+        except (OSError, cv2.error) as e:
+            if writer is not None:
+                writer.release()
+            if os.path.exists(partial):
+                os.remove(partial)
+            print(f"⚠ Could not save pre-event footage: {e}")
+            self._emit(self.event_failed, str(e))
+            return
+        self.events.append(path)
+        self._emit(self.event_saved, path)
+
+    @staticmethod
+    def _emit(signal, value):
+        try:
+            signal.emit(value)
+        except RuntimeError:
+            pass  # owner deleted
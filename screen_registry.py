@@ -0,0 +1,144 @@
+import os
+import sys
+import time
+import threading
+import importlib
+import importlib.util
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Warn when opening a screen for the first time costs more than this.
+IMPORT_BUDGET_MS = 300
+
+# ================== Screen Specs ==================
+# module:        importable module name (or the name to load ``path`` under)
+# class_name:    page class, constructed as ``class_name(parent)``
+# heavy_imports: expensive dependencies, imported only when the screen is
+#                first opened (or pre-warmed in the background)
+# path:          file to load the module from, for screens outside the root
+ScreenSpec = namedtuple("ScreenSpec", "module class_name heavy_imports path", defaults=((), None))
+
+SCREENS = {
+    "nurse_dashboard": ScreenSpec("Nurse_dashboard", "FullScreenWindow"),
+    "admin_dashboard": ScreenSpec("admin_dashboard", "FullScreenWindow"),
+    "screen_saver": ScreenSpec("screen_saver", "FullscreenApp"),
+    "camera": ScreenSpec("camera_screen", "CameraScreen", ("numpy", "cv2")),
+    "camera_grid": ScreenSpec("camera_grid_screen", "CameraGridScreen", ("numpy", "cv2")),
+    "gallery": ScreenSpec("gallery_screen", "GalleryScreen"),
+    "inventory": ScreenSpec("inventory_table", "RobotDashboard"),
+    "login": ScreenSpec("login", "FullscreenWindow"),
+    "patient_login": ScreenSpec("patient_login", "FullscreenWindow"),
+    "robot_arm": ScreenSpec(
+        "robot_arm_control_ui", "RobotArmControl",
+        ("PyQt5.QtWebEngineWidgets",),
+        os.path.join(BASE_DIR, "jammed'", "robot_arm_control_ui.py"),
+    ),
+    "live_wallpaper": ScreenSpec(
+        "live_wallpaper", "LiveWallpaperWidget",
+        ("numpy", "scipy.ndimage", "matplotlib.pyplot", "matplotlib.backends.backend_qt5agg"),
+        os.path.join(BASE_DIR, "Trash", "live_wallpaper.py"),
+    ),
+}
+
+# screen name -> {"deps_ms": float, "module_ms": float, "total_ms": float}
+import_times = {}
+# dependency name -> ms spent importing it (first import only)
+dependency_times = {}
+_lock = threading.Lock()
+
+
+def _import_timed(name):
+    if name in sys.modules:
+        return 0.0
+    start = time.perf_counter()
+    importlib.import_module(name)
+    elapsed = (time.perf_counter() - start) * 1000
+    with _lock:
+        dependency_times.setdefault(name, round(elapsed, 2))
+    return elapsed
+
+
+def _import_module(spec):
+    if spec.module in sys.modules:
+        return sys.modules[spec.module]
+    if spec.path is None:
+        return importlib.import_module(spec.module)
+    module_spec = importlib.util.spec_from_file_location(spec.module, spec.path)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[spec.module] = module
+    try:
+        module_spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[spec.module]
+        raise
+    return module
+
+
+def load_screen_class(name):
+    """Import the screen ``name`` (and its heavy deps) and return its class."""
+    spec = SCREENS[name]
+    start = time.perf_counter()
+    deps_ms = sum((_import_timed(dep) for dep in spec.heavy_imports), 0.0)
+    module_start = time.perf_counter()
+    module = _import_module(spec)
+    end = time.perf_counter()
+
+    if name not in import_times:
+        total_ms = (end - start) * 1000
+        import_times[name] = {
+            "deps_ms": round(deps_ms, 2),
+            "module_ms": round((end - module_start) * 1000, 2),
+            "total_ms": round(total_ms, 2),
+        }
+        if total_ms > IMPORT_BUDGET_MS:
+            print(f"⚠ Opening '{name}' spent {total_ms:.0f} ms importing (budget {IMPORT_BUDGET_MS} ms)")
+    return getattr(module, spec.class_name)
+
+
+def import_report():
+    """Per-screen and per-dependency import times recorded so far."""
+    with _lock:
+        return {"screens": dict(import_times), "dependencies": dict(dependency_times)}
+
+
+# ================== Background Pre-warm ==================
+def prewarm(names=None):
+    """Import heavy dependencies of ``names`` (default: all screens) on a
+    worker thread. Qt extension modules are left for the GUI thread, which
+    imports them when the screen is opened. Returns the started thread.
+    """
+    names = list(SCREENS) if names is None else names
+    deps = []
+    for name in names:
+        for dep in SCREENS[name].heavy_imports:
+            if dep not in deps and not dep.startswith("PyQt5."):
+                deps.append(dep)
+
+    def worker():
+        for dep in deps:
+            try:
+                _import_timed(dep)
+            except Exception as e:
+                print(f"⚠ Pre-warm of {dep} failed: {e}")
+
+    thread = threading.Thread(target=worker, name="screen-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+# ================== Report ==================
+if __name__ == "__main__":
+    # Cold-import every screen in this process and print the timings.
+    import json
+    from PyQt5.QtCore import Qt, QCoreApplication
+    from PyQt5.QtWidgets import QApplication
+
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    for screen in SCREENS:
+        try:
+            load_screen_class(screen)
+        except Exception as e:
+            print(f"⚠ {screen}: {e}")
+    print(json.dumps(import_report(), indent=2))
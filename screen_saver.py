@@ -5,13 +5,16 @@ from PyQt5.QtWidgets import (
     QPushButton, QVBoxLayout, QHBoxLayout, QSpacerItem, QSizePolicy, QFrame, QMessageBox
 )
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QTimer,  QPoint, QPropertyAnimation, QRect
+from PyQt5.QtCore import Qt, QTimer,  QPoint, QPropertyAnimation, QRect, QSize
+
+import asset_cache
+from main_controller import navigate_back
 
 
 
 class FullscreenApp(QMainWindow):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.image_paths = [
             "Images/3f879af94e037b6ee67e2193cdbb436d 1.png",
             "Images/9070125.jpg",
@@ -42,7 +45,7 @@ class FullscreenApp(QMainWindow):
 
         # Logo
         logo_label = QLabel()
-        pixmap = QPixmap("Images/LOGO_edited_edited-removebg-preview.png")
+        pixmap = asset_cache.load_pixmap("Images/logos/LOGO_edited_edited-removebg-preview.png", QSize(200, 100), Qt.IgnoreAspectRatio)
         logo_label.setPixmap(pixmap)
         logo_label.setFixedSize(200, 100)
         logo_label.setScaledContents(True)
@@ -124,7 +127,10 @@ class FullscreenApp(QMainWindow):
         timer.timeout.connect(self.next_image)
         timer.start(10000)
 
-        self.showFullScreen()
+        if self.parent() is None:
+            self.showFullScreen()
+        else:
+            self.resize(self.parent().size())
 
     def on_resize(self, event):
         self.background_label.setGeometry(self.rect())
@@ -142,9 +148,7 @@ class FullscreenApp(QMainWindow):
             return
         path = self.image_paths[self.current_index]
         if os.path.exists(path):
-            pixmap = QPixmap(path).scaled(
-                self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
-            )
+            pixmap = asset_cache.load_pixmap(path, self.size(), Qt.KeepAspectRatioByExpanding)
             self.background_label.setPixmap(pixmap)
 
     def prev_image(self):
@@ -157,7 +161,10 @@ class FullscreenApp(QMainWindow):
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
-            self.close()
+            self.go_back()
+
+    def go_back(self):
+        navigate_back(self)
 
 class SliderWidget(QFrame):
     def __init__(self, parent=None):
@@ -0,0 +1,178 @@
+import os
+import time
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+import cv2
+
+import media_paths
+
+JPEG_QUALITY = 92
+PNG_COMPRESSION = 3
+ENCODE_THREADS = 2
+
+
+def encode_image(image, fmt):
+    """Encode a BGR array to JPEG/PNG bytes."""
+    if fmt == "png":
+        params = [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]
+    else:
+        params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+    ok, data = cv2.imencode("." + fmt, image, params)
+    if not ok:
+        raise OSError(f"could not encode {fmt}")
+    return data
+
+
+# ================== Worker ==================
+class _SaveSignals(QObject):
+    saved = pyqtSignal(str, object)     # path, burst id (or None)
+    failed = pyqtSignal(str, object)    # error, burst id (or None)
+
+
+class _SaveTask(QRunnable):
+    def __init__(self, image, path, fmt, burst_id, signals):
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.fmt = fmt
+        self.burst_id = burst_id
+        self.signals = signals
+
+    def run(self):
+        try:
+            media_paths.write_atomic(self.path, encode_image(self.image, self.fmt).tobytes())
+        except (OSError, cv2.error) as e:
+            self._emit(self.signals.failed, f"{os.path.basename(self.path)}: {e}")
+        else:
+            self._emit(self.signals.saved, self.path)
+
+    def _emit(self, signal, text):
+        try:
+            signal.emit(text, self.burst_id)
+        except RuntimeError:
+            pass  # writer deleted while encoding
+
+
+# ================== Snapshot Writer ==================
+class SnapshotWriter(QObject):
+    """Saves camera frames as JPEG/PNG without touching the GUI thread's
+    frame budget.
+
+    Register ``on_frame`` as a CaptureWorker listener: it only remembers the
+    newest frame and, during a burst, hands due frames to the encoder pool.
+    Encoding and the atomic write happen on a private QThreadPool.
+    ``snapshot_saved(str)`` fires once a file is on disk and
+    ``burst_finished(list)`` once every frame of a burst is, or with the
+    frames taken so far when ``cancel_burst()`` ends it early (the camera
+    stopped before the burst was complete).
+    """
+    snapshot_saved = pyqtSignal(str)
+    snapshot_failed = pyqtSignal(str)
+    burst_finished = pyqtSignal(list)
+
+    def __init__(self, output_dir=None, fmt="jpg", parent=None):
+        super().__init__(parent)
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(ENCODE_THREADS)
+        self.signals = _SaveSignals(self)
+        self.signals.saved.connect(self._on_saved)
+        self.signals.failed.connect(self._on_failed)
+
+        self.saved = 0
+        self.failed = 0
+        self._latest = None
+        self._burst = None
+        self._burst_lock = threading.Lock()
+        self._bursts = {}           # burst id -> [pending count, paths]
+        self._next_burst_id = 0
+
+    def on_frame(self, frame):
+        """CaptureWorker listener; runs on the capture thread."""
+        self._latest = frame
+        if self._burst is None:
+            return
+        with self._burst_lock:
+            burst = self._burst
+            if burst is None or frame.timestamp < burst["due"]:
+                return
+            index = burst["taken"]
+            burst["taken"] += 1
+            burst["due"] = frame.timestamp + burst["interval"]
+            if burst["taken"] >= burst["count"]:
+                self._burst = None
+        self._submit(frame, burst["patient_id"], burst["id"], f"_b{index + 1:02d}")
+
+    def capture(self, patient_id=None):
+        """Save the newest frame. Returns False if there is none yet."""
+        frame = self._latest
+        if frame is None:
+            return False
+        self._submit(frame, patient_id)
+        return True
+
+    def burst(self, count, interval_ms, patient_id=None):
+        """Save the next ``count`` frames at least ``interval_ms`` apart."""
+        with self._burst_lock:
+            if self._burst is not None or count < 1:
+                return False
+            burst_id = self._next_burst_id
+            self._next_burst_id += 1
+            self._bursts[burst_id] = [count, []]
+            self._burst = {"id": burst_id, "count": count, "taken": 0, "due": 0.0,
+                           "interval": interval_ms / 1000, "patient_id": patient_id}
+        return True
+
+    def cancel_burst(self):
+        """End a burst still waiting for frames; False if there is none."""
+        with self._burst_lock:
+            burst, self._burst = self._burst, None
+            if burst is None:
+                return False
+            entry = self._bursts[burst["id"]]
+            entry[0] -= burst["count"] - burst["taken"]
+            if entry[0]:
+                return True  # finished by the saves still in flight
+            del self._bursts[burst["id"]]
+        self.burst_finished.emit(sorted(entry[1]))
+        return True
+
+    def is_bursting(self):
+        return self._burst is not None
+
+    def _submit(self, frame, patient_id, burst_id=None, suffix=""):
+        directory = self.output_dir or media_paths.media_dir("snapshots")
+        os.makedirs(directory, exist_ok=True)
+        name = media_paths.media_name("snap", self.fmt, patient_id, time.time(), suffix)
+        # The capture thread never writes into a delivered frame, so the
+        # array can be encoded without a copy.
+        self.pool.start(_SaveTask(frame.image, os.path.join(directory, name), self.fmt, burst_id, self.signals))
+
+    def _on_saved(self, path, burst_id):
+        self.saved += 1
+        self.snapshot_saved.emit(path)
+        self._burst_done(burst_id, path)
+
+    def _on_failed(self, error, burst_id):
+        self.failed += 1
+        print(f"⚠ Snapshot failed: {error}")
+        self.snapshot_failed.emit(error)
+        self._burst_done(burst_id, None)
+
+    def _burst_done(self, burst_id, path):
+        if burst_id is None:
+            return
+        with self._burst_lock:
+            entry = self._bursts[burst_id]
+            entry[0] -= 1
+            if path:
+                entry[1].append(path)
+            if entry[0]:
+                return
+            del self._bursts[burst_id]
+        self.burst_finished.emit(sorted(entry[1]))
+
+    def wait(self, timeout_ms=-1):
+        return self.pool.waitForDone(timeout_ms)
@@ -0,0 +1,39 @@
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+import pytest
+
+# Headless Qt, and nothing written outside a scratch directory.
+SCRATCH = tempfile.mkdtemp(prefix="droid_gui_tests_")
+atexit.register(shutil.rmtree, SCRATCH, ignore_errors=True)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("DROID_CAMERA_SOURCE", "synthetic:640x480@30")
+os.environ.setdefault("DROID_MEDIA_DIR", os.path.join(SCRATCH, "media"))
+os.environ.setdefault("DROID_ASSET_CACHE", os.path.join(SCRATCH, "assets"))
+os.environ.setdefault("DROID_THUMB_CACHE", os.path.join(SCRATCH, "thumbs"))
+os.environ.setdefault("DROID_CAMERA_SETTINGS", os.path.join(SCRATCH, "camera_modes.json"))
+os.environ.setdefault("DROID_FRAME_BUS", f"droid_test_{os.getpid()}")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def camera_screen(qapp):
+    from PyQt5.QtWidgets import QWidget
+    from camera_screen import CameraScreen
+    # A parent keeps the page hidden, so capture only runs if a test starts it.
+    host = QWidget()
+    screen = CameraScreen(host)
+    yield screen
+    screen.close()
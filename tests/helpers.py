@@ -0,0 +1,47 @@
+"""Helpers shared by test modules (conftest only sets up the environment
+and fixtures; test modules import from here, not from each other)."""
+import os
+import time
+
+import numpy as np
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_text(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def frames(count, start=0.0, size=(64, 48)):
+    """``count`` black camera_capture.Frames, 1/30 s apart from ``start``."""
+    from camera_capture import Frame
+    image = np.zeros((size[1], size[0], 3), np.uint8)
+    return [Frame(seq, image, start + seq / 30) for seq in range(count)]
+
+
+class SlowWriter:
+    """Stands in for cv2.VideoWriter: slow writes, a file on release."""
+    delay = 0.05
+
+    def __init__(self, path, fourcc, fps, size):
+        self.path = path
+        self.frames = 0
+
+    def isOpened(self):
+        return True
+
+    def write(self, image):
+        time.sleep(self.delay)
+        self.frames += 1
+
+    def release(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * self.frames)
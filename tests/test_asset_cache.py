@@ -0,0 +1,53 @@
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QColor, QImage
+
+import asset_cache
+
+
+def make_png(path, width, height):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor("#3366cc"))
+    assert image.save(str(path), "PNG")
+    return str(path)
+
+
+def test_memory_cache_is_bounded_by_decoded_bytes(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    asset_cache.clear()
+    icon = make_png(tmp_path / "icon.png", 64, 64)
+    background = make_png(tmp_path / "background.png", 800, 480)
+    background_bytes = 800 * 480 * 4
+    monkeypatch.setattr(asset_cache, "MAX_MEMORY_BYTES", background_bytes + 10 * 32 * 32 * 4)
+    try:
+        icons = [asset_cache.load_image(icon, QSize(32, 32)) for _ in range(3)]
+        assert asset_cache.memory_usage() == (1, 32 * 32 * 4)
+        assert icons[0].cacheKey() == icons[2].cacheKey()  # served from memory
+
+        asset_cache.load_image(background, QSize(800, 480), Qt.IgnoreAspectRatio)
+        for size in range(20, 30):
+            asset_cache.load_image(icon, QSize(size, size))
+        count, used = asset_cache.memory_usage()
+        assert used <= asset_cache.MAX_MEMORY_BYTES
+        # Many small icons fit next to one background, not a fixed count.
+        assert count > 2
+
+        # A new full-screen image pushes out the oldest entries.
+        asset_cache.load_image(background, QSize(800, 480), Qt.KeepAspectRatioByExpanding)
+        count, used = asset_cache.memory_usage()
+        assert used <= asset_cache.MAX_MEMORY_BYTES
+        assert used >= background_bytes
+    finally:
+        asset_cache.clear()
+
+
+def test_an_image_over_the_budget_is_still_kept(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(asset_cache, "MAX_MEMORY_BYTES", 1024)
+    asset_cache.clear()
+    path = make_png(tmp_path / "big.png", 100, 100)
+    try:
+        asset_cache.load_image(path, QSize(50, 50))
+        asset_cache.load_image(path, QSize(60, 60))
+        assert asset_cache.memory_usage() == (1, 60 * 60 * 4)
+    finally:
+        asset_cache.clear()
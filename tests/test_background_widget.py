@@ -0,0 +1,66 @@
+import pytest
+from PyQt5.QtCore import QPoint, QRect, QSize
+from PyQt5.QtGui import QColor, QImage, QRegion
+
+import asset_cache
+from background_widget import BackgroundWidget
+
+
+@pytest.fixture
+def background(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    asset_cache.clear()
+    image = QImage(400, 300, QImage.Format_RGB32)
+    image.fill(QColor("#204080"))
+    path = str(tmp_path / "background.png")
+    assert image.save(path, "PNG")
+    yield path
+    asset_cache.clear()
+
+
+def paint(widget, rect=None):
+    target = QImage(widget.size(), QImage.Format_RGB32)
+    target.fill(QColor("black"))
+    region = QRegion(rect) if rect is not None else QRegion(widget.rect())
+    widget.render(target, QPoint(), region)
+    return target
+
+
+def test_scales_once_per_size(background):
+    widget = BackgroundWidget(background)
+    widget.resize(200, 100)
+    frame = paint(widget)
+    assert widget.scale_count == 1
+    assert widget.scaled_pixmap.size() == QSize(200, 100)   # stretched, not cropped
+    assert frame.pixelColor(199, 99) == QColor("#204080")
+
+    paint(widget)
+    paint(widget, QRect(10, 10, 20, 20))
+    assert widget.scale_count == 1
+    assert widget.paint_stats()["paints"] == 3
+
+
+def test_rescales_on_resize(background):
+    widget = BackgroundWidget(background)
+    widget.resize(200, 100)
+    paint(widget)
+    widget.resize(640, 480)
+    frame = paint(widget)
+    assert widget.scale_count == 2
+    assert widget.scaled_pixmap.size() == QSize(640, 480)
+    assert frame.pixelColor(639, 479) == QColor("#204080")
+
+    widget.resize(200, 100)
+    paint(widget)
+    stats = widget.paint_stats()
+    assert stats["rescales"] == 3
+    assert stats["total_scale_ms"] >= 0
+
+
+def test_a_partial_repaint_only_touches_its_rect(background):
+    widget = BackgroundWidget(background)
+    widget.resize(200, 100)
+    paint(widget)
+    frame = paint(widget, QRect(0, 0, 50, 50))
+    assert frame.pixelColor(10, 10) == QColor("#204080")
+    assert frame.pixelColor(150, 80) == QColor("black")
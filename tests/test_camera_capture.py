@@ -0,0 +1,133 @@
+import time
+import threading
+
+from camera_capture import CaptureWorker, FrameRing, fit_within
+from camera_modes import CameraMode
+from frame_sources import SyntheticSource
+from helpers import wait_for
+
+
+def run_for(capture, seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        frame = capture.take_latest()
+        if frame is not None:
+            capture.mark_displayed(frame)
+        time.sleep(0.01)
+
+
+def test_rates_after_restart_ignore_the_stopped_time(qapp):
+    capture = CaptureWorker(SyntheticSource(320, 240, 30))
+    capture.start()
+    run_for(capture, 1.0)
+    capture.stop(1.0)
+    time.sleep(1.5)
+    capture.start()
+    run_for(capture, 1.0)
+    stats = capture.stats()
+    capture.stop(1.0)
+    assert stats["capture_fps"] > 25
+    assert stats["displayed_fps"] > 20
+
+
+def test_max_size_shrinks_on_the_capture_thread(qapp):
+    capture = CaptureWorker(SyntheticSource(1280, 720, 30))
+    capture.max_size = (320, 320)
+    capture.start()
+    run_for(capture, 0.3)
+    frame = None
+    while frame is None:
+        frame = capture.take_latest()
+    capture.stop(1.0)
+    assert frame.image.shape[:2] == (180, 320)
+
+
+def test_ring_keeps_newest_and_counts_drops():
+    ring = FrameRing(2)
+    for seq in range(5):
+        ring.push(seq)
+    assert ring.take_latest() == 4
+    assert ring.dropped == 4
+    assert ring.take_latest() is None
+
+
+def test_fit_within():
+    assert fit_within(1920, 1080, (640, 640)) == (640, 360)
+    assert fit_within(320, 240, (640, 480)) == (320, 240)
+    assert fit_within(320, 240, None) == (320, 240)
+
+
+def test_a_stopped_worker_reports_no_rates(qapp):
+    capture = CaptureWorker(SyntheticSource(320, 240, 30))
+    capture.start()
+    run_for(capture, 0.5)
+    assert capture.stats()["cpu_cores"] > 0
+    capture.stop(1.0)
+    stats = capture.stats()
+    assert stats["cpu_cores"] == 0
+    assert stats["capture_fps"] == 0
+    assert stats["displayed_fps"] == 0
+    assert stats["latency_ms"] is None
+
+
+class WedgedSource(SyntheticSource):
+    """A synthetic camera whose read() can be made to hang, like a wedged
+    USB device, and that counts releases."""
+
+    def __init__(self):
+        super().__init__(320, 240, 30)
+        self.wedged = threading.Event()
+        self.unwedge = threading.Event()
+        self.releases = 0
+
+    def read(self):
+        if self.wedged.is_set():
+            self.unwedge.wait()
+        return super().read()
+
+    def release(self):
+        self.releases += 1
+        super().release()
+
+
+def test_restart_while_the_old_read_is_still_blocked(qapp):
+    source = WedgedSource()
+    capture = CaptureWorker(source)
+    capture.start()
+    run_for(capture, 0.3)
+    source.wedged.set()
+    time.sleep(0.1)
+    capture.stop(0.1)
+    assert not capture.is_running()
+
+    source.wedged.clear()
+    capture.start()
+    assert capture.is_running()
+    captured = capture.captured
+    run_for(capture, 0.3)
+    assert capture.captured > captured
+
+    # The old run wakes up, delivers nothing and leaves the source alone.
+    source.unwedge.set()
+    run_for(capture, 0.3)
+    assert source.releases == 0
+    assert capture.is_running()
+    capture.stop(1.0)
+    assert source.releases == 1
+
+
+def test_driver_default_restores_the_mode_the_device_opened_in(qapp):
+    capture = CaptureWorker(SyntheticSource(640, 480, 30))
+    modes = []
+    capture.mode_changed.connect(modes.append)
+    capture.start()
+    try:
+        assert wait_for(lambda: qapp.processEvents() or modes)
+        opened = modes[-1]
+        capture.set_mode(CameraMode("BGR3", 1280, 720, 30))
+        assert wait_for(lambda: qapp.processEvents() or (modes[-1].width, modes[-1].height) == (1280, 720))
+        capture.set_mode(None)
+        assert wait_for(lambda: qapp.processEvents() or modes[-1] == opened)
+    finally:
+        capture.stop(1.0)
+    assert (capture.source.width, capture.source.height) == (640, 480)
@@ -0,0 +1,24 @@
+import time
+
+from PyQt5.QtWidgets import QWidget
+
+
+def test_tiles_report_nothing_after_leaving_the_page(qapp, monkeypatch):
+    monkeypatch.setenv("DROID_CAMERA_SOURCES", "synthetic:320x240@30,synthetic:320x240@15")
+    from camera_grid_screen import CameraGridScreen
+    host = QWidget()
+    grid = CameraGridScreen(host)
+    try:
+        grid.show()
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            qapp.processEvents()
+            time.sleep(0.01)
+        assert grid.grid_stats()["total"]["capture_fps"] > 0
+        grid.hide()
+        total = grid.grid_stats()["total"]
+        assert total["capture_cores"] == 0
+        assert total["displayed_fps"] == 0
+        assert all(tile["cpu_cores"] == 0 for tile in grid.grid_stats()["tiles"])
+    finally:
+        grid.close()
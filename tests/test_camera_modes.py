@@ -0,0 +1,90 @@
+from PyQt5.QtCore import Qt
+
+from camera_modes import (AUTO, CameraMode, CameraSettings, CameraSettingsDialog, choose_auto,
+                          mode_label, parse_v4l2_formats)
+from helpers import fixture_text
+
+MJPG_1080 = CameraMode("MJPG", 1920, 1080, 30.0)
+MJPG_720 = CameraMode("MJPG", 1280, 720, 30.0)
+YUYV_480 = CameraMode("YUYV", 640, 480, 30.0)
+
+
+def test_parse_v4l2_formats():
+    modes = parse_v4l2_formats(fixture_text("v4l2_list_formats_ext.txt"))
+    assert modes == [
+        CameraMode("MJPG", 1920, 1080, 30.0),
+        CameraMode("MJPG", 1920, 1080, 15.0),
+        CameraMode("MJPG", 1280, 720, 60.0),
+        CameraMode("MJPG", 1280, 720, 30.0),
+        CameraMode("MJPG", 640, 480, 30.0),
+        CameraMode("YUYV", 1920, 1080, 5.0),
+        CameraMode("YUYV", 1280, 720, 10.0),
+        CameraMode("YUYV", 640, 480, 30.0),
+        CameraMode("YUYV", 640, 480, 25.0),
+        CameraMode("YUYV", 320, 240, 29.97),
+    ]
+
+
+def test_parse_v4l2_formats_ignores_noise():
+    assert parse_v4l2_formats("") == []
+    assert parse_v4l2_formats("Cannot open device /dev/video9, exiting.") == []
+    # An interval before any size belongs to nothing.
+    assert parse_v4l2_formats("[0]: 'MJPG'\n Interval: Discrete 0.033s (30.000 fps)") == []
+
+
+def test_auto_takes_the_cheapest_mode_that_fills_the_display():
+    modes = parse_v4l2_formats(fixture_text("v4l2_list_formats_ext.txt"))
+    # 640x480 YUYV fills a 640x480 display and needs no JPEG decode; 25 fps
+    # is smooth enough and cheaper than 30.
+    assert choose_auto(modes, 640, 480) == CameraMode("YUYV", 640, 480, 25.0)
+    # A 1280x720 display: YUYV only manages 10 fps there, MJPG 30 fps.
+    assert choose_auto(modes, 1280, 720) == MJPG_720
+    assert choose_auto(modes, 1024, 600) == MJPG_720
+
+
+def test_auto_prefers_a_smooth_rate_over_fewer_pixels():
+    slow = CameraMode("YUYV", 1280, 720, 10.0)
+    assert choose_auto([slow, MJPG_1080], 1280, 720) == MJPG_1080
+    # With nothing smooth enough, the fastest of the filling modes.
+    slower = CameraMode("YUYV", 1920, 1080, 5.0)
+    assert choose_auto([slower, slow], 1280, 720) == slow
+
+
+def test_auto_on_a_display_bigger_than_any_mode():
+    assert choose_auto([YUYV_480, MJPG_720, CameraMode("MJPG", 1280, 720, 60.0)], 3840, 2160) \
+        == CameraMode("MJPG", 1280, 720, 60.0)
+    assert choose_auto([], 640, 480) is None
+
+
+def test_settings_round_trip(tmp_path):
+    settings = CameraSettings(str(tmp_path / "modes.json"))
+    assert settings.mode_for("usb-1") is None
+    settings.save("usb-1", MJPG_720)
+    settings.save("usb-2", AUTO)
+    assert settings.mode_for("usb-1") == MJPG_720
+    assert settings.mode_for("usb-2") == AUTO
+    settings.save("usb-1", None)
+    assert settings.mode_for("usb-1") is None
+
+
+def test_dialog_can_go_back_to_the_driver_default(qapp):
+    dialog = CameraSettingsDialog(selected=MJPG_720)
+    chosen = []
+    dialog.mode_selected.connect(chosen.append)
+    dialog.set_modes([YUYV_480, MJPG_720])
+    labels = [dialog.mode_list.item(row).text() for row in range(dialog.mode_list.count())]
+    assert labels == [mode_label(AUTO), mode_label(None), mode_label(YUYV_480), mode_label(MJPG_720)]
+    assert dialog.mode_list.currentItem().data(Qt.UserRole) == MJPG_720
+
+    dialog.mode_list.setCurrentRow(1)
+    dialog.accept()
+    assert chosen == [None]
+
+
+def test_dialog_ignores_the_loading_placeholder(qapp):
+    dialog = CameraSettingsDialog()
+    chosen = []
+    dialog.mode_selected.connect(chosen.append)
+    dialog.mode_list.setCurrentRow(2)  # "Reading camera modes…"
+    dialog.accept()
+    assert chosen == []
@@ -0,0 +1,48 @@
+import os
+
+from camera_modes import CameraMode
+from helpers import SlowWriter, frames, wait_for
+from video_recorder import DEFAULT_FPS
+
+
+def test_recording_uses_the_negotiated_frame_rate(camera_screen):
+    camera_screen.capture.mode = CameraMode("MJPG", 1280, 720, 15)
+    camera_screen.toggle_recording()
+    try:
+        assert camera_screen.recorder.fps == 15
+    finally:
+        camera_screen.toggle_recording()
+
+
+def test_recording_falls_back_without_a_mode(camera_screen):
+    camera_screen.capture.mode = None
+    assert camera_screen.recording_fps() == DEFAULT_FPS
+    camera_screen.capture.mode = CameraMode("YUYV", 640, 480, 0)
+    assert camera_screen.recording_fps() == DEFAULT_FPS
+
+
+def test_recordings_are_named_for_the_patient(camera_screen, qapp):
+    recorder = camera_screen.recorder
+    recorder.writer_factory = SlowWriter
+    finished = []
+    recorder.segment_finished.connect(finished.append)
+    camera_screen.patient_id = "P 42"
+    camera_screen.toggle_recording()
+    for frame in frames(3):
+        recorder.push(frame)
+    camera_screen.toggle_recording()
+
+    def delivered():
+        qapp.processEvents()
+        return finished
+
+    assert wait_for(delivered)
+    assert os.path.basename(finished[0]).startswith("rec_P-42_")
+
+
+def test_leaving_the_page_ends_a_pending_burst(camera_screen):
+    camera_screen.show()
+    assert camera_screen.snapshots.burst(3, 100)
+    camera_screen.hide()
+    assert not camera_screen.snapshots.is_bursting()
+    assert camera_screen.snapshots.burst(3, 100)
@@ -0,0 +1,30 @@
+from camera_zoom import DigitalZoom, MAX_ZOOM, ZOOM_STEP
+
+
+def test_hardware_zoom_keeps_rising(camera_screen):
+    screen = camera_screen
+    screen.capture.hardware_zoom = 100  # the device accepts zoom requests
+    levels = []
+    for _ in range(4):
+        screen.control_buttons["Zoom In"].click()
+        levels.append(screen.zoom.hardware_level)
+    assert levels == [ZOOM_STEP ** n for n in range(1, 5)]
+    assert screen.capture._pending_zoom == levels[-1]
+    assert screen.zoom.level == 1.0  # nothing cropped
+
+    screen.control_buttons["Zoom Out"].click()
+    assert screen.zoom.hardware_level == levels[2]
+
+
+def test_digital_zoom_steps_from_animation_target(camera_screen):
+    screen = camera_screen
+    screen.zoom_by(1)
+    screen.zoom_by(1)  # while the first step is still animating
+    assert screen.zoom_animation.endValue() == ZOOM_STEP ** 2
+    screen.zoom_animation.stop()
+
+
+def test_step_is_clamped():
+    zoom = DigitalZoom()
+    assert zoom.step(1, MAX_ZOOM) == MAX_ZOOM
+    assert zoom.step(-1, 1.0) == 1.0
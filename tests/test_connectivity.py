@@ -0,0 +1,121 @@
+from connectivity import ConnectivityMonitor, FakeProbe, GatewayProbe
+from helpers import wait_for
+
+
+class BrokenProbe:
+    name = "broken"
+
+    def check(self):
+        raise OSError("no route to host")
+
+
+def monitor_with(results=True, **kwargs):
+    probe = FakeProbe(results)
+    monitor = ConnectivityMonitor([probe], **kwargs)
+    states = []
+    monitor.state_changed.connect(states.append)
+    return monitor, probe, states
+
+
+def test_check_once_passes_when_any_probe_passes():
+    monitor = ConnectivityMonitor([FakeProbe(False), FakeProbe(True)])
+    assert monitor.check_once()
+    assert not ConnectivityMonitor([FakeProbe(False)]).check_once()
+    assert not ConnectivityMonitor([BrokenProbe()]).check_once()
+
+
+def test_no_default_route_skips_the_other_probes(tmp_path):
+    routes = tmp_path / "route"
+    routes.write_text("Iface\tDestination\tGateway\tFlags\n")
+    probe = FakeProbe(True)
+    monitor = ConnectivityMonitor([GatewayProbe(str(routes)), probe])
+    assert not monitor.check_once()
+    assert probe.calls == 0
+
+    routes.write_text("Iface\tDestination\tGateway\tFlags\nwlan0\t00000000\t0102A8C0\t0003\n")
+    assert monitor.check_once()
+    assert probe.calls == 1
+
+
+def test_hysteresis():
+    monitor, _, states = monitor_with(up_after=2, down_after=3)
+    assert monitor.update(True)          # first result is reported at once
+    assert not monitor.update(False)
+    assert not monitor.update(False)
+    assert not monitor.update(True)      # a pass resets the failure streak
+    assert not monitor.update(False)
+    assert not monitor.update(False)
+    assert monitor.update(False)
+    assert not monitor.update(True)
+    assert monitor.update(True)
+    assert states == [True, False, True]
+
+
+def test_immediate_results_skip_the_hysteresis():
+    monitor, _, states = monitor_with(down_after=3)
+    monitor.update(True)
+    assert monitor.update(False, immediate=True)
+    assert states == [True, False]
+
+
+def test_offline_polling_backs_off():
+    monitor, _, _ = monitor_with(interval=1.0, max_interval=8.0, down_after=1)
+    monitor.update(True)
+    monitor.update(False)
+    assert monitor.current_interval == 1.0
+    intervals = []
+    for _ in range(5):
+        monitor.update(False)
+        intervals.append(monitor.current_interval)
+    assert intervals == [2.0, 4.0, 8.0, 8.0, 8.0]
+    monitor.trigger()
+    assert monitor.current_interval == 1.0
+
+
+def test_monitor_thread_reports_flips(qapp):
+    monitor, probe, states = monitor_with([True, False, False, True], interval=0.01, down_after=2)
+    monitor.start()
+
+    def flipped():
+        qapp.processEvents()  # state_changed is queued to this thread
+        return states == [True, False, True]
+
+    try:
+        assert wait_for(flipped)
+    finally:
+        monitor.stop(1.0)
+    assert probe.calls >= 4
+
+
+def test_a_failed_round_while_online_is_retried_soon():
+    monitor, _, states = monitor_with(interval=120.0, retry_interval=5.0, down_after=2)
+    monitor.update(True)
+    assert monitor.current_interval == 120.0
+    monitor.update(False)
+    assert monitor.current_interval == 5.0
+    assert monitor.update(False)
+    assert states == [True, False]
+
+    monitor.update(True)                 # back up: the slow heartbeat again
+    monitor.update(True)
+    assert monitor.current_interval == 120.0
+
+
+def test_a_burst_of_link_events_gives_one_check(qapp):
+    monitor, probe, states = monitor_with(True, interval=60.0, settle=0.2, down_after=3)
+    monitor.start()
+    try:
+        assert wait_for(lambda: probe.calls == 1)
+        probe.results = False
+        for _ in range(5):
+            monitor.link_changed()
+        assert probe.calls == 1          # still settling
+
+        def reported():
+            qapp.processEvents()
+            return states == [True, False]
+        # One check, reported at once despite down_after=3.
+        assert wait_for(reported)
+        assert probe.calls == 2
+    finally:
+        monitor.stop(1.0)
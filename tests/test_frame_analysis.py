@@ -0,0 +1,151 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from camera_capture import Frame
+from frame_analysis import AnalysisPlugin, AnalysisPool, Annotation, _run_plugin
+from frame_bus import FrameBus
+from helpers import wait_for
+
+
+def bus_name(tag):
+    return f"droid_test_analysis_{tag}_{os.getpid()}"
+
+
+class CornerPlugin(AnalysisPlugin):
+    """Boxes the top-left quarter of whatever it's given."""
+    name = "corner"
+    fps = 100
+    input_size = (64, 36)
+    delay = 0.0
+
+    def process(self, image):
+        time.sleep(self.delay)
+        height, width = image.shape[:2]
+        return [Annotation("box", (0, 0, width // 2, height // 2), "corner"),
+                Annotation("mask", (width // 2, height // 2, width // 4, height // 4), color="#000000")]
+
+
+class SlowCornerPlugin(CornerPlugin):
+    name = "slow"
+    fps = 50
+    delay = 0.1
+
+
+class BrokenPlugin(AnalysisPlugin):
+    name = "broken"
+    fps = 100
+
+    def process(self, image):
+        raise ValueError("bad frame")
+
+
+class NoSetupPlugin(AnalysisPlugin):
+    name = "nosetup"
+
+    def setup(self):
+        raise RuntimeError("model missing")
+
+
+def run_in_thread(plugin, name):
+    results, stop = queue.Queue(), threading.Event()
+    thread = threading.Thread(target=_run_plugin, args=(plugin, name, results, stop), daemon=True)
+    thread.start()
+    return results, stop, thread
+
+
+def test_annotations_are_normalised_to_the_camera_frame():
+    bus = FrameBus(bus_name("norm"), slots=2, slot_bytes=256 * 144 * 3)
+    results, stop, thread = run_in_thread(CornerPlugin(), bus.name)
+    try:
+        # Frames are only published once a reader is attached.
+        assert wait_for(lambda: bus.has_readers())
+        bus.publish(Frame(5, np.zeros((144, 256, 3), np.uint8), time.monotonic()))
+        result = results.get(timeout=5)
+    finally:
+        stop.set()
+        thread.join(2)
+        bus.close()
+    assert result.plugin == "corner"
+    assert result.frame_seq == 5
+    box, mask = result.annotations
+    # Scaled down to 64x36 for the plugin, handed back as 0..1 of the frame.
+    assert box == Annotation("box", (0.0, 0.0, 0.5, 0.5), "corner", CornerPlugin.color)
+    assert mask == Annotation("mask", (0.5, 0.5, 0.25, 0.25), "", "#000000")
+    assert result.elapsed_ms >= 0
+
+
+def test_a_failing_plugin_warns_once_and_keeps_running(capsys):
+    bus = FrameBus(bus_name("broken"), slots=2, slot_bytes=64 * 48 * 3)
+    results, stop, thread = run_in_thread(BrokenPlugin(), bus.name)
+    try:
+        assert wait_for(lambda: bus.has_readers())
+        for seq in range(1, 6):
+            bus.publish(Frame(seq, np.zeros((48, 64, 3), np.uint8), time.monotonic()))
+            time.sleep(0.03)
+        assert thread.is_alive()
+    finally:
+        stop.set()
+        thread.join(2)
+        bus.close()
+    assert results.empty()
+    assert capsys.readouterr().out.count("Analysis plugin broken failed: bad frame") == 1
+
+
+def test_a_plugin_that_cannot_set_up_exits(capsys):
+    bus = FrameBus(bus_name("setup"), slots=2, slot_bytes=1024)
+    results, stop, thread = run_in_thread(NoSetupPlugin(), bus.name)
+    try:
+        thread.join(2)
+        assert not thread.is_alive()
+    finally:
+        stop.set()
+        bus.close()
+    assert results.empty()
+    assert "nosetup unavailable: model missing" in capsys.readouterr().out
+
+
+def test_pool_analyses_the_newest_frame_and_skips_stale_ones(qapp):
+    bus = FrameBus(bus_name("pool"), slots=4, slot_bytes=128 * 72 * 3)
+    pool = AnalysisPool([SlowCornerPlugin()], bus_name=bus.name)
+    received = []
+    pool.result_ready.connect(received.append)
+    published = [0]
+    stop = threading.Event()
+
+    def camera():
+        # ~100 fps, much faster than the plugin keeps up with.
+        while not stop.is_set():
+            published[0] += 1
+            bus.publish(Frame(published[0], np.zeros((72, 128, 3), np.uint8), time.monotonic()))
+            time.sleep(0.01)
+
+    feeder = threading.Thread(target=camera, daemon=True)
+    feeder.start()
+    pool.start()
+    try:
+        # The first result takes a process start (spawn) to arrive.
+        assert wait_for(lambda: qapp.processEvents() or len(received) >= 3, timeout=30)
+        assert pool.fresh_results()
+    finally:
+        stop.set()
+        feeder.join(1)
+        pool.stop()
+        bus.close()
+    qapp.processEvents()  # results still queued to this thread
+
+    seqs = [result.frame_seq for result in received]
+    assert seqs == sorted(seqs)
+    # Each result is for a frame that was current when the plugin looked,
+    # not the next one in a backlog.
+    assert all(later - earlier > 1 for earlier, later in zip(seqs, seqs[1:]))
+    assert received[-1].annotations[0].rect == (0.0, 0.0, 0.5, 0.5)
+    stats = pool.stats()["slow"]
+    assert stats["results"] >= 3
+    assert stats["last_frame_seq"] == seqs[-1]
+
+    # Once the camera stops, the last result ages out of fresh_results().
+    assert wait_for(lambda: not pool.fresh_results(), timeout=2)
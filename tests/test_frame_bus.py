@@ -0,0 +1,73 @@
+import os
+import threading
+
+import numpy as np
+
+from camera_capture import Frame
+from frame_bus import FrameBus, FrameBusReader, MAX_READERS, R_TOKEN
+
+
+def bus_name(tag):
+    return f"droid_test_bus_{tag}_{os.getpid()}"
+
+
+def test_frames_bigger_than_a_slot_are_scaled_to_fit():
+    bus = FrameBus(bus_name("fit"), slots=2, slot_bytes=640 * 360 * 3)
+    reader = FrameBusReader(bus.name)
+    try:
+        image = np.full((720, 1280, 3), 200, np.uint8)
+        bus.publish(Frame(1, image, 1.0))
+        frame = reader.latest(copy=True)
+        assert frame is not None
+        assert frame.image.nbytes <= 640 * 360 * 3
+        assert frame.image.shape[1] / frame.image.shape[0] == 1280 / 720
+        assert (frame.image == 200).all()
+        stats = bus.stats()
+        assert stats["downscaled"] == 1
+        assert stats["too_large"] == 0
+    finally:
+        reader.close()
+        bus.close()
+
+
+def test_frames_that_fit_are_published_unchanged():
+    bus = FrameBus(bus_name("same"), slots=2, slot_bytes=320 * 240 * 3)
+    reader = FrameBusReader(bus.name)
+    try:
+        image = np.random.randint(0, 255, (240, 320, 3), np.uint8)
+        bus.publish(Frame(7, image, 1.0))
+        frame = reader.latest(copy=True)
+        assert frame.frame_seq == 7
+        assert np.array_equal(frame.image, image)
+        assert bus.stats()["downscaled"] == 0
+    finally:
+        reader.close()
+        bus.close()
+
+
+def test_concurrent_readers_get_their_own_entries():
+    bus = FrameBus(bus_name("readers"), slots=2, slot_bytes=1024)
+    readers = []
+    lock = threading.Lock()
+    start = threading.Barrier(MAX_READERS)
+
+    def attach():
+        start.wait()
+        reader = FrameBusReader(bus.name)
+        with lock:
+            readers.append(reader)
+
+    threads = [threading.Thread(target=attach) for _ in range(MAX_READERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        tokens = {int(reader.entry[R_TOKEN]) for reader in readers}
+        assert len(readers) == MAX_READERS
+        assert len(tokens) == MAX_READERS
+        assert len(bus.stats()["readers"]) == MAX_READERS
+    finally:
+        for reader in readers:
+            reader.close()
+        bus.close()
@@ -0,0 +1,59 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from frame_sources import (DeviceSource, FileSource, ImageSequenceSource, SyntheticSource, default_source,
+                           default_sources, parse_source)
+
+
+def test_device_indices():
+    source = parse_source("2")
+    assert isinstance(source, DeviceSource)
+    assert source.index == 2
+    assert parse_source(" 0 ").index == 0
+    assert parse_source(1).index == 1
+
+
+def test_files():
+    source = parse_source("file:clips/ward 3.mp4")
+    assert isinstance(source, FileSource)
+    assert source.path == "clips/ward 3.mp4"
+
+
+def test_image_sequences(tmp_path):
+    for i in range(3):
+        cv2.imwrite(str(tmp_path / f"shot{i}.jpg"), np.zeros((8, 8, 3), np.uint8))
+    source = parse_source(f"images:{tmp_path}/*.jpg@12.5")
+    assert isinstance(source, ImageSequenceSource)
+    assert source.fps == 12.5
+    assert [os.path.basename(p) for p in source.paths] == ["shot0.jpg", "shot1.jpg", "shot2.jpg"]
+    assert parse_source(f"images:{tmp_path}/*.jpg").fps == 30.0
+
+
+def test_synthetic():
+    source = parse_source("synthetic:1920x1080@60")
+    assert isinstance(source, SyntheticSource)
+    assert (source.width, source.height, source.fps) == (1920, 1080, 60.0)
+    source = parse_source("synthetic:640X480")
+    assert (source.width, source.height, source.fps) == (640, 480, 30.0)
+    source = parse_source("synthetic:")
+    assert (source.width, source.height) == (1280, 720)
+
+
+@pytest.mark.parametrize("spec", ["webcam", "rtsp://camera/stream", "synthetic:big", "images:*.jpg@fast", ""])
+def test_bad_specs_raise_value_error(spec):
+    with pytest.raises(ValueError):
+        parse_source(spec)
+
+
+def test_environment_overrides(monkeypatch):
+    monkeypatch.setenv("DROID_CAMERA_SOURCE", "synthetic:320x240@5")
+    assert isinstance(default_source(), SyntheticSource)
+    monkeypatch.delenv("DROID_CAMERA_SOURCE")
+    assert default_source(3).index == 3
+
+    monkeypatch.setenv("DROID_CAMERA_SOURCES", "0, synthetic:320x240,,file:a.mp4")
+    sources = default_sources()
+    assert [type(source) for source in sources] == [DeviceSource, SyntheticSource, FileSource]
@@ -0,0 +1,67 @@
+import os
+
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage
+
+import asset_cache
+import thumbnail_loader
+from gallery_screen import MediaModel, MediaRole
+from media_index import MediaIndex
+from thumbnail_loader import ThumbnailLoader, load_thumbnail
+
+
+def add_snapshot(index, directory, stamp):
+    path = os.path.join(str(directory), f"snap_{stamp}_000.jpg")
+    cv2.imwrite(path, np.random.randint(0, 255, (120, 160, 3), np.uint8))
+    index.add(path)
+    index.db.commit()
+    return path
+
+
+def test_new_files_are_inserted_at_the_top(qapp, tmp_path):
+    index = MediaIndex(str(tmp_path / "index.db"))
+    for minute in range(3):
+        add_snapshot(index, tmp_path, f"20261018_1200{minute:02d}")
+    model = MediaModel(index, ThumbnailLoader(load_function=lambda path, size: QImage()))
+    events = []
+    model.modelReset.connect(lambda: events.append("reset"))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("inserted", first, last)))
+
+    newest = add_snapshot(index, tmp_path, "20261018_130000")
+    add_snapshot(index, tmp_path, "20261018_130100")
+    model.refresh()
+
+    assert events == [("inserted", 0, 1)]
+    assert model.rowCount() == 5
+    assert model.data(model.index(1), MediaRole).path == newest
+    index.close()
+
+
+def test_other_changes_reset_the_model(qapp, tmp_path):
+    index = MediaIndex(str(tmp_path / "index.db"))
+    paths = [add_snapshot(index, tmp_path, f"20261018_1200{minute:02d}") for minute in range(3)]
+    model = MediaModel(index, ThumbnailLoader(load_function=lambda path, size: QImage()))
+    events = []
+    model.modelReset.connect(lambda: events.append("reset"))
+
+    index.remove(paths[:1])
+    index.db.commit()
+    model.refresh()
+
+    assert events == ["reset"]
+    assert model.rowCount() == 2
+    index.close()
+
+
+def test_thumbnail_cache_is_trimmed(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnail_loader, "THUMB_DIR", str(tmp_path / "thumbs"))
+    monkeypatch.setattr(thumbnail_loader, "EVICT_EVERY", 1)
+    monkeypatch.setattr(thumbnail_loader, "MAX_THUMB_CACHE_BYTES", 20 * 1024)
+    for i in range(10):
+        path = str(tmp_path / f"snap_20261018_1200{i:02d}_000.jpg")
+        cv2.imwrite(path, np.random.randint(0, 255, (240, 320, 3), np.uint8))
+        assert not load_thumbnail(path).isNull()
+    entries = asset_cache.cache_entries(thumbnail_loader.THUMB_DIR)
+    assert 0 < len(entries) < 10
+    assert sum(size for _, size, _ in entries) <= 20 * 1024
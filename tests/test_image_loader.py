@@ -0,0 +1,102 @@
+import threading
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+
+from helpers import wait_for
+from image_loader import MAX_READY_IMAGES, ImageLoader, read_scaled_image
+
+
+def make_jpeg(path, width, height):
+    cv2.imwrite(str(path), np.random.randint(0, 255, (height, width, 3), np.uint8))
+    return str(path)
+
+
+def test_decodes_straight_to_the_display_size(tmp_path):
+    path = make_jpeg(tmp_path / "slide.jpg", 1600, 1200)
+    assert read_scaled_image(path, QSize(400, 400)).size() == QSize(400, 300)
+    assert read_scaled_image(path, QSize(400, 400), Qt.KeepAspectRatioByExpanding).size() == QSize(533, 400)
+    assert read_scaled_image(path, QSize(400, 400), Qt.IgnoreAspectRatio).size() == QSize(400, 400)
+
+
+def test_small_images_are_not_scaled_up(tmp_path):
+    path = make_jpeg(tmp_path / "icon.jpg", 64, 48)
+    assert read_scaled_image(path, QSize(640, 480)).size() == QSize(64, 48)
+
+
+def test_unreadable_files_give_a_null_image(tmp_path, capsys):
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(b"not a jpeg")
+    assert read_scaled_image(str(path), QSize(100, 100)).isNull()
+    assert "Failed to load image" in capsys.readouterr().out
+
+
+class CountingLoad:
+    """load_function that records calls and can be held back."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, path, size):
+        self.calls.append((path, size.width(), size.height()))
+        self.release.wait(5)
+        image = QImage(size, QImage.Format_RGB32)
+        image.fill(Qt.white)
+        return image
+
+
+def collect(loader):
+    shown = []
+    loader.image_ready.connect(lambda path, image: shown.append((path, image.width(), image.height())))
+    return shown
+
+
+def test_images_are_keyed_on_path_and_size(qapp):
+    load = CountingLoad()
+    loader = ImageLoader(load_function=load)
+    shown = collect(loader)
+    loader.request("a.jpg", QSize(100, 50))
+    assert wait_for(lambda: qapp.processEvents() or shown)
+    loader.request("a.jpg", QSize(100, 50))       # ready: no second decode
+    loader.request("a.jpg", QSize(200, 100))      # another size is another image
+    assert wait_for(lambda: qapp.processEvents() or len(shown) == 3)
+    assert shown == [("a.jpg", 100, 50), ("a.jpg", 100, 50), ("a.jpg", 200, 100)]
+    assert load.calls == [("a.jpg", 100, 50), ("a.jpg", 200, 100)]
+
+
+def test_prefetched_images_show_at_once(qapp):
+    load = CountingLoad()
+    loader = ImageLoader(load_function=load)
+    shown = collect(loader)
+    loader.prefetch("next.jpg", QSize(64, 64))
+    assert wait_for(lambda: qapp.processEvents() or loader.ready)
+    assert shown == []                           # prefetch alone shows nothing
+    loader.request("next.jpg", QSize(64, 64))
+    assert shown == [("next.jpg", 64, 64)]       # synchronous
+    assert len(load.calls) == 1
+
+
+def test_only_the_latest_request_is_shown(qapp):
+    load = CountingLoad()
+    load.release.clear()
+    loader = ImageLoader(load_function=load)
+    shown = collect(loader)
+    loader.request("first.jpg", QSize(10, 10))
+    loader.request("first.jpg", QSize(10, 10))   # already decoding: not queued twice
+    loader.request("second.jpg", QSize(10, 10))
+    load.release.set()
+    assert wait_for(lambda: qapp.processEvents() or not loader.pending)
+    assert shown == [("second.jpg", 10, 10)]
+    assert sorted(load.calls) == [("first.jpg", 10, 10), ("second.jpg", 10, 10)]
+
+
+def test_ready_images_are_bounded(qapp):
+    loader = ImageLoader(load_function=CountingLoad())
+    for i in range(MAX_READY_IMAGES + 2):
+        loader.prefetch(f"{i}.jpg", QSize(8, 8))
+        assert wait_for(lambda: qapp.processEvents() or not loader.pending)
+    assert [key[0] for key in loader.ready] == [f"{i}.jpg" for i in range(2, MAX_READY_IMAGES + 2)]
@@ -0,0 +1,31 @@
+from PyQt5.QtWidgets import QMainWindow, QWidget
+
+from main_controller import navigate_back, navigate_to
+
+
+class Router(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def show_page(self, name):
+        self.calls.append(("show", name))
+
+    def go_back(self):
+        self.calls.append(("back",))
+
+
+def test_pages_route_through_the_shell(qapp):
+    router = Router()
+    page = QWidget(router)
+    assert navigate_to(page, "gallery")
+    navigate_back(page)
+    assert router.calls == [("show", "gallery"), ("back",)]
+
+
+def test_standalone_screens_close_themselves(qapp):
+    screen = QMainWindow()
+    screen.show()
+    assert not navigate_to(screen, "gallery")
+    navigate_back(screen)
+    assert not screen.isVisible()
@@ -0,0 +1,45 @@
+import os
+import time
+
+import media_paths
+from media_index import MediaIndex, parse_media_name
+
+WHEN = time.mktime(time.strptime("20261018_120032", "%Y%m%d_%H%M%S")) + 0.318
+
+
+def test_plain_and_burst_names():
+    assert parse_media_name("snap_P-12_20261018_120032_318.jpg", 0) == (WHEN, "P-12")
+    assert parse_media_name("snap_20261018_120032_318_b03.jpg", 0) == (WHEN, None)
+
+
+def test_event_recording_names():
+    name = "rec_P-12_20261018_120032_318_ev20261018120032318.mp4"
+    assert parse_media_name(name, 0) == (WHEN, "P-12")
+
+
+def test_pre_event_clip_names():
+    assert parse_media_name("event_P-12_20261018_120032_318_ev20261018120032318_pre.mp4", 0) == (WHEN, "P-12")
+    assert parse_media_name("event_20261018_120032_318_ev20261018120032318_pre.mp4", 0) == (WHEN, None)
+    assert parse_media_name("event_20261018_120032_318_pre.mp4", 0) == (WHEN, None)
+
+
+def test_unknown_names_fall_back():
+    assert parse_media_name("holiday.jpg", 5.0) == (5.0, None)
+
+
+def test_event_media_is_indexed_by_patient_and_time(tmp_path):
+    event_id = media_paths.event_id(WHEN)
+    names = [
+        media_paths.media_name("rec", "mp4", "P-12", WHEN, f"_{event_id}"),
+        media_paths.media_name("event", "mp4", "P-12", WHEN, f"_{event_id}_pre"),
+    ]
+    for name in names:
+        (tmp_path / name).write_bytes(b"\0" * 16)
+    index = MediaIndex(str(tmp_path / "index.db"))
+    try:
+        assert index.scan([str(tmp_path)]) == 2
+        items = index.page(0, 10)
+    finally:
+        index.close()
+    assert sorted(os.path.basename(item.path) for item in items) == sorted(names)
+    assert all(item.patient == "P-12" and item.timestamp == WHEN for item in items)
@@ -0,0 +1,64 @@
+import json
+import base64
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mjpeg_server import MjpegServer, is_loopback
+
+TOKEN = "ward-3-preview"
+
+
+@pytest.fixture
+def server():
+    server = MjpegServer("127.0.0.1", 0, token=TOKEN)
+    server.start()
+    yield server
+    server.stop(2.0)
+
+
+def get(server, path, headers=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}", headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_requests_without_the_token_are_refused(server):
+    status, _ = get(server, "/stats")
+    assert status == 401
+    assert get(server, "/stats", {"Authorization": "Bearer wrong"})[0] == 401
+    assert get(server, "/snapshot.jpg?token=wrong")[0] == 401
+
+
+def test_token_by_header_basic_auth_or_query(server):
+    status, body = get(server, "/stats", {"Authorization": f"Bearer {TOKEN}"})
+    assert status == 200 and json.loads(body)["clients"] == 0
+    basic = base64.b64encode(f"nurse:{TOKEN}".encode()).decode()
+    assert get(server, "/stats", {"Authorization": f"Basic {basic}"})[0] == 200
+    status, body = get(server, f"/?token={TOKEN}")
+    assert status == 200 and f'src="/stream?token={TOKEN}"'.encode() in body
+
+
+def test_refuses_to_serve_the_network_without_a_token():
+    with pytest.raises(PermissionError):
+        MjpegServer("0.0.0.0", 0).start()
+    with pytest.raises(PermissionError):
+        MjpegServer("ward-station.local", 0).start()
+
+
+def test_loopback_without_token_is_open():
+    server = MjpegServer("127.0.0.1", 0)
+    server.start()
+    try:
+        assert get(server, "/stats")[0] == 200
+    finally:
+        server.stop(2.0)
+
+
+def test_is_loopback():
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0") and not is_loopback("") and not is_loopback("10.0.0.5")
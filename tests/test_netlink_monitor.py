@@ -0,0 +1,47 @@
+import struct
+
+from netlink_monitor import NLMSG_DONE, NLMSG_HEADER, parse_messages
+
+IFINFOMSG = struct.Struct("=BxHiII")  # family, type, index, flags, change
+RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_GETLINK = 16, 17, 20, 18
+
+
+def message(msg_type, payload=None, seq=1):
+    """One nlmsghdr + payload, padded to NLMSG_ALIGN."""
+    if payload is None:
+        payload = IFINFOMSG.pack(0, 1, 2, 0x1043, 0xFFFFFFFF)
+    payload += b"\0" * (-len(payload) % 4)
+    return NLMSG_HEADER.pack(NLMSG_HEADER.size + len(payload), msg_type, 0, seq, 0) + payload
+
+
+def test_one_datagram_can_carry_several_messages():
+    data = message(RTM_NEWLINK) + message(RTM_NEWADDR, b"\x02\x18\x00\x00\x02\x00\x00\x00") + message(RTM_DELLINK)
+    assert parse_messages(data) == ["RTM_NEWLINK", "RTM_NEWADDR", "RTM_DELLINK"]
+
+
+def test_unwatched_messages_are_skipped():
+    assert parse_messages(message(RTM_GETLINK) + message(RTM_NEWLINK)) == ["RTM_NEWLINK"]
+
+
+def test_unaligned_payloads_are_padded():
+    assert parse_messages(message(RTM_NEWADDR, b"\x02\x18\x00") + message(RTM_DELLINK)) == ["RTM_NEWADDR", "RTM_DELLINK"]
+
+
+def test_parsing_stops_at_done():
+    data = message(RTM_NEWLINK) + message(NLMSG_DONE, b"\0\0\0\0") + message(RTM_DELLINK)
+    assert parse_messages(data) == ["RTM_NEWLINK"]
+
+
+def test_truncated_datagrams():
+    whole = message(RTM_NEWLINK) + message(RTM_DELLINK)
+    assert parse_messages(b"") == []
+    assert parse_messages(whole[:NLMSG_HEADER.size - 1]) == []           # partial header
+    assert parse_messages(whole[:NLMSG_HEADER.size + 4]) == []           # partial payload
+    assert parse_messages(whole[:-4]) == ["RTM_NEWLINK"]                 # second one cut short
+
+
+def test_a_bogus_length_does_not_loop():
+    short = NLMSG_HEADER.pack(4, RTM_NEWLINK, 0, 1, 0) + message(RTM_DELLINK)
+    assert parse_messages(short) == []
+    huge = NLMSG_HEADER.pack(1 << 20, RTM_NEWLINK, 0, 1, 0) + IFINFOMSG.pack(0, 1, 2, 0, 0)
+    assert parse_messages(huge) == []
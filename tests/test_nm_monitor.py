@@ -0,0 +1,77 @@
+from helpers import fixture_text
+from nm_monitor import NetworkStateParser, NetworkStateMonitor
+
+
+def feed_all(parser, name):
+    return [line for line in fixture_text(name).splitlines() if parser.feed(line)]
+
+
+def test_seed_devices():
+    parser = NetworkStateParser()
+    parser.seed_devices(fixture_text("nmcli_device_list.txt"))
+    devices = parser.state.devices
+    assert devices["wlp2s0"] == {"type": "wifi", "state": "connected", "connection": "Ward 3"}
+    assert devices["enp3s0"] == {"type": "ethernet", "state": "unavailable", "connection": None}
+    assert devices["lo"]["state"] == "connected"
+    assert devices["wlp3s0"] == {"type": "wifi", "state": "connecting", "connection": "Nurse:Station"}
+    assert parser.state.active_ssid == "Ward 3"
+
+
+def test_successful_connect():
+    parser = NetworkStateParser()
+    feed_all(parser, "nmcli_monitor_connect.txt")
+    state = parser.state
+    assert state.devices["wlp2s0"] == {"type": None, "state": "connected", "connection": "Ward 3"}
+    assert state.active_ssid == "Ward 3"
+    assert state.primary_connection == "Ward 3"
+    assert state.nm_state == "connected"
+    assert state.online is True
+    assert state.last_failure is None
+
+
+def test_repeated_connecting_lines_are_not_changes():
+    parser = NetworkStateParser()
+    assert parser.feed("wlp2s0: connecting (prepare)")
+    assert not parser.feed("wlp2s0: connecting (configuring)")
+
+
+def test_failed_connect_is_reported():
+    parser = NetworkStateParser()
+    parser.seed_devices("wlp2s0:wifi:disconnected:\n")
+    changed = feed_all(parser, "nmcli_monitor_wrong_password.txt")
+    assert "wlp2s0: connection failed" in changed
+    state = parser.state
+    assert state.last_failure == {
+        "device": "wlp2s0",
+        "connection": "Ward3",
+        "reason": "(7) Secrets were required, but not provided.",
+    }
+    assert state.devices["wlp2s0"] == {"type": "wifi", "state": "disconnected", "connection": None}
+    assert state.active_ssid is None
+    assert state.online is False
+    # A profile event is not a device.
+    assert "Ward3" not in state.devices
+
+
+def test_device_lifecycle():
+    parser = NetworkStateParser()
+    feed_all(parser, "nmcli_monitor_devices.txt")
+    assert set(parser.state.devices) == {"p2p-dev-wlp2s0", "enp3s0"}
+
+
+def test_unknown_lines_are_ignored():
+    parser = NetworkStateParser()
+    assert not parser.feed("")
+    assert not parser.feed("Hostname is now 'droid-7'")
+    assert not parser.feed("wlp2s0: something new in nmcli 2.0")
+    assert parser.state.devices == {}
+
+
+def test_monitor_emits_snapshots_for_changes(qapp):
+    monitor = NetworkStateMonitor(command=None, seed_command=None)
+    snapshots = []
+    monitor.state_changed.connect(snapshots.append)
+    monitor.feed_lines(fixture_text("nmcli_monitor_wrong_password.txt").splitlines())
+    qapp.processEvents()
+    assert snapshots[-1]["last_failure"]["connection"] == "Ward3"
+    assert snapshots[-1]["active_ssid"] is None
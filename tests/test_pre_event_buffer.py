@@ -0,0 +1,35 @@
+import os
+import time
+
+import numpy as np
+
+import media_paths
+from camera_capture import Frame
+from pre_event_buffer import PreEventBuffer
+from helpers import SlowWriter, wait_for
+
+
+def test_camera_page_buffers_nothing_unless_configured(camera_screen):
+    assert camera_screen.pre_event is None
+    assert not camera_screen.control_buttons["Mark Event"].isEnabled()
+
+
+def test_event_clip_carries_the_event_id(qapp, tmp_path):
+    buffer = PreEventBuffer(seconds=5, output_dir=str(tmp_path), writer_factory=SlowWriter)
+    saved = []
+    buffer.event_saved.connect(saved.append)
+    buffer.start()
+    try:
+        image = np.zeros((48, 64, 3), np.uint8)
+        now = time.monotonic()
+        for seq in range(5):
+            buffer.push(Frame(seq, image, now + seq / 10))
+            assert wait_for(lambda: buffer.encoded == seq + 1)
+        event_id = media_paths.event_id()
+        assert buffer.trigger("P-7", event_id)
+        assert wait_for(lambda: buffer.events)
+    finally:
+        buffer.stop(1.0)
+    name = os.path.basename(buffer.events[0])
+    assert name.startswith("event_P-7_")
+    assert name.endswith(f"_{event_id}_pre.mp4")
@@ -0,0 +1,83 @@
+import sys
+import time
+
+import pytest
+
+import screen_registry
+from screen_registry import ScreenSpec
+
+
+@pytest.fixture
+def fake_screen(tmp_path, monkeypatch):
+    """A screen module in its own file with a slow "heavy" dependency."""
+    tag = f"{id(tmp_path):x}"
+    dep, module = f"droid_test_heavy_{tag}", f"droid_test_screen_{tag}"
+    (tmp_path / f"{dep}.py").write_text("import time\ntime.sleep(0.05)\n")
+    screen_file = tmp_path / "screen.py"
+    screen_file.write_text(f"import {dep}\n\nclass Page:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(screen_registry.SCREENS, "fake", ScreenSpec(module, "Page", (dep,), str(screen_file)))
+    monkeypatch.setattr(screen_registry, "import_times", {})
+    monkeypatch.setattr(screen_registry, "dependency_times", {})
+    yield module, dep
+    sys.modules.pop(module, None)
+    sys.modules.pop(dep, None)
+
+
+def test_screens_are_imported_on_first_use(fake_screen):
+    module, dep = fake_screen
+    assert module not in sys.modules and dep not in sys.modules
+
+    page_class = screen_registry.load_screen_class("fake")
+    assert page_class.__name__ == "Page"
+    assert module in sys.modules and dep in sys.modules
+    times = screen_registry.import_report()
+    assert times["screens"]["fake"]["deps_ms"] >= 40
+    assert times["dependencies"][dep] >= 40
+
+    # Opening it again reuses the module and keeps the first timing.
+    first = dict(times["screens"]["fake"])
+    assert screen_registry.load_screen_class("fake") is page_class
+    assert screen_registry.import_report()["screens"]["fake"] == first
+
+
+def test_over_budget_imports_warn(fake_screen, monkeypatch, capsys):
+    monkeypatch.setattr(screen_registry, "IMPORT_BUDGET_MS", 10)
+    screen_registry.load_screen_class("fake")
+    assert "Opening 'fake' spent" in capsys.readouterr().out
+
+
+def test_prewarm_imports_only_the_dependencies(fake_screen):
+    module, dep = fake_screen
+    screen_registry.prewarm(["fake"]).join(5)
+    assert dep in sys.modules
+    assert module not in sys.modules
+
+    # The screen itself is then cheap to open.
+    start = time.perf_counter()
+    screen_registry.load_screen_class("fake")
+    assert (time.perf_counter() - start) * 1000 < 40
+    assert screen_registry.import_report()["screens"]["fake"]["deps_ms"] == 0
+
+
+def test_prewarm_leaves_qt_modules_to_the_gui_thread(monkeypatch):
+    imported = []
+    monkeypatch.setattr(screen_registry, "_import_timed", imported.append)
+    screen_registry.prewarm(["robot_arm", "camera"]).join(5)
+    assert imported == ["numpy", "cv2"]
+
+
+def test_a_broken_screen_file_can_be_retried(tmp_path, monkeypatch):
+    screen_file = tmp_path / "broken.py"
+    screen_file.write_text("raise ImportError('missing dependency')\n")
+    module = f"droid_test_broken_{id(tmp_path):x}"
+    monkeypatch.setitem(screen_registry.SCREENS, "broken", ScreenSpec(module, "Page", (), str(screen_file)))
+    with pytest.raises(ImportError):
+        screen_registry.load_screen_class("broken")
+    assert module not in sys.modules
+
+    screen_file.write_text("class Page:\n    pass\n")
+    try:
+        assert screen_registry.load_screen_class("broken").__name__ == "Page"
+    finally:
+        sys.modules.pop(module, None)
@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+
+from camera_capture import Frame
+from snapshot_writer import SnapshotWriter
+
+
+def test_cancel_ends_a_burst_with_the_frames_taken(qapp, tmp_path):
+    writer = SnapshotWriter(output_dir=str(tmp_path))
+    finished = []
+    writer.burst_finished.connect(finished.append)
+    assert writer.burst(5, 0, "P-7")
+    writer.on_frame(Frame(1, np.zeros((48, 64, 3), np.uint8), 1.0))
+    writer.on_frame(Frame(2, np.zeros((48, 64, 3), np.uint8), 2.0))
+    assert writer.cancel_burst()
+    assert writer.wait(5000)
+    qapp.processEvents()
+
+    assert len(finished) == 1
+    assert [os.path.basename(path)[-8:] for path in finished[0]] == ["_b01.jpg", "_b02.jpg"]
+    assert not writer.is_bursting()
+    assert writer.burst(1, 0)
+
+
+def test_cancel_without_frames_still_finishes(qapp, tmp_path):
+    writer = SnapshotWriter(output_dir=str(tmp_path))
+    finished = []
+    writer.burst_finished.connect(finished.append)
+    assert writer.burst(3, 100)
+    assert writer.cancel_burst()
+    assert finished == [[]]
+    assert not writer.cancel_burst()
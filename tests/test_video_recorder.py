@@ -0,0 +1,67 @@
+import os
+import time
+
+from helpers import SlowWriter, frames, wait_for
+from video_recorder import VideoRecorder
+
+
+def test_stop_and_restart_do_not_wait_for_the_writer(qapp, tmp_path):
+    recorder = VideoRecorder(output_dir=str(tmp_path), writer_factory=SlowWriter, patient_id="P-7")
+    states = []
+    recorder.recording_changed.connect(states.append)
+    recorder.start()
+    for frame in frames(10):
+        recorder.push(frame)
+
+    started = time.monotonic()
+    recorder.stop(0)
+    recorder.start()
+    assert time.monotonic() - started < 0.05
+    assert recorder.is_recording()
+    for frame in frames(3, start=10.0):
+        recorder.push(frame)
+    recorder.stop()
+
+    assert wait_for(lambda: len(recorder.segments) == 2)
+    assert recorder.written == 13
+    assert all(os.path.basename(path).startswith("rec_P-7_") for path in recorder.segments)
+    qapp.processEvents()
+    # The first writer finished after the second recording had started.
+    assert states == [True, True, False]
+
+
+def test_tag_cuts_at_the_first_frame_after_the_event(qapp, tmp_path):
+    recorder = VideoRecorder(output_dir=str(tmp_path), writer_factory=SlowWriter)
+    recorder.start()
+    # Queued behind a slow writer, so still waiting when the event comes.
+    for frame in frames(5):
+        recorder.push(frame)
+    recorder.tag("ev20261018120000000", timestamp=3 / 30)
+    for frame in frames(3, start=1.0):
+        recorder.push(frame)
+    recorder.stop()
+
+    names = [os.path.basename(path) for path in recorder.segments]
+    assert len(names) == 2
+    assert not names[0].endswith("_ev20261018120000000.mp4")
+    assert names[1].endswith("_ev20261018120000000.mp4")
+    sizes = [os.path.getsize(path) for path in recorder.segments]
+    assert sizes == [3, 5]  # SlowWriter writes one byte per frame
+
+
+def test_tag_leaves_a_draining_writer_alone(qapp, tmp_path):
+    recorder = VideoRecorder(output_dir=str(tmp_path), writer_factory=SlowWriter)
+    recorder.start()
+    for frame in frames(5):
+        recorder.push(frame)
+    recorder.stop(0)
+    recorder.start()
+    recorder.tag("ev20261018120000000", timestamp=0.0)
+    for frame in frames(2, start=10.0):
+        recorder.push(frame)
+    recorder.stop()
+
+    assert wait_for(lambda: len(recorder.segments) == 2)
+    tagged = [path for path in recorder.segments if path.endswith("_ev20261018120000000.mp4")]
+    assert len(tagged) == 1
+    assert os.path.getsize(tagged[0]) == 2
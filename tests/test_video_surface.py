@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from PyQt5.QtCore import QPoint, QRect, QSize
+from PyQt5.QtGui import QColor, QImage
+
+from video_surface import HAS_BGR888, VideoSurface, aspect_fit
+
+bgr888 = pytest.mark.skipif(not HAS_BGR888, reason="Qt without QImage.Format_BGR888")
+
+
+def bgr_frame(width, height, bgr):
+    frame = np.empty((height, width, 3), np.uint8)
+    frame[:] = bgr
+    return frame
+
+
+def paint(surface):
+    target = QImage(surface.size(), QImage.Format_RGB32)
+    target.fill(QColor("white"))
+    surface.render(target, QPoint())
+    return target
+
+
+def test_aspect_fit_centres_the_frame():
+    assert aspect_fit(QSize(640, 480), QRect(0, 0, 800, 480)) == QRect(80, 0, 640, 480)
+    assert aspect_fit(QSize(1280, 720), QRect(0, 0, 640, 480)) == QRect(0, 60, 640, 360)
+
+
+@bgr888
+def test_bgr_frames_are_shown_without_a_copy(qapp):
+    surface = VideoSurface(smooth=False)
+    surface.resize(64, 48)
+    frame = bgr_frame(64, 48, (255, 0, 0))      # blue, in OpenCV's order
+    surface.set_frame(frame)
+    assert surface._image.format() == QImage.Format_BGR888
+    assert surface._frame is frame
+    assert int(surface._image.constBits()) == frame.ctypes.data
+    assert paint(surface).pixelColor(10, 10) == QColor(0, 0, 255)
+
+
+@bgr888
+def test_crops_are_wrapped_in_place(qapp):
+    surface = VideoSurface(smooth=False)
+    surface.resize(40, 20)
+    frame = bgr_frame(100, 60, (0, 0, 255))
+    frame[10:30, 20:60] = (0, 255, 0)
+    crop = frame[10:30, 20:60]
+    surface.set_frame(crop)
+    assert surface._frame is crop                # row stride of the full frame
+    assert surface._image.bytesPerLine() == 100 * 3
+    assert paint(surface).pixelColor(20, 10) == QColor(0, 255, 0)
+
+
+@bgr888
+def test_layouts_qimage_cannot_describe_are_copied_once(qapp):
+    surface = VideoSurface(smooth=False)
+    surface.resize(32, 24)
+    frame = bgr_frame(64, 24, (0, 255, 255))    # yellow
+    surface.set_frame(frame[:, ::2])             # every other column
+    buffer = surface._frame
+    assert buffer is not frame and buffer.flags.c_contiguous
+    surface.set_frame(frame[:, 1::2])
+    assert surface._frame is buffer              # reused for the same size
+    assert paint(surface).pixelColor(5, 5) == QColor(255, 255, 0)
+
+
+@bgr888
+def test_smooth_scaling_letterboxes_and_keeps_colours(qapp):
+    surface = VideoSurface(smooth=True)
+    surface.resize(200, 200)
+    surface.set_frame(bgr_frame(40, 20, (255, 0, 0)))
+    assert surface.frame_rect() == QRect(0, 50, 200, 100)
+    painted = []
+    surface.frame_painted.connect(painted.append)
+    image = paint(surface)
+    assert image.pixelColor(100, 100) == QColor(0, 0, 255)
+    assert image.pixelColor(100, 10) == QColor("black")      # letterbox bar
+    assert surface.scaled_image(surface.frame_rect()).size() == QSize(200, 100)
+    assert len(painted) == 1
+
+    paint(surface)
+    assert len(painted) == 1                     # reported once per frame
+    assert surface.paint_stats()["frames"] == 1
+
+
+def test_no_frame_paints_the_background(qapp):
+    surface = VideoSurface()
+    surface.resize(20, 20)
+    assert paint(surface).pixelColor(5, 5) == QColor("black")
+    surface.set_frame(bgr_frame(20, 20, (0, 255, 0)))
+    surface.clear()
+    assert surface.frame_rect().isNull()
+    assert paint(surface).pixelColor(5, 5) == QColor("black")
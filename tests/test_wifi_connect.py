@@ -0,0 +1,83 @@
+import time
+
+from wifi_connect import (WifiConnector, FakeBackend, NmcliBackend, ASSOCIATING, AUTHENTICATING, DHCP,
+                          ONLINE, PASSWORD_REQUIRED, PASSWORD_REJECTED, is_auth_failure)
+from wifi_scanner import WifiNetwork
+
+WARD = WifiNetwork("Ward 3", 70, "WPA2", False, "aa:bb:cc:dd:ee:01")
+
+
+def attempt(qapp, connector, network, password=None, timeout=5.0):
+    stages, results = [], []
+    connector.stage_changed.connect(stages.append)
+    connector.finished.connect(lambda ok, message: results.append((ok, message)))
+    assert connector.connect_to(network, password)
+    end = time.monotonic() + timeout
+    while not results and time.monotonic() < end:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return stages, results
+
+
+def test_connects_with_the_right_password(qapp):
+    backend = FakeBackend(step=0.01, password="s3cret")
+    stages, results = attempt(qapp, WifiConnector(backend), WARD, "s3cret")
+    assert results == [(True, "Connected")]
+    assert stages == [ASSOCIATING, AUTHENTICATING, DHCP, ONLINE]
+    assert backend.attempts == [("Ward 3", "s3cret")]
+
+
+def test_wrong_password_fails_at_authentication(qapp):
+    backend = FakeBackend(step=0.01, password="s3cret")
+    stages, results = attempt(qapp, WifiConnector(backend), WARD, "guess")
+    assert results == [(False, PASSWORD_REJECTED)]
+    assert stages == [ASSOCIATING, AUTHENTICATING]
+
+
+def test_a_saved_profile_with_a_bad_key_is_dropped_and_asked_again(qapp):
+    backend = FakeBackend(step=0.01, password="new", saved_profiles={"Ward 3": "old"})
+    _, results = attempt(qapp, WifiConnector(backend), WARD)
+    assert results == [(False, PASSWORD_REJECTED)]
+    assert not backend.has_saved_profile("Ward 3")
+
+    _, results = attempt(qapp, WifiConnector(backend), WARD)
+    assert results == [(False, PASSWORD_REQUIRED)]
+    _, results = attempt(qapp, WifiConnector(backend), WARD, "new")
+    assert results == [(True, "Connected")]
+    assert backend.saved_profiles == {"Ward 3": "new"}
+
+
+def test_auth_failures_are_recognised():
+    assert is_auth_failure("Error: Connection activation failed: (7) Secrets were required, but not provided.")
+    assert is_auth_failure("Error: Connection activation failed: no-secrets")
+    assert not is_auth_failure("Error: No network with SSID 'Ward 3' found.")
+    assert not is_auth_failure("Timed out")
+
+
+def test_times_out(qapp):
+    connector = WifiConnector(FakeBackend(step=0.2), timeout=0.3)
+    stages, results = attempt(qapp, connector, WARD, "s3cret")
+    assert results == [(False, "Timed out")]
+    assert ONLINE not in stages
+    assert not connector.is_busy()
+
+
+def test_secured_network_without_profile_asks_for_a_password(qapp):
+    backend = FakeBackend(step=0.01)
+    _, results = attempt(qapp, WifiConnector(backend), WARD)
+    assert results == [(False, PASSWORD_REQUIRED)]
+    assert backend.attempts == []
+
+
+def test_nmcli_password_is_not_on_the_command_line():
+    backend = NmcliBackend()
+    backend.has_saved_profile = lambda ssid: False
+    command, stdin = backend.command("Ward 3", "s3cret", 30)
+    assert "s3cret" not in " ".join(command)
+    assert "--ask" in command
+    assert stdin == "s3cret\n"
+
+    backend.has_saved_profile = lambda ssid: True
+    command, stdin = backend.command("Ward 3", None, 30)
+    assert command[-4:] == ["connection", "up", "id", "Ward 3"]
+    assert stdin is None
@@ -0,0 +1,85 @@
+import pytest
+from PyQt5.QtTest import QAbstractItemModelTester
+
+from wifi_network_model import WifiNetworkModel
+from wifi_scanner import WifiNetwork
+
+
+def net(ssid, signal, active=False):
+    return WifiNetwork(ssid, signal, "WPA2", active, "")
+
+
+class Recorder:
+    """Collects the model's change signals as (name, first, last) tuples."""
+
+    def __init__(self, model):
+        self.events = []
+        model.rowsInserted.connect(lambda parent, first, last: self.events.append(("insert", first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.events.append(("remove", first, last)))
+        model.rowsMoved.connect(lambda parent, start, end, dest, row: self.events.append(("move", start, row)))
+        model.dataChanged.connect(lambda top, bottom: self.events.append(("changed", top.row(), bottom.row())))
+        model.modelReset.connect(lambda: self.events.append(("reset",)))
+
+    def take(self):
+        events, self.events = self.events, []
+        return events
+
+
+@pytest.fixture
+def model(qapp):
+    model = WifiNetworkModel()
+    # Fails the test on any inconsistent begin/end or index bookkeeping.
+    model.tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    model.set_networks([net("A", 90), net("B", 60), net("C", 30)])
+    model.recorder = Recorder(model)
+    return model
+
+
+def ssids(model):
+    return [n.ssid for n in model.networks()]
+
+
+def test_signal_strength_only_updates_are_data_changes(model):
+    model.set_networks([net("A", 85), net("B", 60), net("C", 31)])
+    assert model.recorder.take() == [("changed", 0, 0), ("changed", 2, 2)]
+    assert model.network_at(2).signal == 31
+
+    model.set_networks([net("A", 85), net("B", 60), net("C", 31)])
+    assert model.recorder.take() == []
+
+
+def test_reorder_moves_rows(model):
+    model.set_networks([net("A", 90), net("B", 60), net("C", 95)])
+    events = model.recorder.take()
+    assert ("move", 2, 0) in events
+    assert not any(e[0] in ("insert", "remove", "reset") for e in events)
+    assert ssids(model) == ["C", "A", "B"]
+
+
+def test_connected_network_moves_to_the_top(model):
+    model.set_networks([net("A", 90), net("B", 60), net("C", 30, active=True)])
+    assert ssids(model) == ["C", "A", "B"]
+    assert model.current_ssid() == "C"
+    assert not any(e[0] in ("insert", "remove", "reset") for e in model.recorder.take())
+
+
+def test_removal(model):
+    model.set_networks([net("A", 90), net("C", 30)])
+    assert model.recorder.take() == [("remove", 1, 1)]
+    assert ssids(model) == ["A", "C"]
+
+
+def test_insertion(model):
+    model.set_networks([net("A", 90), net("B", 60), net("D", 50), net("C", 30)])
+    assert model.recorder.take() == [("insert", 2, 2)]
+    assert ssids(model) == ["A", "B", "D", "C"]
+
+
+def test_mixed_scan(model):
+    model.set_networks([net("D", 99), net("C", 70), net("A", 40), net("", 80), net("C", 70)])
+    assert ssids(model) == ["D", "C", "A"]
+    events = model.recorder.take()
+    assert ("remove", 1, 1) in events
+    assert ("insert", 0, 0) in events
+    assert ("reset",) not in events
+    assert model.rowCount() == 3
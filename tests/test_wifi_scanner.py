@@ -0,0 +1,32 @@
+from helpers import fixture_text
+from wifi_scanner import WifiNetwork, split_terse, parse_nmcli_wifi, dedupe_by_ssid
+
+
+def test_split_terse_unescapes():
+    assert split_terse(r"no:Nurse\:Station:AA\:BB:70:WPA2") == ["no", "Nurse:Station", "AA:BB", "70", "WPA2"]
+    assert split_terse(r"Lab\\Net:") == ["Lab\\Net", ""]
+
+
+def test_parse_nmcli_wifi():
+    networks = parse_nmcli_wifi(fixture_text("nmcli_wifi_list.txt"))
+    assert len(networks) == 9  # the malformed line is skipped
+    assert networks[0] == WifiNetwork("Ward 3", 82, "WPA2", True, "AA:BB:CC:00:00:01")
+    assert networks[3] == WifiNetwork("Nurse:Station", 70, "WPA1 WPA2", False, "AA:BB:CC:00:00:10")
+    assert networks[4].ssid == ""  # hidden
+    assert networks[5].security == ""  # open
+    assert networks[6].ssid == "Lab\\Net"
+    assert networks[8].signal is None
+
+
+def test_dedupe_keeps_strongest_bssid_and_active_flag():
+    networks = dedupe_by_ssid(parse_nmcli_wifi(fixture_text("nmcli_wifi_list.txt")))
+    assert [n.ssid for n in networks] == ["Ward 3", "Nurse:Station", "Guest", "Lab\\Net", "Printer"]
+    ward = networks[0]
+    # Strongest BSSID wins, but the SSID stays active through the one we're on.
+    assert (ward.bssid, ward.signal, ward.active) == ("AA:BB:CC:00:00:03", 91, True)
+    assert networks[2].bssid == "AA:BB:CC:00:00:31"
+
+
+def test_dedupe_drops_hidden_networks():
+    hidden = WifiNetwork("", 99, "WPA2", False, "AA:BB:CC:00:00:20")
+    assert dedupe_by_ssid([hidden]) == []
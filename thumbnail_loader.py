@@ -0,0 +1,170 @@
+import os
+import threading
+from collections import deque
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+
+import asset_cache
+from media_index import IMAGE_EXTENSIONS
+
+THUMB_DIR = os.environ.get(
+    "DROID_THUMB_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "droid_gui", "thumbnails"),
+)
+THUMB_SIZE = QSize(160, 120)
+# The thumbnail directory is trimmed least-recently-used first past this.
+MAX_THUMB_CACHE_BYTES = 64 * 1024 * 1024
+# ... checked every this many new thumbnails rather than on each one.
+EVICT_EVERY = 32
+THUMB_THREADS = 2
+# Requests beyond this many are forgotten (oldest first): after a fast
+# scroll only the cells now on screen are still worth decoding.
+MAX_PENDING = 64
+
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def video_frame(path, size):
+    """A frame from early in the video, scaled to fit ``size``."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        if frames > 10:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(frames * 0.1))
+        ok, frame = cap.read()
+    finally:
+        cap.release()
+    if not ok:
+        return QImage()
+    h, w = frame.shape[:2]
+    target = QSize(w, h).scaled(size, Qt.KeepAspectRatio)
+    frame = cv2.resize(frame, (target.width(), target.height()), interpolation=cv2.INTER_AREA)
+    return QImage(frame.data, target.width(), target.height(), frame.strides[0], QImage.Format_BGR888).copy()
+
+
+def load_thumbnail(path, size=THUMB_SIZE):
+    """Thumbnail for an image or video, through the on-disk cache. Safe to
+    call from worker threads."""
+    key = asset_cache.cache_key(path, size)
+    if key is None:
+        return QImage()
+    cache_file = os.path.join(THUMB_DIR, key + ".jpg")
+    if os.path.exists(cache_file):
+        image = QImage(cache_file)
+        if not image.isNull():
+            try:
+                os.utime(cache_file)  # mark as recently used for eviction
+            except OSError:
+                pass
+            return image
+
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        image = asset_cache.build_derivative(path, size)
+    else:
+        image = video_frame(path, size)
+    if image.isNull():
+        return image
+    try:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if image.save(tmp_file, "JPG", 85):
+            os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠ Could not write thumbnail cache: {e}")
+        return image
+    _written()
+    return image
+
+
+def _written():
+    global _writes
+    with _writes_lock:
+        _writes += 1
+        due = _writes % EVICT_EVERY == 0
+    if due:
+        asset_cache.evict(MAX_THUMB_CACHE_BYTES, THUMB_DIR)
+
+
+# ================== Worker ==================
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    """Takes the newest pending path rather than a fixed one, so the cells
+    the user is looking at now are decoded first."""
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        path = self.loader._pop()
+        if path is None:
+            return
+        image = self.loader.load_function(path, self.loader.size)
+        try:
+            self.loader.signals.loaded.emit(path, image)
+        except RuntimeError:
+            pass  # loader deleted while decoding
+
+
+# ================== Thumbnail Loader ==================
+class ThumbnailLoader(QObject):
+    """Generates thumbnails on demand on a small private thread pool.
+
+    ``request(path)`` is cheap and idempotent; ``thumbnail_ready`` fires on
+    the GUI thread when the image is available. Pending requests are served
+    newest first and capped at MAX_PENDING.
+    """
+    thumbnail_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, size=THUMB_SIZE, load_function=load_thumbnail, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.load_function = load_function
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(THUMB_THREADS)
+        self.signals = _ThumbnailSignals(self)
+        self.signals.loaded.connect(self._on_loaded)
+
+        self.generated = 0
+        self._pending = deque()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def request(self, path):
+        with self._lock:
+            if path in self._in_flight:
+                return
+            try:
+                # Already queued: just move it to the front of the line.
+                self._pending.remove(path)
+                self._pending.append(path)
+                return
+            except ValueError:
+                pass
+            self._pending.append(path)
+            while len(self._pending) > MAX_PENDING:
+                self._pending.popleft()
+        self.pool.start(_ThumbnailTask(self))
+
+    def clear_pending(self):
+        with self._lock:
+            self._pending.clear()
+
+    def _pop(self):
+        with self._lock:
+            if not self._pending:
+                return None
+            path = self._pending.pop()
+            self._in_flight.add(path)
+            return path
+
+    def _on_loaded(self, path, image):
+        with self._lock:
+            self._in_flight.discard(path)
+        self.generated += 1
+        self.thumbnail_ready.emit(path, image)
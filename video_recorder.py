@@ -0,0 +1,193 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import cv2
+
+import media_paths
+
+SEGMENT_SECONDS = 60.0
+# Backlog cap in bytes of raw frames: ~10 frames at 1080p, ~22 at 720p.
+QUEUE_BYTES = 64 * 1024 * 1024
+DEFAULT_FPS = 30.0
+FOURCC = "mp4v"
+EXTENSION = "mp4"
+
+
+# ================== Video Recorder ==================
+class VideoRecorder(QObject):
+    """Encodes camera frames to segment files on a writer thread.
+
+    ``push(frame)`` (a camera_capture.Frame) never blocks: it is called
+    from the capture thread, and when the backlog would exceed
+    ``queue_bytes`` the frame is dropped and counted instead. A new segment starts every
+    ``segment_seconds`` of footage or when the frame size changes. The open
+    segment is written to ``*.part.mp4`` and renamed when it is closed, so a
+    crash loses at most that one segment.
+    ``segment_finished(str)`` is emitted with each completed file and
+    ``recording_changed(bool)`` when the writer starts or stops (including
+    after a write error).
+
+    ``tag(event_id)`` starts a new segment at the first frame captured at
+    or after the event; its name, like every segment after it, carries the
+    event id (see PreEventBuffer.trigger). ``event_id`` set before
+    ``start()`` names the recording's segments from the start.
+
+    ``stop(0)`` returns at once: each recording has its own queue and
+    writer thread, which drains and closes its segment by itself, even if
+    a new recording has started meanwhile. Writers aren't daemon threads,
+    so the last segment is still closed when the app exits.
+    """
+    segment_finished = pyqtSignal(str)
+    recording_changed = pyqtSignal(bool)
+
+    def __init__(self, output_dir=None, fps=DEFAULT_FPS, segment_seconds=SEGMENT_SECONDS,
+                 queue_bytes=QUEUE_BYTES, fourcc=FOURCC, writer_factory=cv2.VideoWriter,
+                 patient_id=None, event_id=None, parent=None):
+        super().__init__(parent)
+        self.output_dir = output_dir
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self.fourcc = fourcc
+        self.writer_factory = writer_factory
+        self.patient_id = patient_id
+        self.event_id = event_id
+        self.queue_bytes = queue_bytes
+
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.segments = []
+        self.last_error = None
+        self._queue = queue.Queue()
+        self._backlog_bytes = 0
+        self._backlog_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._tags = deque()
+        self._thread = None
+
+    def is_recording(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        if self.is_recording():
+            return
+        # A previous writer may still be draining; it keeps its own queue.
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._tags = deque()
+        self._thread = threading.Thread(target=self._run, args=(self._queue, self._stop, self._tags, self.event_id),
+                                        name="video-recorder")
+        self._thread.start()
+        self.recording_changed.emit(True)
+
+    def stop(self, timeout=None):
+        """Stop accepting frames; the writer drains what is queued and
+        closes the current segment. Waits up to ``timeout`` for that
+        (None: until done, 0: not at all)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if timeout != 0:
+            self._thread.join(timeout)
+
+    def tag(self, event_id, timestamp=None):
+        """Cut to a segment named for ``event_id`` at the first frame
+        captured at or after ``timestamp`` (monotonic; default: now)."""
+        self.event_id = event_id
+        self._tags.append((time.monotonic() if timestamp is None else timestamp, event_id))
+
+    def push(self, frame):
+        if self._stop.is_set() or self._thread is None:
+            return False
+        size = frame.image.nbytes
+        with self._backlog_lock:
+            if self._backlog_bytes + size > self.queue_bytes:
+                self.dropped += 1
+                return False
+            self._backlog_bytes += size
+        self._queue.put_nowait(frame)
+        self.queued += 1
+        return True
+
+    def stats(self):
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "backlog": self._queue.qsize(),
+            "backlog_mb": round(self._backlog_bytes / (1024 * 1024), 1),
+            "segments": len(self.segments),
+        }
+
+    def _open_segment(self, frame, event_id):
+        h, w = frame.image.shape[:2]
+        directory = self.output_dir or media_paths.media_dir("recordings")
+        os.makedirs(directory, exist_ok=True)
+        suffix = f"_{event_id}" if event_id else ""
+        final = os.path.join(directory, media_paths.media_name("rec", EXTENSION, self.patient_id, suffix=suffix))
+        partial = final[:-len(EXTENSION)] + "part." + EXTENSION
+        writer = self.writer_factory(partial, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+        if not writer.isOpened():
+            raise OSError(f"could not open video writer for {partial}")
+        return {"writer": writer, "partial": partial, "final": final, "size": (w, h), "start": frame.timestamp}
+
+    def _close_segment(self, segment):
+        segment["writer"].release()
+        if not os.path.exists(segment["partial"]):
+            return  # the writer produced nothing
+        os.replace(segment["partial"], segment["final"])
+        self.segments.append(segment["final"])
+        try:
+            self.segment_finished.emit(segment["final"])
+        except RuntimeError:
+            pass  # owner deleted
+
+    def _run(self, frames, stop, tags, event_id):
+        segment = None
+        try:
+            while True:
+                try:
+                    frame = frames.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        break
+                    continue
+                with self._backlog_lock:
+                    self._backlog_bytes -= frame.image.nbytes
+
+                h, w = frame.image.shape[:2]
+                cut = False
+                while tags and frame.timestamp >= tags[0][0]:
+                    event_id = tags.popleft()[1]
+                    cut = True
+                if segment is not None and (cut or (w, h) != segment["size"] or
+                                            frame.timestamp - segment["start"] >= self.segment_seconds):
+                    self._close_segment(segment)
+                    segment = None
+                if segment is None:
+                    segment = self._open_segment(frame, event_id)
+                segment["writer"].write(frame.image)
+                self.written += 1
+        except (OSError, cv2.error) as e:
+            self.last_error = str(e)
+            print(f"⚠ Recording stopped: {e}")
+            stop.set()
+        finally:
+            if segment is not None:
+                self._close_segment(segment)
+            # Frames still queued after a failure are lost.
+            while not frames.empty():
+                frame = frames.get_nowait()
+                with self._backlog_lock:
+                    self._backlog_bytes -= frame.image.nbytes
+                self.dropped += 1
+            # A newer recording owns the state once it has started.
+            if stop is self._stop:
+                try:
+                    self.recording_changed.emit(False)
+                except RuntimeError:
+                    pass
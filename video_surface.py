@@ -0,0 +1,199 @@
+import time
+import numpy as np
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QImage, QPainter, QColor, QPen
+from PyQt5.QtCore import Qt, QRect, QRectF, QPointF, QSize, pyqtSignal
+from PyQt5 import sip
+
+import cv2
+
+# Qt >= 5.14 can read OpenCV's BGR layout directly.
+HAS_BGR888 = hasattr(QImage, "Format_BGR888")
+
+
+def aspect_fit(frame_size, area):
+    """Largest rect with ``frame_size``'s aspect ratio centred in ``area``."""
+    scaled = QSize(frame_size)
+    scaled.scale(area.size(), Qt.KeepAspectRatio)
+    x = area.x() + (area.width() - scaled.width()) // 2
+    y = area.y() + (area.height() - scaled.height()) // 2
+    return QRect(x, y, scaled.width(), scaled.height())
+
+
+# ===== VIDEO SURFACE =====
+class VideoSurface(QWidget):
+    """Paints BGR camera frames (numpy arrays) without converting them.
+
+    ``set_frame()`` wraps the array in a QImage that shares its memory; the
+    array is kept referenced for as long as the QImage is, so the buffer
+    can't be freed under the painter. Scaling happens in paintEvent into an
+    aspect-fit rect that is only recomputed when the widget or frame size
+    changes. With ``smooth`` the frame is resized by cv2 (bilinear, several
+    times cheaper than QPainter's smooth transform) into a buffer kept at
+    the target size and blitted unscaled; otherwise QPainter scales with
+    nearest-neighbour. Crops (views whose rows are further apart than
+    their width) are wrapped in place using the row stride; only layouts
+    QImage can't describe are copied, into a buffer allocated once per
+    frame size. On Qt without Format_BGR888 that buffer holds the RGB
+    conversion instead.
+
+    ``set_overlay()`` takes annotations (frame_analysis.Annotation, rects
+    normalised to the shown frame) that are drawn over every frame until
+    replaced.
+
+    ``frame_painted(float)`` reports, once per frame, the ms spent in
+    set_frame plus the paint that first showed it. Dragging on the surface
+    emits ``dragged(dx, dy)`` in widget pixels.
+    """
+    frame_painted = pyqtSignal(float)
+    dragged = pyqtSignal(int, int)
+
+    def __init__(self, parent=None, smooth=True):
+        super().__init__(parent)
+        self.smooth = smooth
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.background = QColor(Qt.black)
+
+        self._frame = None          # keeps the QImage's memory alive
+        self._image = QImage()
+        self._buffer = None
+        self._scaled = None
+        self._scaled_image = QImage()
+        self._scaled_key = None
+        self._target = QRect()
+        self._target_key = None
+        self._set_frame_ms = None
+        self._drag_pos = None
+        self._overlay = ()
+
+        # Paint-time counters, see paint_stats().
+        self.frame_count = 0
+        self.paint_count = 0
+        self.paint_time_ms = 0.0
+        self.last_paint_ms = 0.0
+
+    def set_frame(self, frame):
+        """Show a BGR ``uint8`` array of shape (h, w, 3), or a view into one."""
+        start = time.perf_counter()
+        h, w = frame.shape[:2]
+        if not HAS_BGR888:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._reuse_buffer(frame))
+            image_format = QImage.Format_RGB888
+        else:
+            if frame.strides[1:] != (3, 1) or frame.strides[0] < 3 * w:
+                buffer = self._reuse_buffer(frame)
+                np.copyto(buffer, frame)
+                frame = buffer
+            image_format = QImage.Format_BGR888
+
+        self._frame = frame
+        self._image = QImage(sip.voidptr(frame.ctypes.data), w, h, frame.strides[0], image_format)
+        self.frame_count += 1
+        self._set_frame_ms = (time.perf_counter() - start) * 1000
+        self.update()
+
+    def set_overlay(self, annotations):
+        if annotations or self._overlay:
+            self._overlay = tuple(annotations)
+            self.update()
+
+    def clear(self):
+        self._frame = None
+        self._image = QImage()
+        self.update()
+
+    def frame_rect(self):
+        """Where the frame is drawn, in widget coordinates."""
+        key = (self.width(), self.height(), self._image.width(), self._image.height())
+        if key != self._target_key:
+            self._target_key = key
+            self._target = aspect_fit(self._image.size(), self.rect()) if not self._image.isNull() else QRect()
+        return self._target
+
+    def _reuse_buffer(self, frame):
+        # Overwriting the buffer on screen is safe: set_frame and paintEvent
+        # both run on the GUI thread and the old image is never painted again.
+        if self._buffer is None or self._buffer.shape != frame.shape:
+            self._buffer = np.empty(frame.shape, np.uint8)
+        return self._buffer
+
+    def scaled_image(self, target):
+        """The current frame resized to ``target``'s size, reusing the
+        buffer; resized at most once per frame."""
+        key = (self.frame_count, target.width(), target.height())
+        if key != self._scaled_key:
+            shape = (target.height(), target.width(), 3)
+            if self._scaled is None or self._scaled.shape != shape:
+                self._scaled = np.empty(shape, np.uint8)
+            cv2.resize(self._frame, (target.width(), target.height()), dst=self._scaled, interpolation=cv2.INTER_LINEAR)
+            self._scaled_image = QImage(self._scaled.data, target.width(), target.height(),
+                                        self._scaled.strides[0], self._image.format())
+            self._scaled_key = key
+        return self._scaled_image
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self)
+        target = self.frame_rect()
+        if target.isNull():
+            painter.fillRect(self.rect(), self.background)
+        else:
+            # Only the letterbox bars need clearing.
+            if target != self.rect():
+                painter.fillRect(QRect(0, 0, self.width(), target.top()), self.background)
+                painter.fillRect(QRect(0, target.bottom() + 1, self.width(), self.height() - target.bottom() - 1), self.background)
+                painter.fillRect(QRect(0, target.top(), target.left(), target.height()), self.background)
+                painter.fillRect(QRect(target.right() + 1, target.top(), self.width() - target.right() - 1, target.height()), self.background)
+            if self.smooth and target.size() != self._image.size():
+                painter.drawImage(target.topLeft(), self.scaled_image(target))
+            else:
+                painter.drawImage(target, self._image)
+            if self._overlay:
+                self.paint_overlay(painter, target)
+        painter.end()
+
+        self.last_paint_ms = (time.perf_counter() - start) * 1000
+        self.paint_time_ms += self.last_paint_ms
+        self.paint_count += 1
+        if self._set_frame_ms is not None:
+            frame_ms, self._set_frame_ms = self._set_frame_ms + self.last_paint_ms, None
+            self.frame_painted.emit(frame_ms)
+
+    def paint_overlay(self, painter, target):
+        painter.setClipRect(target)
+        for annotation in self._overlay:
+            x, y, w, h = annotation.rect
+            rect = QRectF(target.x() + x * target.width(), target.y() + y * target.height(),
+                          w * target.width(), h * target.height())
+            color = QColor(annotation.color or Qt.green)
+            if annotation.kind == "mask":
+                painter.fillRect(rect, color)
+                continue
+            painter.setPen(QPen(color, 2))
+            painter.drawRect(rect)
+            if annotation.label:
+                painter.drawText(rect.topLeft() - QPointF(0, 4), annotation.label)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_pos = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_pos is not None:
+            delta = event.pos() - self._drag_pos
+            self._drag_pos = event.pos()
+            self.dragged.emit(delta.x(), delta.y())
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_pos = None
+        super().mouseReleaseEvent(event)
+
+    def paint_stats(self):
+        return {
+            "frames": self.frame_count,
+            "paints": self.paint_count,
+            "avg_paint_ms": self.paint_time_ms / self.paint_count if self.paint_count else 0.0,
+            "last_paint_ms": self.last_paint_ms,
+        }
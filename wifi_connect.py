@@ -0,0 +1,321 @@
+import os
+import time
+import threading
+import subprocess
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
+from PyQt5.QtCore import Qt, QEvent, QObject, pyqtSignal
+
+from wifi_scanner import split_terse
+from virtual_keyboard import VirtualKeyboard
+
+# ================== Stages ==================
+ASSOCIATING = "associating"
+AUTHENTICATING = "authenticating"
+DHCP = "dhcp"
+ONLINE = "online"
+
+STAGE_LABELS = {
+    ASSOCIATING: "Associating…",
+    AUTHENTICATING: "Authenticating…",
+    DHCP: "Getting an IP address…",
+    ONLINE: "Connected",
+}
+
+CONNECT_TIMEOUT = 45.0
+
+# ``finished`` message when a secured network has no saved profile yet.
+PASSWORD_REQUIRED = "password required"
+# ``finished`` message when the password (typed or saved) was refused; the
+# saved profile is deleted, so the next attempt asks again.
+PASSWORD_REJECTED = "wrong password"
+WRONG_PASSWORD = "Secrets were required, but not provided"
+
+# What nmcli/NetworkManager say when the key is wrong (the error text,
+# or the reason of a failed activation).
+AUTH_FAILURE_MARKERS = (WRONG_PASSWORD, "no-secrets", "supplicant")
+
+
+def is_auth_failure(message):
+    return any(marker.lower() in message.lower() for marker in AUTH_FAILURE_MARKERS)
+
+# ``nmcli device monitor`` detail text -> stage
+NM_DETAIL_STAGES = {
+    "prepare": ASSOCIATING,
+    "configuring": ASSOCIATING,
+    "need authentication": AUTHENTICATING,
+    "getting IP configuration": DHCP,
+    "checking IP connectivity": DHCP,
+    "starting secondary connections": DHCP,
+}
+
+
+def stage_from_monitor_line(line):
+    """Map one ``nmcli device monitor`` line to a stage (or None)."""
+    _, _, event = line.strip().partition(": ")
+    if event == "connected":
+        return ONLINE
+    if event.startswith("connecting (") and event.endswith(")"):
+        return NM_DETAIL_STAGES.get(event[len("connecting ("):-1])
+    return None
+
+
+# ================== Backends ==================
+# A backend does the actual connecting. ``connect()`` blocks on the
+# connector's worker thread, calls ``on_stage(stage)`` as it progresses,
+# gives up when ``cancelled`` is set or ``deadline`` (time.monotonic())
+# passes, and returns (ok, message). ``forget(ssid)`` deletes a saved
+# profile whose key was refused.
+
+class NmcliBackend:
+    def has_saved_profile(self, ssid):
+        try:
+            output = subprocess.run(
+                ["nmcli", "-t", "-f", "NAME", "connection", "show"],
+                capture_output=True, text=True, timeout=10,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return any(split_terse(line)[0] == ssid for line in output.splitlines())
+
+    def forget(self, ssid):
+        try:
+            subprocess.run(["nmcli", "connection", "delete", "id", ssid],
+                           capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠ Could not delete Wi-Fi profile {ssid}: {e}")
+
+    def command(self, ssid, password, wait):
+        """(argv, stdin) for one attempt. The password goes to ``--ask``
+        on stdin, never on the command line where any local user could
+        read it (ps, /proc/<pid>/cmdline)."""
+        if password is None and self.has_saved_profile(ssid):
+            return ["nmcli", "--wait", str(wait), "connection", "up", "id", ssid], None
+        if password:
+            return ["nmcli", "--ask", "--wait", str(wait), "device", "wifi", "connect", ssid], password + "\n"
+        return ["nmcli", "--wait", str(wait), "device", "wifi", "connect", ssid], None
+
+    def connect(self, ssid, password, on_stage, cancelled, deadline):
+        command, secret = self.command(ssid, password, max(1, int(deadline - time.monotonic())))
+
+        monitor = subprocess.Popen(
+            ["nmcli", "device", "monitor"], stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1,
+        )
+
+        def read_stages():
+            for line in monitor.stdout:
+                stage = stage_from_monitor_line(line)
+                if stage is not None:
+                    on_stage(stage)
+
+        reader = threading.Thread(target=read_stages, name="wifi-connect-stages", daemon=True)
+        reader.start()
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, text=True)
+            try:
+                if secret is not None:
+                    process.stdin.write(secret)
+                process.stdin.close()
+            except OSError:
+                pass  # nmcli exited early; its output says why
+            while process.poll() is None:
+                if cancelled.is_set() or time.monotonic() > deadline:
+                    process.terminate()
+                    process.wait()
+                    # Stop NetworkManager from finishing the activation.
+                    subprocess.run(["nmcli", "connection", "down", "id", ssid],
+                                   capture_output=True, timeout=10)
+                    return False, "Cancelled" if cancelled.is_set() else "Timed out"
+                time.sleep(0.1)
+            out, err = process.stdout.read(), process.stderr.read()
+            if process.returncode != 0:
+                return False, (err or out).strip() or f"nmcli exited with {process.returncode}"
+            on_stage(ONLINE)
+            return True, f"Connected to {ssid}"
+        finally:
+            monitor.terminate()
+            monitor.wait()
+
+
+class FakeBackend:
+    """Scripted backend for running without NetworkManager. With a
+    ``password``, any other password (typed, or saved in a profile) fails
+    at AUTHENTICATING. ``saved_profiles`` is a list of SSIDs or an
+    {ssid: saved password} dict; a successful attempt saves its password,
+    like NetworkManager does."""
+
+    def __init__(self, stages=(ASSOCIATING, AUTHENTICATING, DHCP, ONLINE), step=0.2,
+                 result=(True, "Connected"), saved_profiles=(), password=None):
+        self.stages = stages
+        self.step = step
+        self.result = result
+        self.password = password
+        if isinstance(saved_profiles, dict):
+            self.saved_profiles = dict(saved_profiles)
+        else:
+            self.saved_profiles = {ssid: password for ssid in saved_profiles}
+        self.attempts = []
+
+    def has_saved_profile(self, ssid):
+        return ssid in self.saved_profiles
+
+    def forget(self, ssid):
+        self.saved_profiles.pop(ssid, None)
+
+    def connect(self, ssid, password, on_stage, cancelled, deadline):
+        self.attempts.append((ssid, password))
+        key = password if password is not None else self.saved_profiles.get(ssid)
+        for stage in self.stages:
+            if cancelled.wait(self.step):
+                return False, "Cancelled"
+            if time.monotonic() > deadline:
+                return False, "Timed out"
+            on_stage(stage)
+            if stage == AUTHENTICATING and self.password is not None and key != self.password:
+                return False, WRONG_PASSWORD
+        if self.result[0] and password is not None:
+            self.saved_profiles[ssid] = password
+        return self.result
+
+
+def default_backend():
+    """nmcli, or a FakeBackend when ``DROID_FAKE_NETWORK`` is set (``down``
+    makes every attempt fail)."""
+    fake = os.environ.get("DROID_FAKE_NETWORK")
+    if fake == "down":
+        return FakeBackend(stages=(ASSOCIATING, AUTHENTICATING), result=(False, "Authentication failed"))
+    if fake:
+        return FakeBackend()
+    return NmcliBackend()
+
+
+# ================== Connector ==================
+class WifiConnector(QObject):
+    """Runs one connect attempt at a time on a worker thread.
+
+    ``stage_changed(str)`` reports progress and ``finished(bool, str)`` the
+    outcome; both arrive on the GUI thread.
+    """
+    stage_changed = pyqtSignal(str)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, backend=None, timeout=CONNECT_TIMEOUT, parent=None):
+        super().__init__(parent)
+        self.backend = backend or default_backend()
+        self.timeout = timeout
+        self.ssid = None
+        self._cancelled = threading.Event()
+        self._busy = False
+
+    def is_busy(self):
+        return self._busy
+
+    def connect_to(self, network, password=None):
+        """Start connecting to a ``WifiNetwork``. Returns False if an attempt
+        is already running. A secured network without a saved profile
+        finishes straight away with PASSWORD_REQUIRED; call again with the
+        password. A refused password (typed or saved) finishes with
+        PASSWORD_REJECTED after the saved profile was deleted."""
+        if self.is_busy():
+            return False
+        self.ssid = network.ssid
+        self._cancelled = threading.Event()
+        self._busy = True
+        threading.Thread(
+            target=self._run, args=(network, password, self._cancelled),
+            name="wifi-connect", daemon=True,
+        ).start()
+        return True
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, network, password, cancelled):
+        deadline = time.monotonic() + self.timeout
+        last_stage = []
+
+        def on_stage(stage):
+            # nmcli reports several sub-states per stage; forward changes only.
+            if last_stage[-1:] != [stage]:
+                last_stage.append(stage)
+                self._emit(self.stage_changed, stage)
+
+        try:
+            if password is None and network.security and not self.backend.has_saved_profile(network.ssid):
+                ok, message = False, PASSWORD_REQUIRED
+            else:
+                ok, message = self.backend.connect(network.ssid, password, on_stage, cancelled, deadline)
+                if not ok and network.security and is_auth_failure(message):
+                    # A profile with a bad key would fail every retry
+                    # without ever asking again: drop it.
+                    print(f"⚠ Wi-Fi {network.ssid}: {message}")
+                    self.backend.forget(network.ssid)
+                    message = PASSWORD_REJECTED
+        except Exception as e:
+            ok, message = False, str(e)
+        # Cleared before emitting so a ``finished`` slot can start a retry.
+        self._busy = False
+        self._emit(self.finished, ok, message)
+
+    @staticmethod
+    def _emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass  # connector deleted while the attempt was running
+
+
+# ================== Password Dialog ==================
+class PasswordDialog(QDialog):
+    """Asks for a Wi-Fi password using the on-screen VirtualKeyboard."""
+    password_entered = pyqtSignal(str)
+
+    def __init__(self, ssid, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #fefefe;
+                border: 2px solid #ccc;
+                border-radius: 15px;
+            }
+            QLineEdit {
+                padding: 10px;
+                font-size: 18px;
+            }
+        """)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Password for {ssid}:"))
+
+        self.password_input = QLineEdit()
+        self.password_input.setEchoMode(QLineEdit.Password)
+        self.password_input.returnPressed.connect(self.accept)
+        layout.addWidget(self.password_input)
+
+        self.keyboard = VirtualKeyboard(self.password_input)
+        layout.addWidget(self.keyboard)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        connect_button = QPushButton("Connect")
+        connect_button.clicked.connect(self.accept)
+        buttons.addWidget(cancel_button)
+        buttons.addWidget(connect_button)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        # The keyboard hides itself on Enter/Done; bring it back on focus.
+        self.password_input.installEventFilter(self)
+
+    def eventFilter(self, source, event):
+        if event.type() == QEvent.FocusIn and source is self.password_input:
+            self.keyboard.show()
+        return super().eventFilter(source, event)
+
+    def accept(self):
+        self.password_entered.emit(self.password_input.text())
+        super().accept()
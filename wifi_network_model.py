@@ -0,0 +1,86 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+# Custom role returning the WifiNetwork record behind a row.
+NetworkRole = Qt.UserRole + 1
+
+
+def sort_key(network):
+    """Connected network first, then strongest signal."""
+    return (not network.active, -(network.signal or 0), network.ssid)
+
+
+class WifiNetworkModel(QAbstractListModel):
+    """List model over ``wifi_scanner.WifiNetwork`` records, one row per SSID.
+
+    ``set_networks()`` applies a new scan as row removes, moves, inserts and
+    dataChanged for the rows that actually changed, so views keep their
+    selection and scroll position and large scans don't rebuild every row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._networks = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._networks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._networks):
+            return None
+        network = self._networks[index.row()]
+        if role == Qt.DisplayRole:
+            signal = "?" if network.signal is None else network.signal
+            return f"{network.ssid} ({signal}%)"
+        if role == Qt.ToolTipRole:
+            return network.security or "Open"
+        if role == Qt.BackgroundRole and network.active:
+            return Qt.lightGray
+        if role == NetworkRole:
+            return network
+        return None
+
+    def network_at(self, row):
+        return self._networks[row]
+
+    def networks(self):
+        return list(self._networks)
+
+    def current_ssid(self):
+        return next((n.ssid for n in self._networks if n.active), None)
+
+    def set_networks(self, networks):
+        target = sorted({n.ssid: n for n in networks if n.ssid}.values(), key=sort_key)
+        wanted = {n.ssid for n in target}
+
+        # 1. Drop rows for networks that disappeared (bottom up).
+        for row in range(len(self._networks) - 1, -1, -1):
+            if self._networks[row].ssid not in wanted:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._networks[row]
+                self.endRemoveRows()
+
+        # 2. Walk the target order; rows above ``row`` are already in place.
+        for row, network in enumerate(target):
+            if row < len(self._networks) and self._networks[row].ssid == network.ssid:
+                if self._networks[row] != network:
+                    self._networks[row] = network
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+                continue
+
+            source = next(
+                (i for i in range(row + 1, len(self._networks)) if self._networks[i].ssid == network.ssid),
+                None,
+            )
+            if source is not None:
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._networks.insert(row, self._networks.pop(source))
+                self.endMoveRows()
+                if self._networks[row] != network:
+                    self._networks[row] = network
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._networks.insert(row, network)
+                self.endInsertRows()
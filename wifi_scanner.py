@@ -0,0 +1,225 @@
+import time
+import platform
+import threading
+import subprocess
+from collections import namedtuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# One row of a scan. ``signal`` is 0-100 (or None when the OS doesn't say).
+WifiNetwork = namedtuple("WifiNetwork", "ssid signal security active bssid")
+
+NMCLI_FIELDS = "ACTIVE,SSID,BSSID,SIGNAL,SECURITY"
+SCAN_TIMEOUT = 20
+
+
+# ========== Parsers ==========
+def split_terse(line):
+    """Split one ``nmcli -t`` line on unescaped ``:`` and unescape ``\\:``
+    and ``\\\\`` (BSSIDs and some SSIDs contain colons)."""
+    fields, current, escaped = [], [], False
+    for ch in line:
+        if escaped:
+            current.append(ch)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == ":":
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    fields.append("".join(current))
+    return fields
+
+
+def parse_nmcli_wifi(output):
+    """Parse ``nmcli -t -f ACTIVE,SSID,BSSID,SIGNAL,SECURITY dev wifi list``."""
+    networks = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        fields = split_terse(line)
+        if len(fields) != 5:
+            continue
+        active, ssid, bssid, signal, security = fields
+        try:
+            signal = int(signal)
+        except ValueError:
+            signal = None
+        networks.append(WifiNetwork(ssid, signal, security.strip(), active == "yes", bssid))
+    return networks
+
+
+def parse_airport(output):
+    """Parse macOS ``airport -s``. RSSI (dBm) is mapped onto 0-100."""
+    networks = []
+    for line in output.splitlines():
+        if not line.strip() or line.strip().startswith("SSID"):
+            continue
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        ssid, bssid = parts[0], parts[1]
+        try:
+            signal = max(0, min(100, 2 * (int(parts[2]) + 100)))
+        except ValueError:
+            signal = None
+        security = parts[-1] if len(parts) > 6 else ""
+        networks.append(WifiNetwork(ssid, signal, security, False, bssid))
+    return networks
+
+
+def parse_netsh_networks(output, current_ssid=None):
+    """Parse Windows ``netsh wlan show networks mode=Bssid``."""
+    networks = []
+    ssid, security = None, ""
+    for line in output.splitlines():
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if key.startswith("SSID"):
+            ssid, security = value, ""
+        elif key == "Authentication":
+            security = value
+        elif key.startswith("BSSID") and ssid is not None:
+            networks.append(WifiNetwork(ssid, None, security, ssid == current_ssid, value))
+        elif key == "Signal" and networks and networks[-1].ssid == ssid:
+            try:
+                networks[-1] = networks[-1]._replace(signal=int(value.rstrip("%")))
+            except ValueError:
+                pass
+    return networks
+
+
+def parse_netsh_interfaces(output):
+    for line in output.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "SSID":
+            return value.strip()
+    return None
+
+
+def dedupe_by_ssid(networks):
+    """One entry per SSID, keeping the strongest BSSID. An SSID counts as
+    active if any of its BSSIDs is. Hidden (empty) SSIDs are dropped.
+    Sorted by signal, strongest first."""
+    best = {}
+    for network in networks:
+        if not network.ssid:
+            continue
+        seen = best.get(network.ssid)
+        if seen is None or (network.signal or 0) > (seen.signal or 0):
+            best[network.ssid] = network._replace(active=network.active or (seen is not None and seen.active))
+        elif network.active and not seen.active:
+            best[network.ssid] = seen._replace(active=True)
+    return sorted(best.values(), key=lambda n: (not n.active, -(n.signal or 0), n.ssid))
+
+
+# ========== Platform Scans ==========
+def scan_networks(rescan=True):
+    """Run one blocking scan. Returns a raw (not deduplicated) list."""
+    system = platform.system()
+    if system == "Linux":
+        output = subprocess.run(
+            ["nmcli", "-t", "-f", NMCLI_FIELDS, "dev", "wifi", "list", "--rescan", "yes" if rescan else "no"],
+            capture_output=True, text=True, timeout=SCAN_TIMEOUT, check=True,
+        ).stdout
+        return parse_nmcli_wifi(output)
+    if system == "Darwin":
+        output = subprocess.run(["airport", "-s"], capture_output=True, text=True, timeout=SCAN_TIMEOUT).stdout
+        return parse_airport(output)
+    if system == "Windows":
+        interfaces = subprocess.run(["netsh", "wlan", "show", "interfaces"], capture_output=True, text=True, timeout=SCAN_TIMEOUT).stdout
+        output = subprocess.run(["netsh", "wlan", "show", "networks", "mode=Bssid"], capture_output=True, text=True, timeout=SCAN_TIMEOUT).stdout
+        return parse_netsh_networks(output, parse_netsh_interfaces(interfaces))
+    return []
+
+
+# ================== Wi-Fi Scanner ==================
+class WifiScanner(QObject):
+    """Scans for Wi-Fi networks on a background thread.
+
+    Results are deduplicated by SSID and cached; ``networks()`` and
+    ``current_ssid()`` read the cache and never block. A fresh scan runs
+    every ``interval`` seconds, or as soon as ``refresh()`` is called, and
+    ``networks_updated(list)`` is emitted on the GUI thread when it lands.
+    The cache counts as stale after ``ttl`` seconds.
+    """
+    networks_updated = pyqtSignal(list)
+
+    def __init__(self, scan_function=scan_networks, interval=30.0, ttl=60.0, parent=None):
+        super().__init__(parent)
+        self.scan_function = scan_function
+        self.interval = interval
+        self.ttl = ttl
+
+        self.scan_count = 0
+        self.last_scan_time = None
+        self.last_error = None
+        self._networks = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="wifi-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh(self):
+        """Ask for a scan now; the result arrives via ``networks_updated``."""
+        self._wake.set()
+
+    def networks(self):
+        with self._lock:
+            return list(self._networks)
+
+    def current_ssid(self):
+        for network in self.networks():
+            if network.active:
+                return network.ssid
+        return None
+
+    def is_fresh(self):
+        return self.last_scan_time is not None and time.monotonic() - self.last_scan_time < self.ttl
+
+    def scan_once(self):
+        try:
+            networks = dedupe_by_ssid(self.scan_function())
+        except (OSError, subprocess.SubprocessError) as e:
+            if str(e) != self.last_error:
+                print(f"⚠ Wi-Fi scan failed: {e}")
+            self.last_error = str(e)
+            return
+        self.last_error = None
+        with self._lock:
+            self._networks = networks
+        self.scan_count += 1
+        self.last_scan_time = time.monotonic()
+        self.networks_updated.emit(networks)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.scan_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+_shared_scanner = None
+
+
+def shared_scanner():
+    """The process-wide scanner, started on first use."""
+    global _shared_scanner
+    if _shared_scanner is None:
+        _shared_scanner = WifiScanner()
+        _shared_scanner.start()
+    return _shared_scanner